@@ -6,12 +6,13 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from src.db_connector import DatabaseConnector
+from src.db_connector import get_database
 
 def handler(request, response):
     """
     Vercel Function for getting town skip trace stats
     GET /api/skiptraces/town-stats?town=Middletown
+    GET /api/skiptraces/town-stats?all=true   (every scraped town)
     """
     # Enable CORS
     response.status_code = 200
@@ -28,16 +29,20 @@ def handler(request, response):
 
     # Get town parameter
     town = request.args.get('town')
-    if not town:
+    all_towns = request.args.get('all', '').lower() in ('1', 'true', 'yes')
+    if not town and not all_towns:
         response.status_code = 400
         return json.dumps({'error': 'Town parameter is required'})
 
     try:
-        # Initialize database connection
-        db = DatabaseConnector()
+        # Shared connection, reused while the function instance stays warm
+        db = get_database()
 
         # Get stats
-        stats = db.get_town_skip_trace_stats(town)
+        if all_towns:
+            stats = db.get_all_town_skip_trace_stats()
+        else:
+            stats = db.get_town_skip_trace_stats(town)
 
         return json.dumps(stats)
 
@@ -0,0 +1,27 @@
+-- Foreign keys for embedded case reads
+-- get_full_case_data selects "*, defendants(*), skiptraces:skiptrace(...)";
+-- PostgREST can only embed a table that references cases. Add the docket
+-- foreign keys where an older database lacks them, then reload the schema cache.
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conrelid = 'skiptrace'::regclass AND confrelid = 'cases'::regclass AND contype = 'f'
+    ) THEN
+        ALTER TABLE skiptrace ADD CONSTRAINT fk_skiptrace_docket
+            FOREIGN KEY (docket_number) REFERENCES cases(docket_number) ON DELETE CASCADE;
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conrelid = 'skiptrace_sandbox'::regclass AND confrelid = 'cases'::regclass AND contype = 'f'
+    ) THEN
+        ALTER TABLE skiptrace_sandbox ADD CONSTRAINT fk_skiptrace_sandbox_docket
+            FOREIGN KEY (docket_number) REFERENCES cases(docket_number) ON DELETE CASCADE;
+    END IF;
+END $$;
+
+CREATE INDEX IF NOT EXISTS idx_defendants_docket_number ON defendants(docket_number);
+
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,23 @@
+-- Atomic skip trace cost increments
+-- increment_skip_trace_costs adds lookup counts to the per-docket totals in
+-- one statement: new dockets are inserted, existing ones get
+-- lookup_count = lookup_count + excluded.lookup_count. Concurrent workers
+-- cannot lose increments, and a whole town run is one call.
+-- Requires uq_skiptrace_costs_docket (SCHEMA_MIGRATION_V4_natural_keys.sql).
+
+CREATE OR REPLACE FUNCTION increment_skip_trace_costs(deltas JSONB)
+RETURNS SETOF skiptrace_costs
+LANGUAGE sql
+AS $$
+    INSERT INTO skiptrace_costs (docket_number, lookup_count, cost_per_lookup, is_sandbox)
+    -- Repeated dockets in one call are summed first; ON CONFLICT may touch a row only once
+    SELECT d.docket_number, SUM(d.lookup_count), MAX(d.cost_per_lookup), d.is_sandbox
+    FROM jsonb_to_recordset(deltas) AS d(docket_number TEXT, lookup_count INTEGER,
+                                         cost_per_lookup NUMERIC, is_sandbox BOOLEAN)
+    GROUP BY d.docket_number, d.is_sandbox
+    ON CONFLICT (docket_number, is_sandbox)
+    DO UPDATE SET lookup_count = skiptrace_costs.lookup_count + EXCLUDED.lookup_count
+    RETURNING *;
+$$;
+
+GRANT EXECUTE ON FUNCTION increment_skip_trace_costs(JSONB) TO anon, authenticated;
@@ -0,0 +1,99 @@
+-- Skip trace cost summaries computed in the database
+-- skip_trace_cost_summary returns one JSONB document: totals plus rows per
+-- environment (sandbox vs production), per town and per day. The town filter
+-- is a join on cases, so nothing is filtered client-side and the response
+-- size depends on the number of towns and days, not on the table sizes.
+--
+-- All-time totals come from the per-docket running totals in skiptrace_costs.
+-- A date range switches them to the dated spend ledger (skiptrace_spend,
+-- SCHEMA_MIGRATION_V4_spend_ledger.sql); by_day always reads the ledger.
+-- Every increment_skip_trace_costs call appends to the ledger once
+-- SCHEMA_MIGRATION_V4_spend_rpc.sql is applied; costs recorded before that
+-- (other than scheduler dispatches) appear in the all-time totals only.
+-- p_until is exclusive.
+
+CREATE OR REPLACE FUNCTION skip_trace_cost_summary(
+    p_town TEXT DEFAULT NULL,
+    p_is_sandbox BOOLEAN DEFAULT NULL,
+    p_since TIMESTAMPTZ DEFAULT NULL,
+    p_until TIMESTAMPTZ DEFAULT NULL
+)
+RETURNS JSONB
+LANGUAGE sql STABLE
+AS $$
+    WITH costs AS (
+        SELECT k.docket_number, k.is_sandbox, k.lookup_count, k.lookup_count * k.cost_per_lookup AS cost
+        FROM skiptrace_costs k
+        WHERE p_since IS NULL AND p_until IS NULL
+        UNION ALL
+        SELECT s.docket_number, s.is_sandbox, s.lookup_count, s.amount
+        FROM skiptrace_spend s
+        WHERE (p_since IS NOT NULL OR p_until IS NOT NULL)
+          AND (p_since IS NULL OR s.created_at >= p_since)
+          AND (p_until IS NULL OR s.created_at < p_until)
+    ),
+    filtered AS (
+        SELECT k.*, c.town
+        FROM costs k
+        LEFT JOIN cases c ON c.docket_number = k.docket_number
+        WHERE (p_town IS NULL OR c.town = p_town)
+          AND (p_is_sandbox IS NULL OR k.is_sandbox = p_is_sandbox)
+    ),
+    spend AS (
+        SELECT (s.created_at AT TIME ZONE 'UTC')::date AS day, s.is_sandbox, s.lookup_count, s.amount
+        FROM skiptrace_spend s
+        LEFT JOIN cases c ON c.docket_number = s.docket_number
+        WHERE (p_town IS NULL OR c.town = p_town)
+          AND (p_is_sandbox IS NULL OR s.is_sandbox = p_is_sandbox)
+          AND (p_since IS NULL OR s.created_at >= p_since)
+          AND (p_until IS NULL OR s.created_at < p_until)
+    )
+    SELECT jsonb_build_object(
+        'total_cases', (SELECT COUNT(DISTINCT (docket_number, is_sandbox)) FROM filtered),
+        'total_lookups', (SELECT COALESCE(SUM(lookup_count), 0) FROM filtered),
+        'total_cost', (SELECT COALESCE(SUM(cost), 0) FROM filtered),
+        'by_environment', (
+            SELECT COALESCE(jsonb_agg(e ORDER BY e.is_sandbox), '[]'::jsonb)
+            FROM (SELECT is_sandbox, COUNT(DISTINCT docket_number) AS cases,
+                         SUM(lookup_count) AS lookups, SUM(cost) AS cost
+                  FROM filtered GROUP BY is_sandbox) e
+        ),
+        'by_town', (
+            SELECT COALESCE(jsonb_agg(t ORDER BY t.cost DESC, t.town), '[]'::jsonb)
+            FROM (SELECT town, COUNT(DISTINCT docket_number) AS cases,
+                         SUM(lookup_count) AS lookups, SUM(cost) AS cost
+                  FROM filtered GROUP BY town) t
+        ),
+        'by_day', (
+            SELECT COALESCE(jsonb_agg(d ORDER BY d.day, d.is_sandbox), '[]'::jsonb)
+            FROM (SELECT day, is_sandbox, SUM(lookup_count) AS lookups, SUM(amount) AS cost
+                  FROM spend GROUP BY day, is_sandbox) d
+        )
+    );
+$$;
+
+-- One page of per-docket running totals, in docket order
+CREATE OR REPLACE FUNCTION skip_trace_cost_details(
+    p_town TEXT DEFAULT NULL,
+    p_is_sandbox BOOLEAN DEFAULT NULL,
+    p_limit INTEGER DEFAULT 100,
+    p_offset INTEGER DEFAULT 0
+)
+RETURNS SETOF skiptrace_costs
+LANGUAGE sql STABLE
+AS $$
+    SELECT k.*
+    FROM skiptrace_costs k
+    WHERE (p_is_sandbox IS NULL OR k.is_sandbox = p_is_sandbox)
+      AND (p_town IS NULL OR EXISTS (
+          SELECT 1 FROM cases c WHERE c.docket_number = k.docket_number AND c.town = p_town
+      ))
+    ORDER BY k.docket_number, k.is_sandbox
+    LIMIT p_limit OFFSET p_offset;
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_skiptrace_spend_docket ON skiptrace_spend(docket_number);
+-- cases(town) is indexed by SCHEMA_MIGRATION_V4_town_stats_view.sql
+
+GRANT EXECUTE ON FUNCTION skip_trace_cost_summary(TEXT, BOOLEAN, TIMESTAMPTZ, TIMESTAMPTZ) TO anon, authenticated;
+GRANT EXECUTE ON FUNCTION skip_trace_cost_details(TEXT, BOOLEAN, INTEGER, INTEGER) TO anon, authenticated;
@@ -0,0 +1,23 @@
+-- Per-town skip trace hit rates
+-- skip_trace_hit_rates returns one row per town: dockets that were paid for
+-- (lookup_count > 0 in skiptrace_costs) and how many of them have phone
+-- records, grouped in the database instead of joining whole tables client-side.
+
+CREATE OR REPLACE FUNCTION skip_trace_hit_rates(p_is_sandbox BOOLEAN DEFAULT FALSE)
+RETURNS TABLE (town TEXT, traced BIGINT, hits BIGINT)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT c.town::TEXT,
+        COUNT(*) AS traced,
+        COUNT(*) FILTER (WHERE CASE WHEN p_is_sandbox
+            THEN EXISTS (SELECT 1 FROM skiptrace_sandbox s WHERE s.docket_number = k.docket_number)
+            ELSE EXISTS (SELECT 1 FROM skiptrace s WHERE s.docket_number = k.docket_number)
+        END) AS hits
+    FROM skiptrace_costs k
+    JOIN cases c ON c.docket_number = k.docket_number
+    WHERE k.is_sandbox = p_is_sandbox AND k.lookup_count > 0 AND c.town IS NOT NULL
+    GROUP BY c.town;
+$$;
+
+GRANT EXECUTE ON FUNCTION skip_trace_hit_rates(BOOLEAN) TO anon, authenticated;
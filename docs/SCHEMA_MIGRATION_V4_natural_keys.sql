@@ -0,0 +1,20 @@
+-- Natural-key unique indexes
+-- DatabaseConnector.upsert_rows / insert_ignore send ON CONFLICT on these
+-- columns, so each one needs a unique index or constraint to infer from.
+
+-- cases.docket_number and ct_towns.town are already unique; kept here so the
+-- migration is self-contained on a fresh database.
+CREATE UNIQUE INDEX IF NOT EXISTS uq_cases_docket_number ON cases(docket_number);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_ct_towns_town ON ct_towns(town);
+
+-- One running cost total per docket and environment
+CREATE UNIQUE INDEX IF NOT EXISTS uq_skiptrace_costs_docket ON skiptrace_costs(docket_number, is_sandbox);
+
+-- One row per phone number per docket; drop repeats left by earlier re-runs first
+DELETE FROM skiptrace a USING skiptrace b
+WHERE a.id > b.id AND a.docket_number = b.docket_number AND a.phone_number = b.phone_number;
+CREATE UNIQUE INDEX IF NOT EXISTS uq_skiptrace_docket_phone ON skiptrace(docket_number, phone_number);
+
+DELETE FROM skiptrace_sandbox a USING skiptrace_sandbox b
+WHERE a.id > b.id AND a.docket_number = b.docket_number AND a.phone_number = b.phone_number;
+CREATE UNIQUE INDEX IF NOT EXISTS uq_skiptrace_sandbox_docket_phone ON skiptrace_sandbox(docket_number, phone_number);
@@ -0,0 +1,8 @@
+-- Keyset pagination indexes
+-- List endpoints page newest first on (created_at, id); these indexes let a
+-- page (offset or cursor) be read without sorting the whole table.
+
+CREATE INDEX IF NOT EXISTS idx_cases_created_id ON cases(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_cases_town_created_id ON cases(town, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_defendants_created_id ON defendants(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_skiptrace_created_id ON skiptrace(created_at DESC, id DESC);
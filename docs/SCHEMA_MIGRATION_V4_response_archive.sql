@@ -0,0 +1,21 @@
+-- Raw BatchData response archive
+-- Each distinct payload is stored once, zlib-compressed and base64-encoded,
+-- keyed by the SHA-256 of its canonical JSON. Skip trace rows reference it
+-- through response_hash instead of repeating the payload per phone number.
+
+CREATE TABLE IF NOT EXISTS skiptrace_responses (
+    response_hash CHAR(64) PRIMARY KEY,
+    payload TEXT NOT NULL,
+    raw_size INTEGER,
+    compressed_size INTEGER,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+ALTER TABLE skiptrace
+    ADD COLUMN IF NOT EXISTS response_hash CHAR(64) REFERENCES skiptrace_responses(response_hash);
+
+ALTER TABLE skiptrace_sandbox
+    ADD COLUMN IF NOT EXISTS response_hash CHAR(64) REFERENCES skiptrace_responses(response_hash);
+
+CREATE INDEX IF NOT EXISTS idx_skiptrace_response_hash ON skiptrace(response_hash);
+CREATE INDEX IF NOT EXISTS idx_skiptrace_sandbox_response_hash ON skiptrace_sandbox(response_hash);
@@ -0,0 +1,17 @@
+-- Skip trace review queue
+-- Addresses the eligibility screen held back instead of paying for a lookup.
+-- Reviewers fix the address and re-run the case, or dismiss the row.
+
+CREATE TABLE IF NOT EXISTS skiptrace_review_queue (
+    id SERIAL PRIMARY KEY,
+    docket_number VARCHAR(100) REFERENCES cases(docket_number) ON DELETE CASCADE,
+    defendant_name VARCHAR(255) NOT NULL,
+    address TEXT NOT NULL,
+    reason VARCHAR(255) NOT NULL,
+    score NUMERIC(5, 4) NOT NULL DEFAULT 0,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',  -- pending, resolved, dismissed
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    CONSTRAINT uq_skiptrace_review_queue UNIQUE (docket_number, defendant_name, address)
+);
+
+CREATE INDEX IF NOT EXISTS idx_skiptrace_review_queue_status ON skiptrace_review_queue(status, created_at);
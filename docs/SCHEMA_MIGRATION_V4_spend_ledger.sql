@@ -0,0 +1,15 @@
+-- Skip trace spend ledger
+-- One dated row per docket per cost increment so spend can be summed per day/month
+-- (written by increment_skip_trace_costs, see SCHEMA_MIGRATION_V4_spend_rpc.sql).
+-- skiptrace_costs keeps its per-docket running totals.
+
+CREATE TABLE IF NOT EXISTS skiptrace_spend (
+    id SERIAL PRIMARY KEY,
+    docket_number VARCHAR(100) REFERENCES cases(docket_number) ON DELETE SET NULL,
+    lookup_count INTEGER NOT NULL,
+    amount NUMERIC(10, 4) NOT NULL,
+    is_sandbox BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_skiptrace_spend_created_at ON skiptrace_spend(is_sandbox, created_at);
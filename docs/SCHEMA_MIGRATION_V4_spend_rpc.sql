@@ -0,0 +1,45 @@
+-- Server-side spend ledger writes and totals
+-- increment_skip_trace_costs now appends one skiptrace_spend row per docket
+-- in the same statement as the running-total upsert, so every cost increment
+-- (town runs, single lookups and the scheduler) lands in the dated ledger
+-- without a second request. skip_trace_spend_total sums the ledger in the
+-- database instead of returning every row to the client.
+-- Requires SCHEMA_MIGRATION_V4_spend_ledger.sql and SCHEMA_MIGRATION_V4_cost_increment.sql.
+
+CREATE OR REPLACE FUNCTION increment_skip_trace_costs(deltas JSONB)
+RETURNS SETOF skiptrace_costs
+LANGUAGE sql
+AS $$
+    WITH totals AS (
+        -- Repeated dockets in one call are summed first; ON CONFLICT may touch a row only once
+        SELECT d.docket_number, SUM(d.lookup_count) AS lookup_count, MAX(d.cost_per_lookup) AS cost_per_lookup,
+            d.is_sandbox
+        FROM jsonb_to_recordset(deltas) AS d(docket_number TEXT, lookup_count INTEGER,
+                                             cost_per_lookup NUMERIC, is_sandbox BOOLEAN)
+        GROUP BY d.docket_number, d.is_sandbox
+    ),
+    ledger AS (
+        INSERT INTO skiptrace_spend (docket_number, lookup_count, amount, is_sandbox)
+        SELECT docket_number, lookup_count, ROUND(lookup_count * cost_per_lookup, 4), is_sandbox
+        FROM totals
+    )
+    INSERT INTO skiptrace_costs (docket_number, lookup_count, cost_per_lookup, is_sandbox)
+    SELECT docket_number, lookup_count, cost_per_lookup, is_sandbox FROM totals
+    ON CONFLICT (docket_number, is_sandbox)
+    DO UPDATE SET lookup_count = skiptrace_costs.lookup_count + EXCLUDED.lookup_count
+    RETURNING *;
+$$;
+
+-- Dollars billed since a point in time
+CREATE OR REPLACE FUNCTION skip_trace_spend_total(p_since TIMESTAMPTZ, p_is_sandbox BOOLEAN DEFAULT FALSE)
+RETURNS NUMERIC
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT COALESCE(SUM(amount), 0)
+    FROM skiptrace_spend
+    WHERE is_sandbox = p_is_sandbox AND created_at >= p_since;
+$$;
+
+GRANT EXECUTE ON FUNCTION increment_skip_trace_costs(JSONB) TO anon, authenticated;
+GRANT EXECUTE ON FUNCTION skip_trace_spend_total(TIMESTAMPTZ, BOOLEAN) TO anon, authenticated;
@@ -0,0 +1,175 @@
+-- Incrementally maintained per-town statistics
+-- town_stats holds one row per town with case, defendant, traced and phone
+-- counts. Statement-level triggers on cases, defendants, skiptrace and
+-- skiptrace_sandbox apply each write's delta, so every stats endpoint is a
+-- single-row read instead of an aggregate over the town's cases.
+--
+-- Inserts and deletes of child rows are applied as deltas. Deleting a case
+-- (which cascades to its children) or moving it to another town recomputes
+-- just the affected towns with refresh_town_stats.
+-- Replaces the town_skip_trace_stats view (SCHEMA_MIGRATION_V4_town_stats_view.sql).
+
+CREATE TABLE IF NOT EXISTS town_stats (
+    town VARCHAR(100) PRIMARY KEY,
+    total_cases INTEGER NOT NULL DEFAULT 0,
+    total_defendants INTEGER NOT NULL DEFAULT 0,
+    traced_cases INTEGER NOT NULL DEFAULT 0,
+    untraced_cases INTEGER GENERATED ALWAYS AS (total_cases - traced_cases) STORED,
+    total_phones INTEGER NOT NULL DEFAULT 0,
+    sandbox_traced_cases INTEGER NOT NULL DEFAULT 0,
+    total_sandbox_phones INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Recompute one town from the base tables
+CREATE OR REPLACE FUNCTION refresh_town_stats(p_town TEXT)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    INSERT INTO town_stats (town, total_cases, total_defendants, traced_cases, total_phones,
+                            sandbox_traced_cases, total_sandbox_phones, updated_at)
+    SELECT p_town,
+        (SELECT COUNT(*) FROM cases c WHERE c.town = p_town),
+        (SELECT COUNT(*) FROM defendants d JOIN cases c ON c.docket_number = d.docket_number
+         WHERE c.town = p_town),
+        (SELECT COUNT(DISTINCT s.docket_number) FROM skiptrace s JOIN cases c ON c.docket_number = s.docket_number
+         WHERE c.town = p_town),
+        (SELECT COUNT(*) FROM skiptrace s JOIN cases c ON c.docket_number = s.docket_number
+         WHERE c.town = p_town),
+        (SELECT COUNT(DISTINCT s.docket_number) FROM skiptrace_sandbox s
+         JOIN cases c ON c.docket_number = s.docket_number WHERE c.town = p_town),
+        (SELECT COUNT(*) FROM skiptrace_sandbox s JOIN cases c ON c.docket_number = s.docket_number
+         WHERE c.town = p_town),
+        NOW()
+    ON CONFLICT (town) DO UPDATE SET
+        total_cases = EXCLUDED.total_cases,
+        total_defendants = EXCLUDED.total_defendants,
+        traced_cases = EXCLUDED.traced_cases,
+        total_phones = EXCLUDED.total_phones,
+        sandbox_traced_cases = EXCLUDED.sandbox_traced_cases,
+        total_sandbox_phones = EXCLUDED.total_sandbox_phones,
+        updated_at = NOW();
+$$;
+
+-- Apply row-count deltas for one child table
+-- p_changes is [{docket_number, n}], the rows inserted (p_sign = 1) or deleted
+-- (p_sign = -1) per docket. A docket becomes traced when all of its phone rows
+-- are new, and untraced when none remain.
+CREATE OR REPLACE FUNCTION apply_town_stats_delta(p_source TEXT, p_changes JSONB, p_sign INTEGER)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    WITH changed AS (
+        SELECT c.town, x.n,
+            CASE p_source
+                WHEN 'skiptrace' THEN (SELECT COUNT(*) FROM skiptrace s WHERE s.docket_number = x.docket_number)
+                WHEN 'skiptrace_sandbox' THEN (SELECT COUNT(*) FROM skiptrace_sandbox s
+                                               WHERE s.docket_number = x.docket_number)
+            END AS remaining
+        FROM jsonb_to_recordset(p_changes) AS x(docket_number TEXT, n INTEGER)
+        JOIN cases c ON c.docket_number = x.docket_number
+    ),
+    per_town AS (
+        SELECT town,
+            p_sign * SUM(n) AS rows_delta,
+            p_sign * COUNT(*) FILTER (WHERE (p_sign > 0 AND remaining = n) OR (p_sign < 0 AND remaining = 0))
+                AS traced_delta
+        FROM changed
+        GROUP BY town
+    )
+    INSERT INTO town_stats (town, total_defendants, total_phones, traced_cases,
+                            total_sandbox_phones, sandbox_traced_cases)
+    SELECT town,
+        CASE WHEN p_source = 'defendants' THEN rows_delta ELSE 0 END,
+        CASE WHEN p_source = 'skiptrace' THEN rows_delta ELSE 0 END,
+        CASE WHEN p_source = 'skiptrace' THEN traced_delta ELSE 0 END,
+        CASE WHEN p_source = 'skiptrace_sandbox' THEN rows_delta ELSE 0 END,
+        CASE WHEN p_source = 'skiptrace_sandbox' THEN traced_delta ELSE 0 END
+    FROM per_town
+    ON CONFLICT (town) DO UPDATE SET
+        total_defendants = town_stats.total_defendants + EXCLUDED.total_defendants,
+        total_phones = town_stats.total_phones + EXCLUDED.total_phones,
+        traced_cases = town_stats.traced_cases + EXCLUDED.traced_cases,
+        total_sandbox_phones = town_stats.total_sandbox_phones + EXCLUDED.total_sandbox_phones,
+        sandbox_traced_cases = town_stats.sandbox_traced_cases + EXCLUDED.sandbox_traced_cases,
+        updated_at = NOW();
+$$;
+
+CREATE OR REPLACE FUNCTION town_stats_child_trigger()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM apply_town_stats_delta(TG_TABLE_NAME, (
+            SELECT jsonb_agg(jsonb_build_object('docket_number', docket_number, 'n', n))
+            FROM (SELECT docket_number, COUNT(*) AS n FROM new_rows GROUP BY docket_number) d
+        ), 1);
+    ELSE
+        PERFORM apply_town_stats_delta(TG_TABLE_NAME, (
+            SELECT jsonb_agg(jsonb_build_object('docket_number', docket_number, 'n', n))
+            FROM (SELECT docket_number, COUNT(*) AS n FROM old_rows GROUP BY docket_number) d
+        ), -1);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION town_stats_cases_trigger()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        -- A new case has no children yet, so only total_cases moves
+        INSERT INTO town_stats (town, total_cases)
+        SELECT town, COUNT(*) FROM new_rows WHERE town IS NOT NULL GROUP BY town
+        ON CONFLICT (town) DO UPDATE SET
+            total_cases = town_stats.total_cases + EXCLUDED.total_cases,
+            updated_at = NOW();
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM refresh_town_stats(town) FROM (SELECT DISTINCT town FROM old_rows WHERE town IS NOT NULL) t;
+    ELSE
+        PERFORM refresh_town_stats(town) FROM (
+            SELECT o.town FROM old_rows o JOIN new_rows n ON n.id = o.id WHERE o.town IS DISTINCT FROM n.town
+            UNION
+            SELECT n.town FROM old_rows o JOIN new_rows n ON n.id = o.id WHERE o.town IS DISTINCT FROM n.town
+        ) t WHERE town IS NOT NULL;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS town_stats_cases_insert ON cases;
+CREATE TRIGGER town_stats_cases_insert AFTER INSERT ON cases
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION town_stats_cases_trigger();
+DROP TRIGGER IF EXISTS town_stats_cases_update ON cases;
+CREATE TRIGGER town_stats_cases_update AFTER UPDATE ON cases
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION town_stats_cases_trigger();
+DROP TRIGGER IF EXISTS town_stats_cases_delete ON cases;
+CREATE TRIGGER town_stats_cases_delete AFTER DELETE ON cases
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION town_stats_cases_trigger();
+
+DO $$
+DECLARE
+    source TEXT;
+BEGIN
+    FOREACH source IN ARRAY ARRAY['defendants', 'skiptrace', 'skiptrace_sandbox'] LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS town_stats_insert ON %I', source);
+        EXECUTE format('CREATE TRIGGER town_stats_insert AFTER INSERT ON %I '
+                       'REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT '
+                       'EXECUTE FUNCTION town_stats_child_trigger()', source);
+        EXECUTE format('DROP TRIGGER IF EXISTS town_stats_delete ON %I', source);
+        EXECUTE format('CREATE TRIGGER town_stats_delete AFTER DELETE ON %I '
+                       'REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT '
+                       'EXECUTE FUNCTION town_stats_child_trigger()', source);
+    END LOOP;
+END $$;
+
+-- Backfill from the existing rows
+SELECT refresh_town_stats(town) FROM (SELECT DISTINCT town FROM cases WHERE town IS NOT NULL) t;
+
+DROP VIEW IF EXISTS town_skip_trace_stats;
+
+GRANT SELECT ON town_stats TO anon, authenticated;
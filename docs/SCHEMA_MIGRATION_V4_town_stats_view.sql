@@ -0,0 +1,19 @@
+-- Town skip trace statistics view
+-- One aggregate row per town: distinct dockets and how many of them have at
+-- least one production skip trace. A filter on town is pushed below the
+-- GROUP BY, so a single-town read only touches that town's cases.
+
+CREATE INDEX IF NOT EXISTS idx_cases_town ON cases(town);
+-- skiptrace(docket_number) is covered by uq_skiptrace_docket_phone (SCHEMA_MIGRATION_V4_natural_keys.sql)
+
+CREATE OR REPLACE VIEW town_skip_trace_stats AS
+SELECT
+    c.town,
+    COUNT(DISTINCT c.docket_number) AS total_cases,
+    COUNT(DISTINCT c.docket_number) FILTER (
+        WHERE EXISTS (SELECT 1 FROM skiptrace s WHERE s.docket_number = c.docket_number)
+    ) AS traced_cases
+FROM cases c
+GROUP BY c.town;
+
+GRANT SELECT ON town_skip_trace_stats TO anon, authenticated;
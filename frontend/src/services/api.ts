@@ -47,21 +47,11 @@ export const caseService = {
   // Get towns that have been scraped (have cases in DB)
   async getScrapedTowns(): Promise<string[]> {
     try {
-      // Get all cases with higher limit to ensure we get all towns
-      const response = await api.get('/api/v1/cases/', {
-        params: { limit: 1000 }
-      })
-      const cases = response.data.items || []
+      // One row per town from the stats view instead of paging through every case
+      const response = await api.get('/api/v1/skiptraces/town-stats')
+      const stats: TownSkipTraceStats[] = response.data || []
 
-      // Extract unique towns from cases
-      const townsSet = new Set<string>()
-      cases.forEach((c: Case) => {
-        if (c.town) {
-          townsSet.add(c.town)
-        }
-      })
-
-      return Array.from(townsSet).sort()
+      return stats.filter(s => s.scraped).map(s => s.town).sort()
     } catch (error) {
       console.error('Error fetching scraped towns:', error)
       // If the API fails, try just Middletown since you mentioned it has data
@@ -106,7 +96,8 @@ export const caseService = {
   // Get total case count
   async getTotalCaseCount(): Promise<number> {
     try {
-      const response = await api.get('/api/v1/cases/')
+      // Only the count is needed, so ask for a one-row page
+      const response = await api.get('/api/v1/cases/', { params: { limit: 1 } })
       // Use the total from pagination metadata if available
       return response.data.total || response.data.items?.length || 0
     } catch (error) {
@@ -123,6 +114,10 @@ export interface TownSkipTraceStats {
   total_cases: number
   traced_cases: number
   untraced_cases: number
+  total_defendants?: number
+  total_phones?: number
+  sandbox_traced_cases?: number
+  total_sandbox_phones?: number
   error?: string
 }
 
@@ -146,6 +141,17 @@ export const skipTraceService = {
     }
   },
 
+  // Get skip trace statistics for every scraped town
+  async getAllTownStats(): Promise<TownSkipTraceStats[]> {
+    try {
+      const response = await api.get('/api/v1/skiptraces/town-stats')
+      return response.data
+    } catch (error) {
+      console.error('Error fetching skip trace stats for all towns:', error)
+      return []
+    }
+  },
+
   // Perform skip trace for a town
   async performTownSkipTrace(town: string): Promise<any> {
     try {
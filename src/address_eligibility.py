@@ -0,0 +1,147 @@
+"""
+Pre-flight eligibility screening for skip trace lookups
+Scores each address before it is sent to BatchData so likely misses go to
+a review queue instead of being paid for
+"""
+
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from address_normalizer import STREET_SUFFIXES, AddressRecord, normalize_address
+
+# Hard rules: the address cannot match a property record
+REASON_MISSING = 'missing_address'
+REASON_PLACEHOLDER = 'placeholder_text'
+REASON_PARCEL_ID = 'parcel_id'
+REASON_PO_BOX = 'po_box'
+REASON_NO_HOUSE_NUMBER = 'no_house_number'
+REASON_NO_LOCALITY = 'no_locality'
+# Soft signals: lower the score but do not block on their own
+REASON_PLACEHOLDER_ZIP = 'placeholder_zip'
+REASON_MISSING_ZIP = 'missing_zip'
+REASON_NO_SUFFIX = 'no_street_suffix'
+REASON_LOW_SCORE = 'low_score'
+
+# Multipliers applied to the historical hit rate for each soft signal
+SOFT_PENALTIES = {
+    REASON_PLACEHOLDER_ZIP: 0.6,
+    REASON_MISSING_ZIP: 0.9,
+    REASON_NO_SUFFIX: 0.7,
+}
+
+# Hit rate assumed before any history exists, and how many traced dockets a
+# town needs before its own rate outweighs the overall rate
+DEFAULT_PRIOR = 0.5
+DEFAULT_SMOOTHING = 20
+DEFAULT_MIN_SCORE = 0.15
+
+# Court-site filler that stands in for an address; may be glued on ("BOW LANESEE COMPLAINT")
+_PLACEHOLDER_RE = re.compile(
+    r"SEE\s+(?:CLERK|COMPLAINT|ATTACHED|SCHEDULE)|\bCLERK'?S\s+NOTE|\bADDRESS\s+UNKNOWN|\bUNKNOWN\b|"
+    r"\bNOT\s+AVAILABLE\b|\bN/A\b|^\s*NONE\s*$",
+    re.IGNORECASE
+)
+# Assessor identifiers glued onto streets ("Lakeside Ave.Parcel ID R08451", "MBL16-0305")
+_PARCEL_RE = re.compile(r'PARCEL\s*(?:ID|NO|#)|MBL\s*\d|\bR0\d{4}', re.IGNORECASE)
+_PO_BOX_RE = re.compile(r'\bP\.?\s*O\.?\s*BOX\b|\bPOST\s+OFFICE\s+BOX\b', re.IGNORECASE)
+_PLACEHOLDER_ZIP_RE = re.compile(r'\b00000\b')
+
+_SUFFIX_ABBREVIATIONS = frozenset(STREET_SUFFIXES.values())
+
+
+@dataclass
+class HitRates:
+    """Historical share of traced dockets that returned phone numbers, per town"""
+    by_town: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    prior: float = DEFAULT_PRIOR
+    smoothing: int = DEFAULT_SMOOTHING
+
+    @classmethod
+    def from_counts(cls, counts: Dict[str, Dict[str, int]], smoothing: int = DEFAULT_SMOOTHING) -> 'HitRates':
+        """Build from {town: {'traced': n, 'hits': m}} as returned by the database"""
+        by_town = {(town or '').upper(): (row.get('traced', 0), row.get('hits', 0)) for town, row in counts.items()}
+        traced = sum(t for t, _ in by_town.values())
+        hits = sum(h for _, h in by_town.values())
+        prior = hits / traced if traced else DEFAULT_PRIOR
+        return cls(by_town=by_town, prior=prior, smoothing=smoothing)
+
+    def rate(self, town: Optional[str]) -> float:
+        """Town hit rate, smoothed toward the overall rate when history is thin"""
+        traced, hits = self.by_town.get((town or '').upper(), (0, 0))
+        return (hits + self.prior * self.smoothing) / (traced + self.smoothing)
+
+
+@dataclass
+class EligibilityResult:
+    """Verdict for one address"""
+    eligible: bool
+    score: float
+    reasons: List[str] = field(default_factory=list)
+    record: Optional[AddressRecord] = None
+
+    @property
+    def reason(self) -> str:
+        """Reasons joined for logs and the review queue"""
+        return ', '.join(self.reasons)
+
+
+class AddressEligibility:
+    """Rule and hit-rate based screen run before paying for a lookup
+
+    Hard rules (placeholder text, parcel IDs, PO boxes, no house number, no
+    city or ZIP) make an address ineligible outright. Otherwise the score is
+    the town's historical hit rate times a penalty for each soft signal, and
+    addresses scoring below min_score are held for review.
+    """
+
+    def __init__(self, hit_rates: Optional[HitRates] = None, min_score: float = DEFAULT_MIN_SCORE):
+        self.hit_rates = hit_rates or HitRates()
+        self.min_score = min_score
+
+    def evaluate(self, address: Optional[str], town: Optional[str] = None) -> EligibilityResult:
+        """Score a raw scraped address
+
+        Args:
+            address: Address as scraped or entered
+            town: Town of the case, used as the default city and for the hit rate
+
+        Returns:
+            EligibilityResult with the score and every reason that applied
+        """
+        raw = (address or '').strip()
+        if not raw:
+            return EligibilityResult(False, 0.0, [REASON_MISSING])
+
+        record = normalize_address(raw, default_city=town)
+        reasons = []
+        if _PLACEHOLDER_RE.search(raw):
+            reasons.append(REASON_PLACEHOLDER)
+        if _PARCEL_RE.search(raw):
+            reasons.append(REASON_PARCEL_ID)
+        if _PO_BOX_RE.search(raw):
+            reasons.append(REASON_PO_BOX)
+        if not record.house_number:
+            reasons.append(REASON_NO_HOUSE_NUMBER)
+        if not record.city and not record.zip:
+            reasons.append(REASON_NO_LOCALITY)
+        if reasons:
+            return EligibilityResult(False, 0.0, reasons, record)
+
+        if _PLACEHOLDER_ZIP_RE.search(raw):
+            reasons.append(REASON_PLACEHOLDER_ZIP)
+        elif not record.zip:
+            reasons.append(REASON_MISSING_ZIP)
+        if record.street.split(' ')[-1] not in _SUFFIX_ABBREVIATIONS:
+            reasons.append(REASON_NO_SUFFIX)
+
+        score = self.hit_rates.rate(town or record.city)
+        for reason in reasons:
+            score *= SOFT_PENALTIES[reason]
+
+        if score < self.min_score:
+            return EligibilityResult(False, score, reasons + [REASON_LOW_SCORE], record)
+        return EligibilityResult(True, score, reasons, record)
@@ -0,0 +1,303 @@
+"""
+Address normalization for skip trace lookups
+Parses scraped and user-entered addresses into canonical USPS-style records
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+# USPS Publication 28 street suffix abbreviations (common subset)
+STREET_SUFFIXES = {
+    'ALLEY': 'ALY', 'ALY': 'ALY',
+    'AVENUE': 'AVE', 'AVE': 'AVE', 'AV': 'AVE', 'AVEN': 'AVE',
+    'BOULEVARD': 'BLVD', 'BLVD': 'BLVD',
+    'CIRCLE': 'CIR', 'CIR': 'CIR',
+    'COURT': 'CT', 'CT': 'CT',
+    'COVE': 'CV', 'CV': 'CV',
+    'CROSSING': 'XING', 'XING': 'XING',
+    'DRIVE': 'DR', 'DR': 'DR', 'DRV': 'DR',
+    'EXTENSION': 'EXT', 'EXT': 'EXT',
+    'HEIGHTS': 'HTS', 'HTS': 'HTS',
+    'HIGHWAY': 'HWY', 'HWY': 'HWY',
+    'HILL': 'HL', 'HL': 'HL',
+    'LANE': 'LN', 'LN': 'LN',
+    'LOOP': 'LOOP',
+    'PARKWAY': 'PKWY', 'PKWY': 'PKWY',
+    'PATH': 'PATH',
+    'PIKE': 'PIKE',
+    'PLACE': 'PL', 'PL': 'PL',
+    'PLAZA': 'PLZ', 'PLZ': 'PLZ',
+    'POINT': 'PT', 'PT': 'PT',
+    'RIDGE': 'RDG', 'RDG': 'RDG',
+    'ROAD': 'RD', 'RD': 'RD',
+    'ROW': 'ROW',
+    'RUN': 'RUN',
+    'SQUARE': 'SQ', 'SQ': 'SQ',
+    'STREET': 'ST', 'ST': 'ST', 'STR': 'ST',
+    'TERRACE': 'TER', 'TER': 'TER', 'TERR': 'TER',
+    'TRAIL': 'TRL', 'TRL': 'TRL',
+    'TURNPIKE': 'TPKE', 'TPKE': 'TPKE', 'TPK': 'TPKE',
+    'VIEW': 'VW', 'VW': 'VW',
+    'WAY': 'WAY',
+}
+
+# USPS secondary unit designators
+UNIT_DESIGNATORS = {
+    'APARTMENT': 'APT', 'APT': 'APT',
+    'BUILDING': 'BLDG', 'BLDG': 'BLDG',
+    'FLOOR': 'FL', 'FL': 'FL',
+    'LOT': 'LOT',
+    'ROOM': 'RM', 'RM': 'RM',
+    'SUITE': 'STE', 'STE': 'STE',
+    'UNIT': 'UNIT',
+    '#': '#',
+}
+
+DIRECTIONALS = {
+    'NORTH': 'N', 'SOUTH': 'S', 'EAST': 'E', 'WEST': 'W',
+    'NORTHEAST': 'NE', 'NORTHWEST': 'NW', 'SOUTHEAST': 'SE', 'SOUTHWEST': 'SW',
+}
+
+STATE_CODES = frozenset((
+    'AL AK AZ AR CA CO CT DE DC FL GA HI ID IL IN IA KS KY LA ME MD MA MI MN MS MO MT NE NV '
+    'NH NJ NM NY NC ND OH OK OR PA RI SC SD TN TX UT VT VA WA WV WI WY PR'
+).split())
+
+# Full state names as written in user-entered addresses
+STATE_NAMES = {
+    'ALABAMA': 'AL', 'ALASKA': 'AK', 'ARIZONA': 'AZ', 'ARKANSAS': 'AR', 'CALIFORNIA': 'CA',
+    'COLORADO': 'CO', 'CONNECTICUT': 'CT', 'DELAWARE': 'DE', 'DISTRICT OF COLUMBIA': 'DC',
+    'FLORIDA': 'FL', 'GEORGIA': 'GA', 'HAWAII': 'HI', 'IDAHO': 'ID', 'ILLINOIS': 'IL', 'INDIANA': 'IN',
+    'IOWA': 'IA', 'KANSAS': 'KS', 'KENTUCKY': 'KY', 'LOUISIANA': 'LA', 'MAINE': 'ME', 'MARYLAND': 'MD',
+    'MASSACHUSETTS': 'MA', 'MICHIGAN': 'MI', 'MINNESOTA': 'MN', 'MISSISSIPPI': 'MS', 'MISSOURI': 'MO',
+    'MONTANA': 'MT', 'NEBRASKA': 'NE', 'NEVADA': 'NV', 'NEW HAMPSHIRE': 'NH', 'NEW JERSEY': 'NJ',
+    'NEW MEXICO': 'NM', 'NEW YORK': 'NY', 'NORTH CAROLINA': 'NC', 'NORTH DAKOTA': 'ND', 'OHIO': 'OH',
+    'OKLAHOMA': 'OK', 'OREGON': 'OR', 'PENNSYLVANIA': 'PA', 'RHODE ISLAND': 'RI', 'SOUTH CAROLINA': 'SC',
+    'SOUTH DAKOTA': 'SD', 'TENNESSEE': 'TN', 'TEXAS': 'TX', 'UTAH': 'UT', 'VERMONT': 'VT', 'VIRGINIA': 'VA',
+    'WASHINGTON': 'WA', 'WEST VIRGINIA': 'WV', 'WISCONSIN': 'WI', 'WYOMING': 'WY', 'PUERTO RICO': 'PR',
+}
+
+# Words that mark trailing non-address text glued onto a scraped street
+ORGANIZATION_WORDS = frozenset(('ASSOCIATION', 'ASSN', 'INC', 'LLC', 'CONDOMINIUM', 'CONDOMINIUMS', 'TRUST'))
+
+# Precompiled patterns
+# A street suffix with the next word glued on, e.g. "LaneCarriage Crossing Association"
+_GLUED_SUFFIX_RE = re.compile(r'\b((?i:' + '|'.join(sorted(STREET_SUFFIXES, key=len, reverse=True)) + r'))(?=[A-Z][a-z])')
+_PUNCTUATION_RE = re.compile(r'[.;]+')
+_WHITESPACE_RE = re.compile(r'\s+')
+_LEADING_HASH_RE = re.compile(r'^#\s*(?=\d)')
+_HOUSE_NUMBER_RE = re.compile(r'^(\d+[A-Z]?(?:-\d+[A-Z]?)?|\d+\s+\d/\d)\b')
+_UNIT_RE = re.compile(
+    r'(?:\b(' + '|'.join(sorted((d for d in UNIT_DESIGNATORS if d != '#'), key=len, reverse=True)) +
+    r')\b|#)\s*#?\s*([A-Z0-9][A-Z0-9-]*)?\s*$'
+)
+_STATE_ZIP_TAIL_RE = re.compile(r'(?:^|\s)([A-Z]{2})?\s*(\d{5})(?:-?(\d{4}))?$')
+_STATE_TAIL_RE = re.compile(r'(?:^|\s)([A-Z]{2})$')
+_ZIP_RE = re.compile(r'^(\d{5})(?:-?\d{4})?$')
+# A full state name after the city, optionally followed by the ZIP; a lone name
+# ("Washington 06793") is left alone since it may be the city
+_STATE_NAME_TAIL_RE = re.compile(
+    r'\s(' + '|'.join(sorted(STATE_NAMES, key=len, reverse=True)) + r')(?=(?:\s+\d{5}(?:-?\d{4})?)?$)'
+)
+
+
+@dataclass(frozen=True)
+class AddressRecord:
+    """Normalized address"""
+    raw: str
+    street: str = ''
+    unit: Optional[str] = None
+    city: str = ''
+    state: str = ''
+    zip: str = ''
+    house_number: Optional[str] = None
+
+    @property
+    def street_line(self) -> str:
+        """Street with the secondary unit appended"""
+        return f"{self.street} {self.unit}" if self.unit else self.street
+
+    @property
+    def cache_key(self) -> str:
+        """Canonical key shared by every spelling of the same address"""
+        return '|'.join((self.street_line, self.city, self.state, self.zip))
+
+    def to_api_dict(self) -> Dict[str, str]:
+        """propertyAddress dict for the BatchData API"""
+        return {
+            'street': self.street_line,
+            'city': self.city,
+            'state': self.state,
+            'zip': self.zip
+        }
+
+
+def _clean(text: str) -> str:
+    """Uppercase, drop periods and collapse whitespace"""
+    text = _PUNCTUATION_RE.sub(' ', text.upper())
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+def _normalize_zip(value: Optional[str]) -> str:
+    """Return the 5-digit ZIP, or '' when missing or a placeholder"""
+    match = _ZIP_RE.match((value or '').strip())
+    if not match or match.group(1) == '00000':
+        return ''
+    return match.group(1)
+
+
+def _is_unit(head: str, identifier: Optional[str]) -> bool:
+    """Whether a trailing designator match is a secondary unit rather than the street name
+
+    The designator must follow at least one street-name word and not be
+    followed by a street suffix, so "100 SUITE RD" and "77 LOT LN" stay streets.
+    """
+    if identifier in STREET_SUFFIXES:
+        return False
+    return bool(_HOUSE_NUMBER_RE.sub('', head).strip())
+
+
+@lru_cache(maxsize=65536)
+def _normalize_street(street: str):
+    """Split a street line into (street, unit, house_number) in USPS form"""
+    # Text glued onto the street suffix by the scraper is kept only if it is a unit
+    match = _GLUED_SUFFIX_RE.search(street)
+    if match:
+        head, tail = street[:match.end()], street[match.end():]
+        street = f"{head} {tail}" if _UNIT_RE.match(_clean(tail)) else head
+    street = _clean(street)
+    street = _LEADING_HASH_RE.sub('', street)
+
+    unit = None
+    match = _UNIT_RE.search(street)
+    if match and _is_unit(street[:match.start()], match.group(2)):
+        designator = UNIT_DESIGNATORS[match.group(1) or '#']
+        unit = f"{designator} {match.group(2)}" if match.group(2) else designator
+        street = street[:match.start()].strip()
+
+    words = street.split(' ') if street else []
+
+    # Drop trailing organization names ("... HILL RD BRIDGE ASSOCIATION INC")
+    org_index = next((i for i, word in enumerate(words) if word in ORGANIZATION_WORDS), None)
+    if org_index is not None:
+        suffix_index = next((i for i in range(org_index - 1, 0, -1) if words[i] in STREET_SUFFIXES), None)
+        if suffix_index is not None:
+            words = words[:suffix_index + 1]
+
+    house_number = None
+    match = _HOUSE_NUMBER_RE.match(' '.join(words))
+    if match:
+        house_number = match.group(1)
+
+    if len(words) > 2 and words[-1] in STREET_SUFFIXES:
+        words[-1] = STREET_SUFFIXES[words[-1]]
+    start = 1 if house_number else 0
+    if len(words) > start + 2 and words[start] in DIRECTIONALS:
+        words[start] = DIRECTIONALS[words[start]]
+
+    return ' '.join(words), unit, house_number
+
+
+def _split_tail(tail: str):
+    """Split "CITY ST 06457" style text into (city, state, zip)"""
+    tail = _STATE_NAME_TAIL_RE.sub(lambda match: ' ' + STATE_NAMES[match.group(1)], tail, count=1)
+    state = ''
+    zip_code = ''
+    match = _STATE_ZIP_TAIL_RE.search(tail)
+    if match and (match.group(1) is None or match.group(1) in STATE_CODES):
+        state = match.group(1) or ''
+        zip_code = _normalize_zip(match.group(2))
+        tail = tail[:match.start()].strip()
+    else:
+        match = _STATE_TAIL_RE.search(tail)
+        if match and match.group(1) in STATE_CODES:
+            state = match.group(1)
+            tail = tail[:match.start()].strip()
+    return tail, state, zip_code
+
+
+@lru_cache(maxsize=65536)
+def _normalize(raw: str, default_city: str, default_state: str, default_zip: str) -> AddressRecord:
+    parts = [part.strip() for part in raw.split(',') if part.strip()]
+    if not parts:
+        return AddressRecord(raw=raw, city=default_city, state=default_state, zip=default_zip)
+
+    street_part = parts[0]
+    rest = parts[1:]
+
+    # "1 Russell St., Unit 5, Middletown, CT" - unit in its own part
+    if rest and _UNIT_RE.match(_clean(rest[0])):
+        street_part = f"{street_part} {rest[0]}"
+        rest = rest[1:]
+
+    city, state, zip_code = '', '', ''
+    if rest:
+        city, state, zip_code = _split_tail(_clean(' '.join(rest)))
+    else:
+        # No commas: peel a trailing "ST 06457" off the street, then the default city
+        cleaned = _clean(street_part)
+        remainder, state, zip_code = _split_tail(cleaned)
+        if state or zip_code:
+            street_part = remainder
+            if default_city and remainder.endswith(' ' + default_city):
+                street_part = remainder[:-len(default_city)].strip()
+                city = default_city
+
+    street, unit, house_number = _normalize_street(street_part)
+    return AddressRecord(
+        raw=raw,
+        street=street,
+        unit=unit,
+        city=city or default_city,
+        state=state or default_state,
+        zip=zip_code or default_zip,
+        house_number=house_number
+    )
+
+
+def normalize_address(raw: Optional[str], default_city: Optional[str] = None,
+                      default_state: Optional[str] = 'CT', default_zip: Optional[str] = None) -> AddressRecord:
+    """Normalize one free-form address string
+
+    Args:
+        raw: Address such as "123 Main Street, Middletown, CT 06457"
+        default_city: City to use when the string has none (e.g. the case's town)
+        default_state: State to use when the string has none
+        default_zip: ZIP to use when the string has none
+
+    Returns:
+        AddressRecord with canonical street, unit, city, state, zip and cache_key
+    """
+    return _normalize(raw or '', _clean(default_city or ''), _clean(default_state or ''),
+                      _normalize_zip(default_zip))
+
+
+def normalize_addresses(raws: Iterable[Optional[str]], default_city: Optional[str] = None,
+                        default_state: Optional[str] = 'CT',
+                        default_zip: Optional[str] = None) -> List[AddressRecord]:
+    """Normalize a batch of address strings
+
+    Defaults are normalized once for the whole batch and repeated
+    addresses are served from the parse cache.
+    """
+    city = _clean(default_city or '')
+    state = _clean(default_state or '')
+    zip_code = _normalize_zip(default_zip)
+    return [_normalize(raw or '', city, state, zip_code) for raw in raws]
+
+
+def normalize_address_fields(street: Optional[str], city: Optional[str] = None, state: Optional[str] = None,
+                             zip_code: Optional[str] = None) -> AddressRecord:
+    """Normalize an address that is already split into fields (e.g. an API propertyAddress)"""
+    street_line, unit, house_number = _normalize_street(street or '')
+    return AddressRecord(
+        raw=street or '',
+        street=street_line,
+        unit=unit,
+        city=_clean(city or ''),
+        state=STATE_NAMES.get(_clean(state or ''), _clean(state or '')),
+        zip=_normalize_zip(zip_code),
+        house_number=house_number
+    )
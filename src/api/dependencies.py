@@ -3,19 +3,20 @@ Shared dependencies for FastAPI endpoints
 """
 
 from typing import Optional
-from fastapi import Query
+from fastapi import HTTPException, Query
 import sys
 import os
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from db_connector import DatabaseConnector
+from async_db_connector import AsyncDatabaseConnector, get_async_database
+from api.v1.schemas.common import PaginatedResponse
 
 
-def get_db() -> DatabaseConnector:
-    """Get database connection"""
-    return DatabaseConnector()
+async def get_db() -> AsyncDatabaseConnector:
+    """Get the shared async database connection (one Supabase client per event loop)"""
+    return await get_async_database()
 
 
 class PaginationParams:
@@ -23,10 +24,35 @@ class PaginationParams:
     def __init__(
         self,
         skip: int = Query(0, ge=0, description="Number of records to skip"),
-        limit: int = Query(100, ge=1, le=1000, description="Number of records to return")
+        limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page (overrides skip)"),
+        count: Optional[str] = Query("exact", pattern="^(exact|planned|estimated)$",
+                                     description="How the total is counted; planned/estimated are cheaper on large tables")
     ):
         self.skip = skip
         self.limit = limit
+        self.cursor = cursor
+        self.count = count
+
+    async def page(self, db: AsyncDatabaseConnector, table_name: str, **filters) -> PaginatedResponse:
+        """Fetch one page of table_name from the database as a PaginatedResponse
+
+        Raises:
+            HTTPException: 400 if the cursor is malformed
+        """
+        try:
+            page = await db.list_page(table_name, filters, skip=self.skip, limit=self.limit,
+                                      cursor=self.cursor, count=self.count)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return PaginatedResponse(
+            items=page['items'],
+            total=page['total'],
+            skip=0 if self.cursor else self.skip,
+            limit=self.limit,
+            has_more=page['has_more'],
+            next_cursor=page['next_cursor']
+        )
 
 
 class SearchParams:
@@ -35,7 +61,7 @@ class SearchParams:
         self,
         q: Optional[str] = Query(None, description="Search query"),
         sort_by: Optional[str] = Query(None, description="Field to sort by"),
-        sort_order: str = Query("asc", regex="^(asc|desc)$", description="Sort order")
+        sort_order: str = Query("asc", pattern="^(asc|desc)$", description="Sort order")
     ):
         self.q = q
         self.sort_by = sort_by
@@ -13,22 +13,30 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from api.v1.endpoints import cases, defendants, skiptraces, towns, scraper
-from db_connector import DatabaseConnector
+from async_db_connector import close_async_database, get_async_database
+from db_connector import close_database
+from connector_registry import get_connector_registry
 
 # Create FastAPI app with lifespan
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     print("Starting FastAPI application...")
-    # Test database connection
-    db = DatabaseConnector()
-    if db.test_connection():
+    # Create the shared database client and test the connection
+    db = await get_async_database()
+    if await db.test_connection():
         print("✓ Database connection successful")
     else:
         print("⚠ Database connection failed - some features may not work")
     yield
     # Shutdown
     print("Shutting down FastAPI application...")
+    registry = get_connector_registry()
+    await registry.aclose()
+    registry.close()
+    await close_async_database()
+    # Skip trace integrations still use the sync connector
+    close_database()
 
 # Create FastAPI instance
 app = FastAPI(
@@ -71,8 +79,8 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    db = DatabaseConnector()
-    db_status = "healthy" if db.test_connection() else "unhealthy"
+    db = await get_async_database()
+    db_status = "healthy" if await db.test_connection() else "unhealthy"
 
     return {
         "status": "healthy" if db_status == "healthy" else "degraded",
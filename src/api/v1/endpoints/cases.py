@@ -13,7 +13,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirna
 from api.v1.schemas.case import Case, CaseCreate, CaseUpdate, CaseWithDefendants
 from api.v1.schemas.common import PaginatedResponse, APIResponse
 from api.dependencies import get_db, PaginationParams
-from db_connector import DatabaseConnector
+from async_db_connector import AsyncDatabaseConnector
+from db_connector import CASE_KEY
 
 router = APIRouter()
 
@@ -22,31 +23,16 @@ router = APIRouter()
 async def list_cases(
     pagination: PaginationParams = Depends(),
     town: Optional[str] = Query(None, description="Filter by town"),
-    db: DatabaseConnector = Depends(get_db)
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     List all cases with optional filtering and pagination
     """
     try:
-        # Get cases based on filter
-        if town:
-            cases = db.get_cases_by_town(town)
-        else:
-            # Get all cases (with pagination in mind)
-            response = db.client.table('cases').select("*").execute()
-            cases = response.data if response.data else []
-
-        # Apply pagination
-        total = len(cases)
-        paginated_cases = cases[pagination.skip:pagination.skip + pagination.limit]
-
-        return PaginatedResponse(
-            items=paginated_cases,
-            total=total,
-            skip=pagination.skip,
-            limit=pagination.limit,
-            has_more=(pagination.skip + pagination.limit) < total
-        )
+        # Newest first; only the requested page is read from the database
+        return await pagination.page(db, 'cases', town=town)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -54,14 +40,14 @@ async def list_cases(
 @router.get("/search")
 async def search_cases(
     q: str = Query(..., description="Search query"),
-    db: DatabaseConnector = Depends(get_db)
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     Search cases by case name or docket number
     """
     try:
         # Search in case_name and docket_number
-        response = db.client.table('cases').select("*").or_(
+        response = await db.client.table('cases').select("*").or_(
             f"case_name.ilike.%{q}%,docket_number.ilike.%{q}%"
         ).execute()
 
@@ -78,13 +64,13 @@ async def search_cases(
 @router.get("/by-town/{town}")
 async def get_cases_by_town(
     town: str,
-    db: DatabaseConnector = Depends(get_db)
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     Get all cases for a specific town
     """
     try:
-        cases = db.get_cases_by_town(town)
+        cases = await db.get_cases_by_town(town)
         return {
             "town": town,
             "cases": cases,
@@ -97,18 +83,18 @@ async def get_cases_by_town(
 @router.get("/{docket_number}", response_model=CaseWithDefendants)
 async def get_case(
     docket_number: str,
-    db: DatabaseConnector = Depends(get_db)
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     Get a single case by docket number with defendants
     """
     try:
-        case = db.get_case_by_docket(docket_number)
+        case = await db.get_case_by_docket(docket_number)
         if not case:
             raise HTTPException(status_code=404, detail="Case not found")
 
         # Get associated defendants
-        defendants = db.get_defendants_by_docket(docket_number)
+        defendants = await db.get_defendants_by_docket(docket_number)
 
         return CaseWithDefendants(
             **case,
@@ -124,23 +110,20 @@ async def get_case(
 @router.post("/", response_model=Case)
 async def create_case(
     case_data: CaseCreate,
-    db: DatabaseConnector = Depends(get_db)
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     Create a new case
     """
     try:
-        # Check if case already exists
-        existing = db.get_case_by_docket(case_data.docket_number)
-        if existing:
-            raise HTTPException(status_code=400, detail="Case with this docket number already exists")
-
-        # Create case
-        result = db.insert_case(case_data.model_dump())
-        if not result:
+        # Insert unless the docket already exists; one request, no check-then-insert race
+        inserted = await db.insert_ignore('cases', [case_data.model_dump()], CASE_KEY)
+        if inserted is None:
             raise HTTPException(status_code=500, detail="Failed to create case")
+        if not inserted:
+            raise HTTPException(status_code=400, detail="Case with this docket number already exists")
 
-        return result
+        return inserted[0]
     except HTTPException:
         raise
     except Exception as e:
@@ -151,21 +134,21 @@ async def create_case(
 async def update_case(
     docket_number: str,
     case_update: CaseUpdate,
-    db: DatabaseConnector = Depends(get_db)
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     Update a case by docket number
     """
     try:
         # Check if case exists
-        existing = db.get_case_by_docket(docket_number)
+        existing = await db.get_case_by_docket(docket_number)
         if not existing:
             raise HTTPException(status_code=404, detail="Case not found")
 
         # Update case
         update_data = case_update.model_dump(exclude_unset=True)
         if update_data:
-            response = db.client.table('cases').update(update_data).eq(
+            response = await db.client.table('cases').update(update_data).eq(
                 'docket_number', docket_number
             ).execute()
 
@@ -182,19 +165,19 @@ async def update_case(
 @router.delete("/{docket_number}", response_model=APIResponse)
 async def delete_case(
     docket_number: str,
-    db: DatabaseConnector = Depends(get_db)
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     Delete a case by docket number
     """
     try:
         # Check if case exists
-        existing = db.get_case_by_docket(docket_number)
+        existing = await db.get_case_by_docket(docket_number)
         if not existing:
             raise HTTPException(status_code=404, detail="Case not found")
 
         # Delete case (cascade will handle defendants and skiptraces)
-        response = db.client.table('cases').delete().eq(
+        response = await db.client.table('cases').delete().eq(
             'docket_number', docket_number
         ).execute()
 
@@ -14,7 +14,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirna
 
 from api.v1.schemas.common import APIResponse
 from api.dependencies import get_db
-from db_connector import DatabaseConnector
+from async_db_connector import AsyncDatabaseConnector
 from scraper_db_integration import ScraperDatabaseIntegration
 from ct_town_scraper import CTTownScraper
 import uuid
@@ -76,14 +76,14 @@ def run_scrape_task(job_id: str, town: str, store_in_db: bool):
 async def start_scraping(
     scrape_request: ScrapeRequest,
     background_tasks: BackgroundTasks,
-    db: DatabaseConnector = Depends(get_db)
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     Start a scraping job for a town
     """
     try:
         # Validate town
-        ct_towns = db.get_all_ct_towns()
+        ct_towns = await db.get_all_ct_towns()
         scraper = CTTownScraper()
         scraper.towns_data = [(t['town'], t['county']) for t in ct_towns]
 
@@ -133,7 +133,7 @@ async def get_scrape_status(job_id: str):
 @router.get("/history")
 async def get_scrape_history(
     limit: int = 10,
-    db: DatabaseConnector = Depends(get_db)
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     Get recent scraping history
@@ -147,7 +147,7 @@ async def get_scrape_history(
         )[:limit]
 
         # Also get some stats from database
-        response = db.client.table('cases').select("town, created_at").order(
+        response = await db.client.table('cases').select("town, created_at").order(
             'created_at', desc=True
         ).limit(100).execute()
 
@@ -172,14 +172,14 @@ async def get_scrape_history(
 @router.post("/scrape-town")
 async def scrape_single_town(
     request: ScrapeRequest,
-    db: DatabaseConnector = Depends(get_db)
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     Synchronously scrape a single town and store in database
     """
     try:
         # Validate town
-        ct_towns = db.get_all_ct_towns()
+        ct_towns = await db.get_all_ct_towns()
         scraper = CTTownScraper()
         scraper.towns_data = [(t['town'], t['county']) for t in ct_towns]
 
@@ -206,7 +206,7 @@ async def scrape_single_town(
 async def scrape_all_towns(
     background_tasks: BackgroundTasks,
     counties: Optional[list] = None,
-    db: DatabaseConnector = Depends(get_db)
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     Start scraping all Connecticut towns (or specific counties)
@@ -214,7 +214,7 @@ async def scrape_all_towns(
     """
     try:
         # Get all towns
-        all_towns = db.get_all_ct_towns()
+        all_towns = await db.get_all_ct_towns()
 
         # Filter by counties if specified
         if counties:
@@ -2,6 +2,7 @@
 Skip Traces API endpoints
 """
 
+from datetime import date, datetime, time, timedelta, timezone
 from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks
 import sys
@@ -13,8 +14,9 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirna
 from api.v1.schemas.skiptrace import SkipTrace, SkipTraceCreate, SkipTraceResult, SkipTraceCostSummary
 from api.v1.schemas.common import PaginatedResponse, APIResponse
 from api.dependencies import get_db, PaginationParams
-from db_connector import DatabaseConnector
+from async_db_connector import AsyncDatabaseConnector
 from skip_trace_integration import SkipTraceIntegration
+from address_normalizer import normalize_address
 
 router = APIRouter()
 
@@ -23,37 +25,31 @@ router = APIRouter()
 async def perform_skip_trace(
     trace_request: SkipTraceCreate,
     background_tasks: BackgroundTasks,
-    db: DatabaseConnector = Depends(get_db)
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     Perform a skip trace lookup for an address
     """
     try:
         # Verify case exists
-        case = db.get_case_by_docket(trace_request.docket_number)
+        case = await db.get_case_by_docket(trace_request.docket_number)
         if not case:
             raise HTTPException(status_code=404, detail="Case not found")
 
         # Initialize skip trace integration
-        skip_trace = SkipTraceIntegration()
+        skip_trace = SkipTraceIntegration(use_sandbox=trace_request.use_sandbox)
 
-        # Parse address (simplified for now)
-        address_parts = trace_request.address.split(',')
-        if len(address_parts) < 2:
+        # Parse address
+        record = normalize_address(trace_request.address)
+        if not record.street or not (record.city or record.zip):
             raise HTTPException(status_code=400, detail="Invalid address format")
+        address_dict = record.to_api_dict()
 
-        address_dict = {
-            'street': address_parts[0].strip(),
-            'city': address_parts[1].strip() if len(address_parts) > 1 else '',
-            'state': address_parts[2].strip() if len(address_parts) > 2 else 'CT',
-            'zip': address_parts[3].strip() if len(address_parts) > 3 else ''
-        }
-
-        # Perform skip trace
-        result = skip_trace.perform_skip_trace(
+        # Perform skip trace without blocking the event loop; a slow response is hedged
+        result = await skip_trace.perform_skip_trace_async(
             docket_number=trace_request.docket_number,
             addresses=[address_dict],
-            use_sandbox=trace_request.use_sandbox
+            hedge=True
         )
 
         if result['success']:
@@ -85,37 +81,16 @@ async def get_skip_trace_history(
     pagination: PaginationParams = Depends(),
     docket_number: Optional[str] = Query(None, description="Filter by docket number"),
     source: Optional[str] = Query(None, description="Filter by source (sandbox/production)"),
-    db: DatabaseConnector = Depends(get_db)
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     Get skip trace history with optional filtering
     """
     try:
-        # Build query
-        query = db.client.table('skiptrace').select("*")
-
-        if docket_number:
-            query = query.eq('docket_number', docket_number)
-        if source:
-            query = query.eq('source', source)
-
-        # Order by created_at descending
-        query = query.order('created_at', desc=True)
-
-        response = query.execute()
-        traces = response.data if response.data else []
-
-        # Apply pagination
-        total = len(traces)
-        paginated_traces = traces[pagination.skip:pagination.skip + pagination.limit]
-
-        return PaginatedResponse(
-            items=paginated_traces,
-            total=total,
-            skip=pagination.skip,
-            limit=pagination.limit,
-            has_more=(pagination.skip + pagination.limit) < total
-        )
+        # Newest first; only the requested page is read from the database
+        return await pagination.page(db, 'skiptrace', docket_number=docket_number, source=source)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -123,21 +98,21 @@ async def get_skip_trace_history(
 @router.get("/by-defendant/{defendant_id}")
 async def get_skip_traces_by_defendant(
     defendant_id: int,
-    db: DatabaseConnector = Depends(get_db)
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     Get all skip traces for a specific defendant
     """
     try:
         # Get defendant to find docket number
-        response = db.client.table('defendants').select("docket_number").eq('id', defendant_id).execute()
+        response = await db.client.table('defendants').select("docket_number").eq('id', defendant_id).execute()
         if not response.data:
             raise HTTPException(status_code=404, detail="Defendant not found")
 
         docket_number = response.data[0]['docket_number']
 
         # Get skip traces
-        traces_response = db.client.table('skiptrace').select("*").eq(
+        traces_response = await db.client.table('skiptrace').select("*").eq(
             'docket_number', docket_number
         ).execute()
         traces = traces_response.data if traces_response.data else []
@@ -154,17 +129,30 @@ async def get_skip_traces_by_defendant(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/town-stats")
+async def get_all_town_skip_trace_stats(
+    db: AsyncDatabaseConnector = Depends(get_db)
+):
+    """
+    Get skip trace statistics for every scraped town in one response
+    """
+    try:
+        return await db.get_all_town_skip_trace_stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/town-stats/{town}")
 async def get_town_skip_trace_stats(
     town: str,
-    db: DatabaseConnector = Depends(get_db)
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     Get skip trace statistics for a specific town
     Returns total cases found, traced cases, and untraced cases
     """
     try:
-        stats = db.get_town_skip_trace_stats(town)
+        stats = await db.get_town_skip_trace_stats(town)
         return stats
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -174,7 +162,7 @@ async def get_town_skip_trace_stats(
 async def perform_town_batch_skip_trace(
     request: dict,
     background_tasks: BackgroundTasks,
-    db: DatabaseConnector = Depends(get_db)
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     Perform skip trace for all untraced cases in a town
@@ -185,57 +173,19 @@ async def perform_town_batch_skip_trace(
 
     try:
         # Get all cases for the town
-        cases = db.get_cases_by_town(town)
+        cases = await db.get_cases_by_town(town)
         if not cases:
             raise HTTPException(status_code=404, detail=f"No cases found for town: {town}")
 
-        # Initialize skip trace integration
-        skip_trace = SkipTraceIntegration()
-
-        # Track results
-        processed = 0
-        skipped = 0
-        failed = 0
-
-        for case in cases:
-            docket_number = case['docket_number']
-
-            # Check if already skip traced
-            existing_traces = db.get_skiptraces_by_docket(docket_number)
-            if existing_traces:
-                skipped += 1
-                continue
-
-            # Get defendant addresses for this case
-            defendants = db.get_defendants_by_docket(docket_number)
-            if not defendants:
-                failed += 1
-                continue
-
-            addresses = []
-            for defendant in defendants:
-                if defendant.get('address'):
-                    addresses.append({
-                        'street': defendant['address'],
-                        'city': defendant.get('town', ''),
-                        'state': defendant.get('state', 'CT'),
-                        'zip': defendant.get('zip', '')
-                    })
-
-            if addresses:
-                # Perform skip trace
-                result = skip_trace.perform_skip_trace(
-                    docket_number=docket_number,
-                    addresses=addresses,
-                    use_sandbox=False
-                )
-
-                if result['success']:
-                    processed += 1
-                else:
-                    failed += 1
-            else:
-                failed += 1
+        # Initialize skip trace integration (production, as before)
+        skip_trace = SkipTraceIntegration(use_sandbox=False)
+
+        # Already-traced cases are skipped; lookups run concurrently
+        stats = await skip_trace.process_town_skip_traces_async(town, cases=cases)
+
+        processed = stats['cases_processed'] - stats['cases_failed']
+        skipped = stats['cases_skipped']
+        failed = stats['cases_failed']
 
         return {
             "town": town,
@@ -254,62 +204,81 @@ async def perform_town_batch_skip_trace(
 
 @router.get("/costs", response_model=SkipTraceCostSummary)
 async def get_skip_trace_costs(
-    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
-    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
-    db: DatabaseConnector = Depends(get_db)
+    start_date: Optional[date] = Query(None, description="Start date (YYYY-MM-DD); dated totals come from the spend ledger"),
+    end_date: Optional[date] = Query(None, description="End date (YYYY-MM-DD), inclusive"),
+    town: Optional[str] = Query(None, description="Filter by town"),
+    sandbox: Optional[bool] = Query(None, description="Only sandbox (true) or production (false) costs"),
+    details_skip: int = Query(0, ge=0, description="Per-docket cost rows to skip"),
+    details_limit: int = Query(0, ge=0, le=1000, description="Per-docket cost rows to return (0 = none)"),
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     Get skip trace cost summary
+    Aggregated in the database, per town and per day. A date range and by_day read the
+    spend ledger, written by every town run, single lookup and scheduler dispatch; costs
+    recorded before the ledger existed are only in the all-time totals.
     """
     try:
-        # Get all skip traces
-        query = db.client.table('skiptrace').select("source")
-
-        # Add date filters if provided
-        if start_date:
-            query = query.gte('created_at', start_date)
-        if end_date:
-            query = query.lte('created_at', end_date)
-
-        response = query.execute()
-        traces = response.data if response.data else []
-
-        # Calculate costs
-        total_lookups = len(traces)
-        sandbox_lookups = sum(1 for t in traces if t.get('source') == 'sandbox')
-        production_lookups = total_lookups - sandbox_lookups
+        since = datetime.combine(start_date, time.min, timezone.utc) if start_date else None
+        until = datetime.combine(end_date + timedelta(days=1), time.min, timezone.utc) if end_date else None
+        costs = await db.get_skip_trace_costs(town=town, is_sandbox=sandbox, since=since, until=until,
+                                              details_limit=details_limit, details_offset=details_skip)
 
-        # Assuming $0.07 per production lookup, $0 for sandbox
-        total_cost = production_lookups * 0.07
-        average_cost = total_cost / total_lookups if total_lookups > 0 else 0
+        lookups = {row['is_sandbox']: row['lookups'] for row in costs['by_environment']}
 
         return SkipTraceCostSummary(
-            total_lookups=total_lookups,
-            sandbox_lookups=sandbox_lookups,
-            production_lookups=production_lookups,
-            total_cost=total_cost,
-            average_cost_per_lookup=average_cost
+            total_cases=costs['total_cases'],
+            total_lookups=costs['total_lookups'],
+            sandbox_lookups=lookups.get(True, 0),
+            production_lookups=lookups.get(False, 0),
+            total_cost=costs['total_cost'],
+            average_cost_per_lookup=costs['cost_per_lookup'],
+            by_town=costs['by_town'],
+            by_day=costs['by_day'],
+            details=costs['details'],
+            details_has_more=costs['details_has_more']
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/{skip_trace_id}/raw-response")
+async def get_skip_trace_raw_response(
+    skip_trace_id: int,
+    sandbox: bool = Query(False, description="Read from skiptrace_sandbox"),
+    db: AsyncDatabaseConnector = Depends(get_db)
+):
+    """
+    Get the raw BatchData response behind a skip trace record
+    The archived payload is only decompressed for this request
+    """
+    try:
+        payload = await db.get_skiptrace_raw_response(skip_trace_id, is_sandbox=sandbox)
+        if payload is None:
+            raise HTTPException(status_code=404, detail="No raw response stored for this skip trace")
+        return {"skip_trace_id": skip_trace_id, "api_response": payload}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.delete("/{skip_trace_id}", response_model=APIResponse)
 async def delete_skip_trace(
     skip_trace_id: int,
-    db: DatabaseConnector = Depends(get_db)
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     Delete a skip trace record
     """
     try:
         # Check if skip trace exists
-        response = db.client.table('skiptrace').select("*").eq('id', skip_trace_id).execute()
+        response = await db.client.table('skiptrace').select("*").eq('id', skip_trace_id).execute()
         if not response.data:
             raise HTTPException(status_code=404, detail="Skip trace not found")
 
         # Delete skip trace
-        db.client.table('skiptrace').delete().eq('id', skip_trace_id).execute()
+        await db.client.table('skiptrace').delete().eq('id', skip_trace_id).execute()
 
         return APIResponse(
             success=True,
@@ -13,7 +13,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirna
 from api.v1.schemas.town import Town, TownCreate, TownValidation, CountyInfo
 from api.v1.schemas.common import APIResponse
 from api.dependencies import get_db
-from db_connector import DatabaseConnector
+from async_db_connector import AsyncDatabaseConnector
 from ct_town_scraper import CTTownScraper
 
 router = APIRouter()
@@ -22,16 +22,16 @@ router = APIRouter()
 @router.get("/", response_model=List[Town])
 async def list_towns(
     county: Optional[str] = Query(None, description="Filter by county"),
-    db: DatabaseConnector = Depends(get_db)
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     List all Connecticut towns with optional county filter
     """
     try:
         if county:
-            towns = db.get_towns_by_county(county)
+            towns = await db.get_towns_by_county(county)
         else:
-            towns = db.get_all_ct_towns()
+            towns = await db.get_all_ct_towns()
 
         return towns
     except Exception as e:
@@ -40,14 +40,14 @@ async def list_towns(
 
 @router.get("/counties", response_model=List[CountyInfo])
 async def list_counties(
-    db: DatabaseConnector = Depends(get_db)
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     List all Connecticut counties with town counts
     """
     try:
         # Get all towns
-        all_towns = db.get_all_ct_towns()
+        all_towns = await db.get_all_ct_towns()
 
         # Group by county
         counties_dict = {}
@@ -74,13 +74,13 @@ async def list_counties(
 @router.get("/by-county/{county}")
 async def get_towns_by_county(
     county: str,
-    db: DatabaseConnector = Depends(get_db)
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     Get all towns in a specific county
     """
     try:
-        towns = db.get_towns_by_county(county)
+        towns = await db.get_towns_by_county(county)
         if not towns:
             raise HTTPException(status_code=404, detail=f"County '{county}' not found")
 
@@ -98,14 +98,14 @@ async def get_towns_by_county(
 @router.get("/search")
 async def search_towns(
     q: str = Query(..., min_length=2, description="Search query"),
-    db: DatabaseConnector = Depends(get_db)
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     Fuzzy search for Connecticut towns
     """
     try:
         # Get all towns
-        all_towns = db.get_all_ct_towns()
+        all_towns = await db.get_all_ct_towns()
 
         # Perform fuzzy search
         q_lower = q.lower()
@@ -140,14 +140,14 @@ async def search_towns(
 @router.get("/validate/{town_name}", response_model=TownValidation)
 async def validate_town(
     town_name: str,
-    db: DatabaseConnector = Depends(get_db)
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     Validate if a town name is a valid Connecticut town
     """
     try:
         # Get all towns for validation
-        all_towns = db.get_all_ct_towns()
+        all_towns = await db.get_all_ct_towns()
 
         # Create scraper instance for validation
         scraper = CTTownScraper()
@@ -179,14 +179,14 @@ async def validate_town(
 
 @router.post("/populate", response_model=APIResponse)
 async def populate_towns(
-    db: DatabaseConnector = Depends(get_db)
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     Populate or refresh Connecticut towns data from scraper
     """
     try:
         # Check if already populated
-        existing = db.get_all_ct_towns()
+        existing = await db.get_all_ct_towns()
         if existing:
             return APIResponse(
                 success=False,
@@ -201,7 +201,7 @@ async def populate_towns(
             raise HTTPException(status_code=500, detail="Failed to scrape towns data")
 
         # Populate database
-        inserted = db.populate_ct_towns(towns_data)
+        inserted = await db.populate_ct_towns(towns_data)
 
         return APIResponse(
             success=True,
@@ -215,14 +215,14 @@ async def populate_towns(
 
 @router.post("/refresh", response_model=APIResponse)
 async def refresh_towns(
-    db: DatabaseConnector = Depends(get_db)
+    db: AsyncDatabaseConnector = Depends(get_db)
 ):
     """
     Refresh Connecticut towns data (clear and repopulate)
     """
     try:
         # Clear existing data
-        db.clear_ct_towns()
+        await db.clear_ct_towns()
 
         # Scrape towns
         scraper = CTTownScraper()
@@ -232,7 +232,7 @@ async def refresh_towns(
             raise HTTPException(status_code=500, detail="Failed to scrape towns data")
 
         # Populate database
-        inserted = db.populate_ct_towns(towns_data)
+        inserted = await db.populate_ct_towns(towns_data)
 
         return APIResponse(
             success=True,
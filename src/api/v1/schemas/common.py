@@ -9,12 +9,17 @@ from datetime import datetime
 T = TypeVar('T')
 
 class PaginatedResponse(BaseModel, Generic[T]):
-    """Generic paginated response"""
+    """Generic paginated response
+
+    total is None when the count was not requested; pass next_cursor back
+    as cursor to fetch the following page.
+    """
     items: List[T]
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
     has_more: bool
+    next_cursor: Optional[str] = None
 
 class APIResponse(BaseModel):
     """Standard API response"""
@@ -15,6 +15,7 @@ class SkipTraceBase(BaseModel):
     phone_type: Optional[str] = Field(None, description="Type of phone (mobile, landline, etc.)")
     source: str = Field("production", description="Source: sandbox or production")
     api_response: Optional[Dict[str, Any]] = Field(None, description="Raw API response")
+    response_hash: Optional[str] = Field(None, description="Key of the archived raw API response")
 
 
 class SkipTraceCreate(BaseModel):
@@ -43,9 +44,17 @@ class SkipTraceResult(BaseModel):
 
 
 class SkipTraceCostSummary(BaseModel):
-    """Skip trace cost summary"""
+    """Skip trace cost summary
+
+    details is only filled when requested, one page at a time.
+    """
+    total_cases: int = 0
     total_lookups: int
     sandbox_lookups: int
     production_lookups: int
     total_cost: float
-    average_cost_per_lookup: float
\ No newline at end of file
+    average_cost_per_lookup: float
+    by_town: List[Dict[str, Any]] = []
+    by_day: List[Dict[str, Any]] = []
+    details: List[Dict[str, Any]] = []
+    details_has_more: bool = False
\ No newline at end of file
@@ -0,0 +1,258 @@
+"""
+Async BatchData skip trace connector built on httpx
+Same interface and result extraction as BatchAPIConnector, with bounded concurrency
+"""
+
+import asyncio
+import os
+import sys
+import time
+from dataclasses import replace
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from batch_api_connector import (
+    BatchAPIConnector,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    RETRY_STATUS_CODES,
+    LOOKUP_CIRCUIT_OPEN,
+    LOOKUP_FAILED,
+    LOOKUP_THROTTLED,
+    LookupResult
+)
+from rate_governor import parse_retry_after
+
+# Maximum number of skip trace requests in flight at once
+DEFAULT_MAX_CONCURRENCY = 5
+
+
+class AsyncBatchAPIConnector(BatchAPIConnector):
+    def __init__(self, env='sandbox', batch_size=DEFAULT_BATCH_SIZE,
+                 pool_size=DEFAULT_POOL_SIZE, max_retries=DEFAULT_MAX_RETRIES,
+                 connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT,
+                 cache=None, governor=None, base_url=None, api_token=None, single_flight=None,
+                 credentials=None, hedger=None, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        """
+        Initialize the async connector.
+        Args:
+            env: 'sandbox', 'prod' or 'local' (stand-in server) environment
+            batch_size: Maximum addresses sent per request
+            pool_size: Number of keep-alive connections kept open
+            max_retries: Retries for connection failures and gateway errors
+            connect_timeout: Seconds to wait for the TCP/TLS connection
+            read_timeout: Seconds to wait for the response body
+            cache: Optional SkipTraceCache consulted before calling the API
+            governor: Optional RateGovernor pacing requests (defaults to one from the environment)
+            base_url: Optional endpoint overriding the environment's URL
+            api_token: Optional token overriding batchapi.csv
+            single_flight: Optional SingleFlight coalescing identical in-flight lookups
+            credentials: Optional CredentialStore (defaults to the process-wide one)
+            hedger: Optional RequestHedger used by lookups made with hedge=True
+            max_concurrency: Maximum requests in flight at once
+        """
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._requests_sent = 0
+        self._in_flight = 0
+        # Losing hedged requests still running; referenced so they are not collected
+        self._stragglers = set()
+        super().__init__(env, batch_size=batch_size, pool_size=pool_size, max_retries=max_retries,
+                         connect_timeout=connect_timeout, read_timeout=read_timeout, cache=cache,
+                         governor=governor, base_url=base_url, api_token=api_token,
+                         single_flight=single_flight, credentials=credentials, hedger=hedger)
+
+    def _create_session(self):
+        """Create a pooled httpx client.
+
+        The transport retries connection failures only; gateway errors are
+        retried in _post_skip_trace_chunk, matching the sync retry policy.
+        """
+        connect_timeout, read_timeout = self.timeout
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+            transport=httpx.AsyncHTTPTransport(retries=self.max_retries)
+        )
+
+    async def send_skip_trace_request(self, address, bypass_cache=False, hedge=False):
+        """
+        Sends a skip trace request to the BatchData API.
+        Args:
+            address: Dictionary with street, city, state, zip
+            bypass_cache: If True, ignore cached results and call the API
+            hedge: If True, send a duplicate request when the first is slow
+        Returns:
+            List of phone numbers or empty list if request fails
+        """
+        results = await self.lookup_batch([address], bypass_cache=bypass_cache, hedge=hedge)
+        return results[0].phone_numbers if results else []
+
+    async def send_skip_trace_batch(self, addresses, batch_size=None, bypass_cache=False):
+        """
+        Sends skip trace requests for many addresses. Chunks are sent
+        concurrently, at most max_concurrency at a time.
+        Args:
+            addresses: List of address dictionaries or address strings
+            batch_size: Optional override of the connector's batch size
+            bypass_cache: If True, ignore cached results (fresh results are still cached)
+        Returns:
+            List of phone number lists, one per input address in input order
+        """
+        results = await self.lookup_batch(addresses, batch_size, bypass_cache)
+        return [result.phone_numbers for result in results]
+
+    async def lookup_batch(self, addresses, batch_size=None, bypass_cache=False, hedge=False):
+        """
+        Like send_skip_trace_batch, but returns a LookupResult per address.
+        Args:
+            addresses: List of address dictionaries or address strings
+            batch_size: Optional override of the connector's batch size
+            bypass_cache: If True, ignore cached results (fresh results are still cached)
+            hedge: If True, hedge slow requests (see BatchAPIConnector.lookup_batch)
+        Returns:
+            List of LookupResult, one per input address in input order
+        """
+        if not addresses:
+            return []
+
+        property_addresses = [self._to_property_address(address) for address in addresses]
+        results, missing = self._lookup_cache(property_addresses, bypass_cache)
+        unique, duplicates = self._dedupe(property_addresses, missing)
+
+        if unique:
+            if not self.api_token:
+                print(f"Error: No API token found for {self.env} environment")
+                for i in unique:
+                    results[i] = LookupResult(LOOKUP_FAILED, error=f"No API token for {self.env}")
+            else:
+                leaders, waiting = self._claim_in_flight(property_addresses, unique)
+                chunks = self._chunk_indices(leaders, batch_size)
+                try:
+                    responses = await asyncio.gather(*(
+                        self._post_skip_trace_chunk([property_addresses[i] for i in indices], hedge)
+                        for indices in chunks
+                    ))
+                    for indices, chunk_results in zip(chunks, responses):
+                        self._fill_results(results, indices, [property_addresses[i] for i in indices], chunk_results)
+                        self._resolve_in_flight(property_addresses, indices, results)
+                except BaseException as e:
+                    self._fail_in_flight(property_addresses, leaders, e)
+                    raise
+                for i, future in waiting.items():
+                    results[i] = replace(await self.single_flight.wait_async(future), coalesced=True)
+
+        return self._finalize_results(results, duplicates)
+
+    async def _post_skip_trace_chunk(self, chunk, hedge=False):
+        """POST one 'requests' array and map the response back to each address.
+
+        Pacing and 429 handling follow the sync connector; the wait happens
+        outside the semaphore so throttled chunks do not hold a slot.
+        """
+        headers, payload = self._build_chunk_request(chunk)
+
+        retry_after = None
+        for _ in range(self.governor.max_throttle_retries + 1):
+            if not self.governor.allow_request():
+                print(f"[{self.env.upper()} API] Circuit open - not sending request")
+                return self._chunk_failure(chunk, LOOKUP_CIRCUIT_OPEN, "BatchData circuit open after repeated failures")
+
+            delay = self.governor.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            try:
+                response = await (self._send_hedged(payload, headers) if hedge else self._send(payload, headers))
+            except httpx.HTTPError as e:
+                self._failed_requests += 1
+                self.governor.record_failure()
+                print(f"[{self.env.upper()} API] Request failed: {e}")
+                return self._chunk_failure(chunk, LOOKUP_FAILED, str(e))
+
+            if response.status_code == 429:
+                retry_after = self.governor.record_throttle(parse_retry_after(response.headers.get('Retry-After')))
+                print(f"[{self.env.upper()} API] Throttled (429), waiting {retry_after:.1f}s")
+                continue
+
+            return self._handle_chunk_response(response, chunk)
+
+        return self._chunk_failure(chunk, LOOKUP_THROTTLED, "BatchData rate limit exceeded", retry_after)
+
+    async def _send(self, payload, headers, on_start=None):
+        """POST one payload, resending gateway errors, while holding a concurrency slot."""
+        async with self._semaphore:
+            if on_start is not None:
+                on_start()
+            self._in_flight += 1
+            try:
+                for attempt in range(self.max_retries + 1):
+                    response = await self.session.post(self.base_url, json=payload, headers=headers)
+                    self._requests_sent += 1
+                    if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                        return response
+                    self._retry_count += 1
+                    await asyncio.sleep(0.5 * (2 ** attempt))
+            finally:
+                self._in_flight -= 1
+
+    async def _send_hedged(self, payload, headers):
+        """Async counterpart of BatchAPIConnector._send_hedged.
+
+        The hedge clock starts once the primary holds a concurrency slot, so
+        time spent queued behind other chunks does not trigger hedges.
+        """
+        sent = asyncio.Event()
+        primary = asyncio.ensure_future(self._send(payload, headers, sent.set))
+        await sent.wait()
+        start = time.perf_counter()
+        primary.add_done_callback(lambda _: self.hedger.record_primary(time.perf_counter() - start))
+        tasks = [primary]
+
+        done, _ = await asyncio.wait(tasks, timeout=self.hedger.hedge_delay())
+        # A duplicate that would only queue for a slot cannot beat the primary
+        if not done and not self._semaphore.locked() and self.hedger.try_hedge() and self.governor.try_reserve():
+            print(f"[{self.env.upper()} API] No response after {time.perf_counter() - start:.2f}s - hedging request")
+            tasks.append(asyncio.ensure_future(self._send(payload, headers)))
+
+        winner = None
+        pending = set(tasks)
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            winner = next((task for task in tasks if task in done and task.exception() is None), None)
+        winner = winner or primary
+        self.hedger.record(time.perf_counter() - start, hedge_won=winner is not primary)
+
+        # Let the loser finish so its latency is measured; its error, if any, is not needed
+        for task in pending:
+            self._stragglers.add(task)
+            task.add_done_callback(self._discard_straggler)
+        return winner.result()
+
+    def _discard_straggler(self, task):
+        self._stragglers.discard(task)
+        if not task.cancelled():
+            task.exception()
+
+    def get_connection_stats(self):
+        """Return request, retry and concurrency statistics."""
+        return {
+            'requests': self._requests_sent,
+            'retries': self._retry_count,
+            'failed_requests': self._failed_requests,
+            'in_flight': self._in_flight,
+            'max_concurrency': self.max_concurrency,
+            'governor': self.governor.stats(),
+            'single_flight': self.single_flight.stats(),
+            'hedging': self.hedger.stats()
+        }
+
+    async def aclose(self):
+        """Close pooled connections."""
+        for task in list(self._stragglers):
+            task.cancel()
+        await self.session.aclose()
+
@@ -0,0 +1,528 @@
+"""
+Async database connector for Supabase
+Same method names and return values as DatabaseConnector, on the async PostgREST client,
+so FastAPI handlers overlap database I/O instead of blocking the event loop
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import weakref
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dotenv import load_dotenv
+from supabase import AsyncClient, acreate_client
+
+from db_connector import (
+    BULK_CHUNK_SIZE,
+    CASE_KEY,
+    COST_DETAILS_RPC,
+    COST_INCREMENT_RPC,
+    COST_SUMMARY_RPC,
+    DatabaseConnector,
+    HIT_RATES_RPC,
+    REVIEW_QUEUE_KEY,
+    REVIEW_QUEUE_TABLE,
+    SELECT_PAGE_SIZE,
+    SKIPTRACE_KEY,
+    SPEND_TOTAL_RPC,
+    TOWN_KEY,
+    TOWN_STATS_TABLE
+)
+from response_archive import RESPONSES_TABLE, ArchivedResponse, build_archive_rows
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDatabaseConnector:
+    """Async counterpart of DatabaseConnector for the API service
+
+    Build one with AsyncDatabaseConnector.create() (or use
+    get_async_database()); the client's httpx.AsyncClient is bound to the
+    event loop it was created on. Every method awaits its PostgREST request,
+    so other requests keep running while one waits on the database. Requests
+    are built by DatabaseConnector's shared request builders, so both
+    connectors send the same queries.
+    """
+
+    def __init__(self, client: AsyncClient):
+        self.client = client
+
+    @classmethod
+    async def create(cls) -> 'AsyncDatabaseConnector':
+        """Create an async Supabase client from SUPABASE_URL and SUPABASE_ANON_KEY"""
+        load_dotenv()
+
+        url = os.environ.get("SUPABASE_URL")
+        key = os.environ.get("SUPABASE_ANON_KEY")
+
+        if not url or not key:
+            raise ValueError("Missing SUPABASE_URL or SUPABASE_ANON_KEY in environment variables")
+
+        db = cls(await acreate_client(url, key))
+        logger.info("Async database connection initialized")
+        return db
+
+    async def aclose(self) -> None:
+        """Close the client's pooled HTTP connections"""
+        try:
+            await self.client.postgrest.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing async database connections: {e}")
+
+    async def close(self) -> None:
+        """See DatabaseConnector.close; nothing is buffered here, so this only closes the connections"""
+        await self.aclose()
+
+    async def test_connection(self) -> bool:
+        """Test database connection"""
+        try:
+            await self.client.table('cases').select("*").limit(1).execute()
+            logger.info("Database connection successful")
+            return True
+        except Exception as e:
+            logger.error(f"Database connection failed: {e}")
+            return False
+
+    # Conflict-aware writes keyed on natural keys
+    async def upsert_rows(self, table_name: str, rows: List[Dict[str, Any]], on_conflict: str,
+                          ignore_duplicates: bool = False) -> Optional[List[Dict]]:
+        """See DatabaseConnector.upsert_rows"""
+        if not rows:
+            return []
+        try:
+            response = await DatabaseConnector._upsert_request(
+                self.client, table_name, rows, on_conflict, ignore_duplicates
+            ).execute()
+            return response.data if response.data else []
+        except Exception as e:
+            logger.error(f"Error upserting into {table_name}: {e}")
+            return None
+
+    async def insert_ignore(self, table_name: str, rows: List[Dict[str, Any]],
+                            on_conflict: str) -> Optional[List[Dict]]:
+        """See DatabaseConnector.insert_ignore"""
+        return await self.upsert_rows(table_name, rows, on_conflict, ignore_duplicates=True)
+
+    # Case operations
+    async def get_case_by_docket(self, docket_number: str) -> Optional[Dict]:
+        """Get case by docket number"""
+        try:
+            response = await self.client.table('cases').select("*").eq('docket_number', docket_number).execute()
+            return response.data[0] if response.data else None
+        except Exception as e:
+            logger.error(f"Error fetching case: {e}")
+            return None
+
+    async def get_cases_by_town(self, town: str) -> List[Dict]:
+        """Get all cases for a specific town"""
+        try:
+            response = await self.client.table('cases').select("*").eq('town', town).execute()
+            return response.data if response.data else []
+        except Exception as e:
+            logger.error(f"Error fetching cases by town: {e}")
+            return []
+
+    # Defendant operations
+    async def insert_defendant(self, defendant_data: Dict[str, Any]) -> Optional[Dict]:
+        """Insert a new defendant"""
+        try:
+            response = await self.client.table('defendants').insert(defendant_data).execute()
+            logger.info(f"Defendant inserted: {defendant_data.get('name')} for docket {defendant_data.get('docket_number')}")
+            return response.data[0] if response.data else None
+        except Exception as e:
+            logger.error(f"Error inserting defendant: {e}")
+            return None
+
+    async def get_defendants_by_docket(self, docket_number: str) -> List[Dict]:
+        """Get all defendants for a case by docket number"""
+        try:
+            response = await self.client.table('defendants').select("*").eq('docket_number', docket_number).execute()
+            return response.data if response.data else []
+        except Exception as e:
+            logger.error(f"Error fetching defendants: {e}")
+            return []
+
+    async def get_defendant_by_docket_and_name(self, docket_number: str, name: str) -> Optional[Dict]:
+        """Get a specific defendant by docket number and name"""
+        try:
+            response = await self.client.table('defendants').select("*").eq(
+                'docket_number', docket_number
+            ).eq('name', name).execute()
+            return response.data[0] if response.data else None
+        except Exception as e:
+            logger.error(f"Error fetching defendant: {e}")
+            return None
+
+    # CT Towns operations
+    async def get_all_ct_towns(self) -> List[Dict]:
+        """Get all Connecticut towns and counties"""
+        try:
+            response = await self.client.table('ct_towns').select("*").execute()
+            return response.data if response.data else []
+        except Exception as e:
+            logger.error(f"Error fetching CT towns: {e}")
+            return []
+
+    async def get_towns_by_county(self, county: str) -> List[Dict]:
+        """Get all towns in a specific county"""
+        try:
+            response = await self.client.table('ct_towns').select("*").eq('county', county).execute()
+            return response.data if response.data else []
+        except Exception as e:
+            logger.error(f"Error fetching towns by county: {e}")
+            return []
+
+    async def clear_ct_towns(self) -> bool:
+        """Clear all entries from ct_towns table (use with caution)"""
+        try:
+            await self.client.table('ct_towns').delete().neq('town', '').execute()
+            logger.info("CT towns table cleared")
+            return True
+        except Exception as e:
+            logger.error(f"Error clearing CT towns: {e}")
+            return False
+
+    async def populate_ct_towns(self, towns_data: List[tuple]) -> int:
+        """Bulk insert Connecticut towns and counties; towns already present are kept"""
+        inserted = await self.insert_ignore(
+            'ct_towns', [{'town': town, 'county': county} for town, county in towns_data], TOWN_KEY
+        )
+        inserted_count = len(inserted or [])
+        logger.info(f"Inserted {inserted_count} towns into database")
+        return inserted_count
+
+    # Skip trace operations
+    async def insert_skiptraces(self, skiptrace_data: List[Dict[str, Any]],
+                                is_sandbox: bool = False) -> Optional[List[Dict]]:
+        """See DatabaseConnector.insert_skiptraces"""
+        table_name = 'skiptrace_sandbox' if is_sandbox else 'skiptrace'
+        inserted = await self.insert_ignore(table_name, skiptrace_data, SKIPTRACE_KEY)
+        if inserted is None:
+            return None
+        logger.info(f"Inserted {len(inserted)} of {len(skiptrace_data)} skip trace records to {table_name}")
+        return inserted
+
+    async def get_skiptraces_by_docket(self, docket_number: str, is_sandbox: bool = False) -> List[Dict]:
+        """Get all skip trace records for a case by docket number from appropriate table"""
+        table_name = 'skiptrace_sandbox' if is_sandbox else 'skiptrace'
+        try:
+            response = await self.client.table(table_name).select("*").eq('docket_number', docket_number).execute()
+            return response.data if response.data else []
+        except Exception as e:
+            logger.error(f"Error fetching skip trace records from {table_name}: {e}")
+            return []
+
+    # Multi-docket reads
+    async def _select_by_dockets(self, table_name: str, docket_numbers: List[str],
+                                 columns: str = "*") -> Optional[Dict[str, List[Dict]]]:
+        """See DatabaseConnector._select_by_dockets; chunks are fetched concurrently"""
+        async def fetch_chunk(chunk):
+            rows, offset = [], 0
+            while True:
+                response = await DatabaseConnector._docket_page_request(
+                    self.client, table_name, columns, chunk, offset
+                ).execute()
+                page = response.data or []
+                rows.extend(page)
+                if len(page) < SELECT_PAGE_SIZE:
+                    return rows
+                offset += SELECT_PAGE_SIZE
+
+        try:
+            pages = await asyncio.gather(*(
+                fetch_chunk(chunk) for chunk in DatabaseConnector._docket_chunks(docket_numbers)
+            ))
+        except Exception as e:
+            logger.error(f"Error fetching {table_name} for {len(docket_numbers)} dockets: {e}")
+            return None
+        return DatabaseConnector._group_by_docket(docket_numbers, [row for rows in pages for row in rows])
+
+    async def get_cases_by_dockets(self, docket_numbers: List[str]) -> Optional[Dict[str, Dict]]:
+        """See DatabaseConnector.get_cases_by_dockets"""
+        grouped = await self._select_by_dockets('cases', docket_numbers)
+        if grouped is None:
+            return None
+        return {docket: rows[0] for docket, rows in grouped.items() if rows}
+
+    async def get_defendants_by_dockets(self, docket_numbers: List[str]) -> Optional[Dict[str, List[Dict]]]:
+        """Get the defendants of many cases, grouped by docket number"""
+        return await self._select_by_dockets('defendants', docket_numbers)
+
+    async def get_skiptraces_by_dockets(self, docket_numbers: List[str],
+                                        is_sandbox: bool = False) -> Optional[Dict[str, List[Dict]]]:
+        """Get the skip trace records of many cases, grouped by docket number"""
+        table_name = 'skiptrace_sandbox' if is_sandbox else 'skiptrace'
+        return await self._select_by_dockets(table_name, docket_numbers)
+
+    async def have_been_skip_traced(self, docket_numbers: List[str],
+                                    is_sandbox: bool = False) -> Optional[Dict[str, bool]]:
+        """See DatabaseConnector.have_been_skip_traced"""
+        table_name = 'skiptrace_sandbox' if is_sandbox else 'skiptrace'
+        grouped = await self._select_by_dockets(table_name, docket_numbers, columns="id, docket_number")
+        if grouped is None:
+            return None
+        return {docket: bool(rows) for docket, rows in grouped.items()}
+
+    # Full case reads
+    async def get_full_case_data(self, docket_number: str, include_sandbox: bool = False,
+                                 skiptrace_columns: str = "*") -> Optional[Dict]:
+        """See DatabaseConnector.get_full_case_data"""
+        try:
+            response = await DatabaseConnector._full_case_request(self.client, include_sandbox, skiptrace_columns).eq(
+                'docket_number', docket_number
+            ).execute()
+            if not response.data:
+                return None
+            return DatabaseConnector._shape_full_case(response.data[0], include_sandbox)
+        except Exception as e:
+            logger.error(f"Error fetching full case data: {e}")
+            return None
+
+    async def get_full_cases_data(self, docket_numbers: List[str], include_sandbox: bool = False,
+                                  skiptrace_columns: str = "*") -> Optional[Dict[str, Dict]]:
+        """See DatabaseConnector.get_full_cases_data; chunks are fetched concurrently"""
+        cases: Dict[str, Dict] = {}
+        try:
+            responses = await asyncio.gather(*(
+                DatabaseConnector._full_case_request(self.client, include_sandbox, skiptrace_columns).in_(
+                    'docket_number', chunk
+                ).execute()
+                for chunk in DatabaseConnector._docket_chunks(docket_numbers)
+            ))
+            for response in responses:
+                for case in response.data or []:
+                    cases[case['docket_number']] = DatabaseConnector._shape_full_case(case, include_sandbox)
+        except Exception as e:
+            logger.error(f"Error fetching full case data for {len(docket_numbers)} dockets: {e}")
+            return None
+        return cases
+
+    # Bulk ingest
+    async def _insert_chunked(self, table_name: str, rows: List[Dict[str, Any]], chunk_size: int,
+                              on_conflict: Optional[str] = None) -> List[Optional[str]]:
+        """See DatabaseConnector._insert_chunked"""
+        outcomes: List[Optional[str]] = [None] * len(rows)
+
+        async def write(start, batch):
+            response = await DatabaseConnector._insert_chunk_request(
+                self.client, table_name, batch, on_conflict
+            ).execute()
+            DatabaseConnector._mark_existing(outcomes, start, batch, response, on_conflict)
+
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            try:
+                await write(start, chunk)
+                continue
+            except Exception as e:
+                logger.warning(f"Bulk insert of {len(chunk)} rows into {table_name} failed ({e}); retrying row by row")
+            for offset, row in enumerate(chunk):
+                try:
+                    await write(start + offset, [row])
+                except Exception as e:
+                    outcomes[start + offset] = str(e)
+        return outcomes
+
+    async def bulk_ingest_cases(self, cases: List[Dict[str, Any]], defendants: List[Dict[str, Any]],
+                                chunk_size: int = BULK_CHUNK_SIZE) -> Dict[str, Any]:
+        """See DatabaseConnector.bulk_ingest_cases"""
+        case_results, new_rows, new_indices = DatabaseConnector._plan_case_rows(cases)
+        inserted = DatabaseConnector._record_case_outcomes(
+            case_results, new_indices, await self._insert_chunked('cases', new_rows, chunk_size, on_conflict=CASE_KEY)
+        )
+        defendant_results, defendant_rows, defendant_indices = DatabaseConnector._plan_defendant_rows(
+            defendants, inserted
+        )
+        DatabaseConnector._record_defendant_outcomes(
+            defendant_results, defendant_indices, await self._insert_chunked('defendants', defendant_rows, chunk_size)
+        )
+        return DatabaseConnector._bulk_summary(case_results, defendant_results)
+
+    async def delete_case(self, docket_number: str) -> bool:
+        """Delete a case (cascades to defendants and skip trace records)"""
+        try:
+            await self.client.table('cases').delete().eq('docket_number', docket_number).execute()
+            logger.info(f"Case deleted: {docket_number}")
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting case: {e}")
+            return False
+
+    # Raw response archive
+    async def archive_raw_responses(self, payloads: List[Any]) -> List[Optional[str]]:
+        """See DatabaseConnector.archive_raw_responses"""
+        hashes, rows = build_archive_rows(payloads)
+        if not rows:
+            return hashes
+        try:
+            await DatabaseConnector._upsert_request(
+                self.client, RESPONSES_TABLE, rows, 'response_hash', ignore_duplicates=True
+            ).execute()
+            raw = sum(row['raw_size'] for row in rows)
+            compressed = sum(row['compressed_size'] for row in rows)
+            logger.info(f"Archived {len(rows)} raw responses ({raw} bytes -> {compressed} bytes)")
+            return hashes
+        except Exception as e:
+            logger.error(f"Error archiving raw responses: {e}")
+            return [None] * len(hashes)
+
+    async def get_skiptrace_raw_response(self, skip_trace_id: int, is_sandbox: bool = False) -> Optional[Any]:
+        """Return the raw BatchData payload behind one skip trace record"""
+        table_name = 'skiptrace_sandbox' if is_sandbox else 'skiptrace'
+        try:
+            response = await self.client.table(table_name).select(
+                "response_hash,api_response"
+            ).eq('id', skip_trace_id).execute()
+            if not response.data:
+                return None
+            record = response.data[0]
+            if record.get('response_hash'):
+                archived = await self.client.table(RESPONSES_TABLE).select(
+                    "response_hash,payload,raw_size"
+                ).eq('response_hash', record['response_hash']).execute()
+                if archived.data:
+                    row = archived.data[0]
+                    return ArchivedResponse(row['response_hash'], row['payload'], row.get('raw_size')).payload
+            # Rows written before the archive existed may carry the payload inline
+            return record.get('api_response')
+        except Exception as e:
+            logger.error(f"Error fetching raw response for skip trace {skip_trace_id}: {e}")
+            return None
+
+    # Town statistics
+    async def get_town_skip_trace_stats(self, town: str) -> Dict:
+        """See DatabaseConnector.get_town_skip_trace_stats"""
+        try:
+            response = await self.client.table(TOWN_STATS_TABLE).select("*").eq('town', town).execute()
+            return DatabaseConnector._town_stats_row(response.data[0] if response.data else {'town': town})
+        except Exception as e:
+            logger.error(f"Error getting town skip trace stats: {str(e)}")
+            stats = DatabaseConnector._town_stats_row({'town': town})
+            stats['error'] = str(e)
+            return stats
+
+    async def get_all_town_skip_trace_stats(self) -> List[Dict]:
+        """Get skip trace statistics for every scraped town in one request, by town name"""
+        try:
+            response = await self.client.table(TOWN_STATS_TABLE).select("*").gt('total_cases', 0).order('town').execute()
+            return [DatabaseConnector._town_stats_row(row) for row in response.data or []]
+        except Exception as e:
+            logger.error(f"Error getting skip trace stats for all towns: {e}")
+            return []
+
+    # Cost tracking
+    async def record_skip_trace_costs(self, lookup_counts: Dict[str, int], cost_per_lookup: float = 0.07,
+                                      is_sandbox: bool = False) -> Optional[List[Dict]]:
+        """See DatabaseConnector.record_skip_trace_costs"""
+        deltas = DatabaseConnector._cost_deltas(lookup_counts, cost_per_lookup, is_sandbox)
+        if not deltas:
+            return []
+        try:
+            response = await self.client.rpc(COST_INCREMENT_RPC, {'deltas': deltas}).execute()
+            total = sum(delta['lookup_count'] for delta in deltas)
+            logger.info(f"Recorded skip trace cost for {len(deltas)} dockets: "
+                        f"{total} lookups, ${total * cost_per_lookup:.2f}")
+            return response.data or []
+        except Exception as e:
+            logger.error(f"Error recording skip trace costs: {e}")
+            return None
+
+    async def get_skip_trace_spend(self, since: datetime, is_sandbox: bool = False) -> float:
+        """See DatabaseConnector.get_skip_trace_spend"""
+        try:
+            response = await self.client.rpc(SPEND_TOTAL_RPC, {
+                'p_since': since.isoformat(),
+                'p_is_sandbox': is_sandbox
+            }).execute()
+            return float(response.data or 0)
+        except Exception as e:
+            logger.error(f"Error reading skip trace spend: {e}")
+            return float('inf')
+
+    async def get_skip_trace_hit_rates(self, is_sandbox: bool = False) -> Dict[str, Dict[str, int]]:
+        """See DatabaseConnector.get_skip_trace_hit_rates"""
+        try:
+            response = await self.client.rpc(HIT_RATES_RPC, {'p_is_sandbox': is_sandbox}).execute()
+            return DatabaseConnector._hit_rates(response.data or [])
+        except Exception as e:
+            logger.error(f"Error reading skip trace hit rates: {e}")
+            return {}
+
+    async def queue_addresses_for_review(self, rows: List[Dict[str, Any]]) -> List[Dict]:
+        """See DatabaseConnector.queue_addresses_for_review"""
+        if not rows:
+            return []
+        try:
+            response = await DatabaseConnector._upsert_request(
+                self.client, REVIEW_QUEUE_TABLE, rows, REVIEW_QUEUE_KEY, ignore_duplicates=True
+            ).execute()
+            logger.info(f"Queued {len(rows)} address(es) for review")
+            return response.data if response.data else []
+        except Exception as e:
+            logger.error(f"Error queueing addresses for review: {e}")
+            return []
+
+    async def get_skip_trace_costs(self, town: str = None, is_sandbox: Optional[bool] = None,
+                                   since: Optional[datetime] = None, until: Optional[datetime] = None,
+                                   details_limit: int = 0, details_offset: int = 0) -> Dict[str, Any]:
+        """See DatabaseConnector.get_skip_trace_costs; the summary and details are fetched concurrently"""
+        params = DatabaseConnector._cost_params(town, is_sandbox)
+        requests = [self.client.rpc(COST_SUMMARY_RPC, {
+            **params,
+            'p_since': since.isoformat() if since else None,
+            'p_until': until.isoformat() if until else None
+        }).execute()]
+        if details_limit > 0:
+            requests.append(self.client.rpc(COST_DETAILS_RPC, {
+                **params, 'p_limit': details_limit + 1, 'p_offset': details_offset
+            }).execute())
+        try:
+            responses = await asyncio.gather(*requests)
+            details = (responses[1].data or []) if len(responses) > 1 else []
+            return DatabaseConnector._cost_summary(responses[0].data or {}, details, details_limit)
+        except Exception as e:
+            logger.error(f"Error getting skip trace costs: {e}")
+            return DatabaseConnector._cost_summary({}, [], details_limit)
+
+    # Paginated listing
+    async def list_page(self, table_name: str, filters: Optional[Dict[str, Any]] = None, skip: int = 0,
+                        limit: int = 100, cursor: Optional[str] = None,
+                        count: Optional[str] = 'exact') -> Dict[str, Any]:
+        """See DatabaseConnector.list_page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        response = await DatabaseConnector._list_page_request(
+            self.client, table_name, filters, skip, limit, cursor, count
+        ).execute()
+        return DatabaseConnector._page_result(response, limit)
+
+
+# One connector per event loop: the async httpx client cannot be shared across loops
+_async_databases: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
+
+async def get_async_database() -> AsyncDatabaseConnector:
+    """Return the AsyncDatabaseConnector for the running event loop, creating it on first use"""
+    loop = asyncio.get_running_loop()
+    entry = _async_databases.get(loop)
+    if entry is None:
+        # Concurrent first callers on the same loop share one creation task
+        entry = _async_databases[loop] = asyncio.ensure_future(AsyncDatabaseConnector.create())
+    try:
+        return await asyncio.shield(entry)
+    except Exception:
+        _async_databases.pop(loop, None)
+        raise
+
+
+async def close_async_database() -> None:
+    """Close the running loop's connector; the next get_async_database() builds a new one"""
+    entry = _async_databases.pop(asyncio.get_running_loop(), None)
+    if entry is not None and entry.done() and not entry.exception():
+        await entry.result().aclose()
@@ -1,106 +1,569 @@
 import requests
-import csv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from typing import List, Optional
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from address_normalizer import normalize_address, normalize_address_fields
+from rate_governor import AUTH_STATUS_CODES, BatchDataAuthError, RateGovernor, parse_retry_after
+from single_flight import get_default_single_flight
+from batchdata_credentials import get_credential_store
+from request_hedger import RequestHedger
+
+# Maximum number of addresses packed into a single skip-trace POST
+DEFAULT_BATCH_SIZE = 50
+
+# HTTP connection pool and timeout defaults (seconds)
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 30
+DEFAULT_MAX_RETRIES = 3
+
+# Gateway errors returned before the request reached BatchData; safe to resend.
+# Other 5xx responses may already have been billed, so they are not retried.
+RETRY_STATUS_CODES = (502, 503)
+
+# Endpoints per environment; BATCHDATA_LOCAL_URL moves the local one only, so a
+# leftover override can never send prod lookups (and their billing) to a stand-in
+SANDBOX_URL = 'https://stoplight.io/mocks/batchdata/batchdata/20349728/property/skip-trace'
+PROD_URL = 'https://api.batchdata.com/api/v1/property/skip-trace'
+# Local stand-in server (see batchdata_stub_server.py)
+LOCAL_URL = 'http://127.0.0.1:8765/api/v1/property/skip-trace'
+
+# Lookup outcomes
+LOOKUP_FOUND = 'found'
+LOOKUP_EMPTY = 'empty'
+LOOKUP_THROTTLED = 'throttled'
+LOOKUP_FAILED = 'failed'
+LOOKUP_CIRCUIT_OPEN = 'circuit_open'
+
+
+@dataclass
+class LookupResult:
+    """Outcome of one address lookup"""
+    status: str
+    phone_numbers: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    retry_after: Optional[float] = None
+    cached: bool = False
+    # This address's part of the BatchData payload (not kept for cached results)
+    raw_response: Optional[dict] = None
+    # Answered by another caller's in-flight request for the same address (billed to that caller)
+    coalesced: bool = False
+
+    @property
+    def ok(self):
+        """True if the API answered (with or without phones)."""
+        return self.status in (LOOKUP_FOUND, LOOKUP_EMPTY)
+
+    @classmethod
+    def from_phones(cls, phone_numbers, cached=False, raw_response=None):
+        return cls(LOOKUP_FOUND if phone_numbers else LOOKUP_EMPTY, list(phone_numbers), cached=cached,
+                   raw_response=raw_response)
+
 
 class BatchAPIConnector:
-    def __init__(self, env='sandbox'):
+    def __init__(self, env='sandbox', batch_size=DEFAULT_BATCH_SIZE,
+                 pool_size=DEFAULT_POOL_SIZE, max_retries=DEFAULT_MAX_RETRIES,
+                 connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT,
+                 cache=None, governor=None, base_url=None, api_token=None, single_flight=None,
+                 credentials=None, hedger=None):
         """
         Initialize the BatchAPIConnector with environment configuration.
         Args:
-            env: 'sandbox' or 'prod' environment
+            env: 'sandbox', 'prod' or 'local' (stand-in server) environment
+            batch_size: Maximum addresses sent per request
+            pool_size: Number of keep-alive connections kept per host
+            max_retries: Retries for connection failures and gateway errors
+            connect_timeout: Seconds to wait for the TCP/TLS connection
+            read_timeout: Seconds to wait for the response body
+            cache: Optional SkipTraceCache consulted before calling the API
+            governor: Optional RateGovernor pacing requests (defaults to one from the environment)
+            base_url: Optional endpoint overriding the environment's URL
+            api_token: Optional token overriding batchapi.csv
+            single_flight: Optional SingleFlight coalescing identical in-flight lookups
+                           (defaults to the process-wide one)
+            credentials: Optional CredentialStore (defaults to the process-wide one)
+            hedger: Optional RequestHedger used by lookups made with hedge=True
         """
         self.env = env
-        self.api_token = self._get_api_token(env)
-        self.base_url = self._get_base_url(env)
-        
+        self.credentials = credentials or get_credential_store()
+        self.cache = cache
+        self.governor = governor or RateGovernor.from_env()
+        self.single_flight = single_flight or get_default_single_flight()
+        self.hedger = hedger or RequestHedger.from_env()
+        self.batch_size = batch_size
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.timeout = (connect_timeout, read_timeout)
+        self.api_token = api_token or self._get_api_token(env)
+        self.base_url = base_url or self._get_base_url(env)
+        self.session = self._create_session()
+        self._retry_count = 0
+        self._failed_requests = 0
+        self._hedge_pool = None
+        self._hedge_pool_lock = threading.Lock()
+
+    def _create_session(self):
+        """Create a pooled keep-alive session with an idempotency-safe retry policy.
+
+        Connection errors are retried because the request never reached the
+        server. Read errors are not retried since BatchData may already have
+        processed (and billed) the lookup. 429 responses are left to the
+        rate governor so every caller backs off together.
+        """
+        retry = Retry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=0,
+            status=self.max_retries,
+            other=0,
+            backoff_factor=0.5,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(['POST']),
+            raise_on_status=False,
+            respect_retry_after_header=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+            max_retries=retry
+        )
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def get_connection_stats(self):
+        """Return connection pool and retry statistics.
+
+        pool_hit_rate is the share of requests served on an already-open
+        keep-alive connection, i.e. without a new TCP+TLS handshake.
+        """
+        requests_sent = 0
+        connections_opened = 0
+        for adapter in set(self.session.adapters.values()):
+            for pool in adapter.poolmanager.pools._container.values():
+                requests_sent += pool.num_requests
+                connections_opened += pool.num_connections
+
+        reused = max(requests_sent - connections_opened, 0)
+        return {
+            'requests': requests_sent,
+            'connections_opened': connections_opened,
+            'pool_hit_rate': reused / requests_sent if requests_sent else 0.0,
+            'retries': self._retry_count,
+            'failed_requests': self._failed_requests,
+            'governor': self.governor.stats(),
+            'single_flight': self.single_flight.stats(),
+            'hedging': self.hedger.stats()
+        }
+
+    def close(self):
+        """Close pooled connections."""
+        if self._hedge_pool is not None:
+            self._hedge_pool.shutdown(wait=False)
+            self._hedge_pool = None
+        self.session.close()
+
     def _get_api_token(self, env):
-        """Load API token from CSV file based on environment."""
-        # Try multiple possible locations for batchapi.csv
-        possible_paths = [
-            '../batchapi.csv',  # As specified in project_plan
-            './batchapi.csv',   # Current directory
-            'batchapi.csv',     # Relative to working directory
-            os.path.join(os.path.dirname(os.path.dirname(__file__)), 'batchapi.csv')
-        ]
-        
-        for csv_path in possible_paths:
-            try:
-                with open(csv_path, 'r') as f:
-                    reader = csv.reader(f)
-                    for row in reader:
-                        if row[0] == env:
-                            return row[1]
-            except FileNotFoundError:
-                continue
-        
-        print(f"Warning: batchapi.csv not found in any expected location")
-        return None
+        """Look up the API token for an environment (batchapi.csv is read once per process)."""
+        token = self.credentials.get_token(env)
+        if token is None and env == 'local':
+            # The stand-in server only checks the token when started with --token
+            return 'local'
+        return token
 
     def _get_base_url(self, env):
         """Get the appropriate API URL based on environment."""
         if env == 'sandbox':
-            return 'https://stoplight.io/mocks/batchdata/batchdata/20349728/property/skip-trace'
+            return SANDBOX_URL
         elif env == 'prod':
-            return 'https://api.batchdata.com/api/v1/property/skip-trace'
+            return PROD_URL
+        elif env == 'local':
+            return os.environ.get('BATCHDATA_LOCAL_URL', LOCAL_URL)
         return None
 
-    def send_skip_trace_request(self, address):
+    def send_skip_trace_request(self, address, bypass_cache=False, hedge=False):
         """
         Sends a skip trace request to the BatchData API.
         Args:
             address: Dictionary with street, city, state, zip
+            bypass_cache: If True, ignore cached results and call the API
+            hedge: If True, send a duplicate request when the first is slow
         Returns:
             List of phone numbers or empty list if request fails
         """
-        if not self.api_token:
-            print(f"Error: No API token found for {self.env} environment")
+        results = self.lookup_batch([address], bypass_cache=bypass_cache, hedge=hedge)
+        return results[0].phone_numbers if results else []
+
+    def send_skip_trace_batch(self, addresses, batch_size=None, bypass_cache=False):
+        """
+        Sends skip trace requests for many addresses, packing up to
+        batch_size addresses into each POST to the BatchData API.
+        Addresses found in the cache are answered without an API call, and
+        addresses already being looked up by another caller share its result.
+        Args:
+            addresses: List of address dictionaries or address strings
+            batch_size: Optional override of the connector's batch size
+            bypass_cache: If True, ignore cached results (fresh results are still cached)
+        Returns:
+            List of phone number lists, one per input address in input order
+        """
+        return [result.phone_numbers for result in self.lookup_batch(addresses, batch_size, bypass_cache)]
+
+    def lookup_batch(self, addresses, batch_size=None, bypass_cache=False, hedge=False):
+        """
+        Like send_skip_trace_batch, but returns a LookupResult per address so
+        callers can tell found/empty answers from throttled or failed lookups.
+        Args:
+            addresses: List of address dictionaries or address strings
+            batch_size: Optional override of the connector's batch size
+            bypass_cache: If True, ignore cached results (fresh results are still cached)
+            hedge: If True, a request still unanswered after the hedger's
+                   percentile delay is sent again and the first response wins.
+                   Meant for interactive lookups; each hedge is billed.
+        Returns:
+            List of LookupResult, one per input address in input order
+        """
+        if not addresses:
             return []
-            
+
+        property_addresses = [self._to_property_address(address) for address in addresses]
+        results, missing = self._lookup_cache(property_addresses, bypass_cache)
+        unique, duplicates = self._dedupe(property_addresses, missing)
+
+        if unique:
+            if not self.api_token:
+                print(f"Error: No API token found for {self.env} environment")
+                for i in unique:
+                    results[i] = LookupResult(LOOKUP_FAILED, error=f"No API token for {self.env}")
+            else:
+                leaders, waiting = self._claim_in_flight(property_addresses, unique)
+                try:
+                    for indices in self._chunk_indices(leaders, batch_size):
+                        chunk = [property_addresses[i] for i in indices]
+                        self._fill_results(results, indices, chunk, self._post_skip_trace_chunk(chunk, hedge))
+                        self._resolve_in_flight(property_addresses, indices, results)
+                except BaseException as e:
+                    self._fail_in_flight(property_addresses, leaders, e)
+                    raise
+                for i, future in waiting.items():
+                    results[i] = replace(future.result(), coalesced=True)
+
+        return self._finalize_results(results, duplicates)
+
+    def _flight_key(self, property_address):
+        """Single-flight key: same endpoint and same normalized address."""
+        return (self.base_url, self._cache_key(property_address))
+
+    def _claim_in_flight(self, property_addresses, indices):
+        """Split indices into ones this call looks up and ones already in flight elsewhere.
+
+        Returns:
+            (leaders, waiting) - indices to send, and a map from each
+            coalesced index to the future carrying its LookupResult
+        """
+        claims = self.single_flight.claim(self._flight_key(property_addresses[i]) for i in indices)
+        leaders = []
+        waiting = {}
+        for i, (future, is_leader) in zip(indices, claims):
+            if is_leader:
+                leaders.append(i)
+            else:
+                waiting[i] = future
+        if waiting:
+            print(f"[{self.env.upper()} API] {len(waiting)} address(es) joined lookups already in flight")
+        return leaders, waiting
+
+    def _resolve_in_flight(self, property_addresses, indices, results):
+        """Publish a chunk's results to callers waiting on the same addresses."""
+        for i in indices:
+            self.single_flight.resolve(self._flight_key(property_addresses[i]), results[i])
+
+    def _fail_in_flight(self, property_addresses, indices, error):
+        """Release waiters when a lookup raised; already resolved keys are unaffected."""
+        for i in indices:
+            self.single_flight.fail(self._flight_key(property_addresses[i]), error)
+
+    def _lookup_cache(self, property_addresses, bypass_cache=False):
+        """Answer what we can from the cache.
+
+        Returns:
+            (results, missing) - results holds cached LookupResults or None,
+            missing lists the indices that still need an API call
+        """
+        if self.cache is None or bypass_cache:
+            return [None] * len(property_addresses), list(range(len(property_addresses)))
+
+        cached = self.cache.get_many(self.env, property_addresses)
+        results = [LookupResult.from_phones(phones, cached=True) if phones is not None else None
+                   for phones in cached]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if len(missing) < len(results):
+            print(f"[{self.env.upper()} API] {len(results) - len(missing)} address(es) served from cache")
+        return results, missing
+
+    def _dedupe(self, property_addresses, missing):
+        """Send each distinct address once.
+
+        Returns:
+            (unique, duplicates) - indices to look up, and a map from each
+            repeated index to the index whose result it shares
+        """
+        first_seen = {}
+        unique = []
+        duplicates = {}
+        for i in missing:
+            key = self._cache_key(property_addresses[i])
+            if key in first_seen:
+                duplicates[i] = first_seen[key]
+            else:
+                first_seen[key] = i
+                unique.append(i)
+        return unique, duplicates
+
+    def _cache_key(self, property_address):
+        """Canonical key of an already-normalized propertyAddress."""
+        return '|'.join(property_address.get(field) or '' for field in ('street', 'city', 'state', 'zip'))
+
+    def address_key(self, address):
+        """
+        Canonical key of an address dict or string. Addresses with the same key
+        are sent to the API once per call and share one cache entry.
+        """
+        return self._cache_key(self._to_property_address(address))
+
+    def _finalize_results(self, results, duplicates):
+        """Copy shared results to duplicate addresses."""
+        for i, source in duplicates.items():
+            results[i] = results[source]
+        return [replace(result, phone_numbers=list(result.phone_numbers)) for result in results]
+
+    def _chunk_indices(self, indices, batch_size=None):
+        """Split address indices into request-sized chunks."""
+        size = batch_size or self.batch_size
+        return [indices[start:start + size] for start in range(0, len(indices), size)]
+
+    def _fill_results(self, results, indices, chunk, chunk_results):
+        """Record a chunk's results and cache the successful ones."""
+        for i, result in zip(indices, chunk_results):
+            results[i] = result
+        if self.cache is not None:
+            answered = [(address, result.phone_numbers) for address, result in zip(chunk, chunk_results) if result.ok]
+            if answered:
+                self.cache.set_many(self.env, [a for a, _ in answered], [p for _, p in answered])
+
+    def _post_skip_trace_chunk(self, chunk, hedge=False):
+        """POST one 'requests' array and map the response back to each address.
+
+        Requests are paced by the rate governor. A 429 blocks the governor
+        for Retry-After seconds and the chunk is resent, up to the
+        governor's max_throttle_retries.
+        """
+        headers, payload = self._build_chunk_request(chunk)
+
+        retry_after = None
+        for _ in range(self.governor.max_throttle_retries + 1):
+            if not self.governor.allow_request():
+                print(f"[{self.env.upper()} API] Circuit open - not sending request")
+                return self._chunk_failure(chunk, LOOKUP_CIRCUIT_OPEN, "BatchData circuit open after repeated failures")
+
+            delay = self.governor.reserve()
+            if delay > 0:
+                time.sleep(delay)
+
+            try:
+                response = self._send_hedged(payload, headers) if hedge else self._send(payload, headers)
+            except requests.RequestException as e:
+                self._failed_requests += 1
+                self.governor.record_failure()
+                print(f"[{self.env.upper()} API] Request failed: {e}")
+                return self._chunk_failure(chunk, LOOKUP_FAILED, str(e))
+
+            if response.status_code == 429:
+                retry_after = self.governor.record_throttle(parse_retry_after(response.headers.get('Retry-After')))
+                print(f"[{self.env.upper()} API] Throttled (429), waiting {retry_after:.1f}s")
+                continue
+
+            return self._handle_chunk_response(response, chunk)
+
+        return self._chunk_failure(chunk, LOOKUP_THROTTLED, "BatchData rate limit exceeded", retry_after)
+
+    def _send(self, payload, headers, on_start=None):
+        """POST one payload on the pooled session."""
+        if on_start is not None:
+            on_start()
+        response = self.session.post(self.base_url, json=payload, headers=headers, timeout=self.timeout)
+        self._record_retries(response)
+        return response
+
+    def _hedge_executor(self):
+        """Threads that run hedged requests, created on first use."""
+        with self._hedge_pool_lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix='batchdata-hedge')
+            return self._hedge_pool
+
+    def _send_hedged(self, payload, headers):
+        """Send a payload, duplicating it if no response arrives within the hedge delay.
+
+        The first response wins. The losing request is left to finish so its
+        latency still counts towards the unhedged percentiles. Latency is
+        measured from when the primary is actually sent, not from when it
+        was queued for a worker thread.
+        """
+        executor = self._hedge_executor()
+        sent = threading.Event()
+        primary = executor.submit(self._send, payload, headers, sent.set)
+        sent.wait()
+        start = time.perf_counter()
+        primary.add_done_callback(lambda _: self.hedger.record_primary(time.perf_counter() - start))
+        futures = [primary]
+
+        done, _ = wait(futures, timeout=self.hedger.hedge_delay())
+        if not done and self.hedger.try_hedge() and self.governor.try_reserve():
+            print(f"[{self.env.upper()} API] No response after {time.perf_counter() - start:.2f}s - hedging request")
+            futures.append(executor.submit(self._send, payload, headers))
+
+        winner = None
+        pending = set(futures)
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((future for future in futures if future in done and future.exception() is None), None)
+        winner = winner or primary
+        self.hedger.record(time.perf_counter() - start, hedge_won=winner is not primary)
+        return winner.result()
+
+    def _chunk_failure(self, chunk, status, error, retry_after=None):
+        """One failed LookupResult per address in the chunk."""
+        return [LookupResult(status, error=error, retry_after=retry_after) for _ in chunk]
+
+    def _build_chunk_request(self, chunk):
+        """Build the headers and 'requests' payload for one chunk of addresses."""
         headers = {
             'Authorization': f'Bearer {self.api_token}',
             'Content-Type': 'application/json'
         }
-        
-        # Format address properly - API expects 'requests' array
-        if isinstance(address, dict):
-            payload = {
-                'requests': [
-                    {'propertyAddress': address}
-                ]
-            }
+        payload = {
+            'requests': [{'propertyAddress': address} for address in chunk]
+        }
+
+        print(f"\n[{self.env.upper()} API] Sending request for {len(chunk)} address(es):")
+        for addr in chunk:
+            print(f"  {addr.get('street', 'N/A')}, {addr.get('city', 'N/A')}, "
+                  f"{addr.get('state', 'N/A')} {addr.get('zip', 'N/A')}")
+        return headers, payload
+
+    def _handle_chunk_response(self, response, chunk):
+        """Turn an HTTP response for one chunk into per-address LookupResults."""
+        print(f"[{self.env.upper()} API] Response status: {response.status_code}")
+
+        if response.status_code == 200:
+            self.governor.record_success()
+            try:
+                mapped = self._map_batch_response(response.json(), chunk)
+            except ValueError as e:
+                # An HTML error page or a truncated body; the lookups were not answered
+                print(f"[{self.env.upper()} API] Unreadable response: {e}")
+                return self._chunk_failure(chunk, LOOKUP_FAILED, f"Unreadable BatchData response: {e}")
+            found = sum(len(phones) for phones, _ in mapped)
+            print(f"[{self.env.upper()} API] Found {found} phone numbers")
+            return [LookupResult.from_phones(phones, raw_response=entry) for phones, entry in mapped]
+        elif response.status_code in AUTH_STATUS_CODES:
+            # A bad token is the caller's problem, not an outage; do not trip the breaker
+            self.governor.record_auth_error()
+            print(f"[{self.env.upper()} API] Credentials rejected: {response.text[:200]}")
+            raise BatchDataAuthError(response.status_code, f"BatchData rejected the {self.env} API token")
         else:
-            # If address is a string, try to parse it
-            payload = {
-                'requests': [
-                    {'propertyAddress': self._parse_address_string(address)}
-                ]
-            }
-            
-        print(f"\n[{self.env.upper()} API] Sending request for address:")
-        addr = payload['requests'][0]['propertyAddress']
-        print(f"  Street: {addr.get('street', 'N/A')}")
-        print(f"  City: {addr.get('city', 'N/A')}")
-        print(f"  State: {addr.get('state', 'N/A')}")
-        print(f"  ZIP: {addr.get('zip', 'N/A')}")
-        
-        try:
-            response = requests.post(self.base_url, json=payload, headers=headers, timeout=30)
-            print(f"[{self.env.upper()} API] Response status: {response.status_code}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                phone_numbers = self._extract_phone_numbers(data)
-                print(f"[{self.env.upper()} API] Found {len(phone_numbers)} phone numbers")
-                return phone_numbers
+            # Server errors count towards opening the circuit; any other answer
+            # shows the service is up, which also frees a half-open probe
+            if response.status_code >= 500:
+                self.governor.record_failure()
             else:
-                print(f"[{self.env.upper()} API] Error: {response.text[:200]}")
-                return []
-                
-        except requests.RequestException as e:
-            print(f"[{self.env.upper()} API] Request failed: {e}")
-            return []
-    
+                self.governor.record_success()
+            print(f"[{self.env.upper()} API] Error: {response.text[:200]}")
+            return self._chunk_failure(chunk, LOOKUP_FAILED, f"HTTP {response.status_code}: {response.text[:200]}")
+
+    def _record_retries(self, response):
+        """Add the retries urllib3 made for this response to the running total."""
+        retries = getattr(response.raw, 'retries', None)
+        if retries is not None:
+            self._retry_count += len(retries.history)
+
+    def _map_batch_response(self, response_data, chunk):
+        """Map a batch response back to the addresses that were sent.
+
+        The 'responses' array is returned in request order. Responses that
+        carry only a flat 'persons' list are matched on each person's
+        propertyAddress instead.
+
+        Returns:
+            One (phone numbers, raw response entry) pair per address; the
+            entry is None when the response had nothing for the address
+        """
+        if isinstance(response_data, dict) and isinstance(response_data.get('responses'), list):
+            responses = response_data['responses']
+            if len(responses) == len(chunk):
+                return [(self._extract_phone_numbers(entry), entry) for entry in responses]
+
+            # Length mismatch - fall back to the address echoed in each entry
+            by_key = {}
+            for entry in responses:
+                echoed = (entry.get('input') or {}).get('propertyAddress') or entry.get('propertyAddress')
+                if echoed:
+                    by_key[self._address_match_key(echoed)] = entry
+            return [
+                (self._extract_phone_numbers(by_key[key]), by_key[key]) if key in by_key else ([], None)
+                for key in (self._address_match_key(address) for address in chunk)
+            ]
+
+        if len(chunk) == 1:
+            return [(self._extract_phone_numbers(response_data), response_data)]
+
+        results = response_data.get('results', {}) if isinstance(response_data, dict) else {}
+        persons_by_key = {self._address_match_key(address): [] for address in chunk}
+        for person in results.get('persons', []):
+            key = self._address_match_key(person.get('propertyAddress') or {})
+            if key in persons_by_key:
+                persons_by_key[key].append(person)
+        mapped = []
+        for address in chunk:
+            persons = persons_by_key[self._address_match_key(address)]
+            mapped.append((self._phones_from_persons(persons), {'results': {'persons': persons}} if persons else None))
+        return mapped
+
+    def _address_match_key(self, address):
+        """Key used to match an echoed propertyAddress to its input."""
+        record = normalize_address_fields(address.get('street'), zip_code=address.get('zip'))
+        return (record.street_line, record.zip)
+
+    def _to_property_address(self, address):
+        """Return the normalized propertyAddress dict the API expects."""
+        if isinstance(address, dict):
+            return normalize_address_fields(
+                address.get('street'), address.get('city'), address.get('state'), address.get('zip')
+            ).to_api_dict()
+        # If address is a string, try to parse it
+        return self._parse_address_string(address)
+
+    def _phones_from_persons(self, persons):
+        """Collect phone numbers from a list of person results."""
+        phone_numbers = []
+        for person in persons:
+            for phone in person.get('phoneNumbers', []):
+                number = phone.get('number')
+                if number:
+                    phone_numbers.append(number)
+        return phone_numbers
+
     def _extract_phone_numbers(self, response_data):
         """Extract phone numbers from API response."""
         phone_numbers = []
@@ -111,21 +574,13 @@ class BatchAPIConnector:
                 if 'results' in response:
                     results = response['results']
                     if 'persons' in results:
-                        for person in results['persons']:
-                            for phone in person.get('phoneNumbers', []):
-                                number = phone.get('number')
-                                if number:
-                                    phone_numbers.append(number)
+                        phone_numbers.extend(self._phones_from_persons(results['persons']))
         
         # Handle single result format
         elif 'results' in response_data:
             results = response_data['results']
             if 'persons' in results:
-                for person in results['persons']:
-                    for phone in person.get('phoneNumbers', []):
-                        number = phone.get('number')
-                        if number:
-                            phone_numbers.append(number)
+                phone_numbers.extend(self._phones_from_persons(results['persons']))
         
         # For sandbox, might return mock data differently
         elif 'phoneNumbers' in response_data:
@@ -139,8 +594,8 @@ class BatchAPIConnector:
         elif isinstance(response_data, list):
             phone_numbers = [p for p in response_data if isinstance(p, str)]
             
-        # Mock data for sandbox if no real response
-        if self.env == 'sandbox' and not phone_numbers:
+        # Mock data for the hosted sandbox mock if no real response
+        if self.base_url == SANDBOX_URL and not phone_numbers:
             # Return mock phone numbers for testing
             phone_numbers = ['555-0100', '555-0101', '555-0102']
             
@@ -148,28 +603,7 @@ class BatchAPIConnector:
     
     def _parse_address_string(self, address_str):
         """Parse address string into structured format."""
-        # Simple parser for "street, city, state zip" format
-        parts = address_str.split(',')
-        if len(parts) >= 2:
-            street = parts[0].strip()
-            remainder = parts[1].strip()
-            
-            # Split city, state, zip
-            words = remainder.split()
-            if len(words) >= 2:
-                zip_code = words[-1]
-                state = words[-2]
-                city = ' '.join(words[:-2]) if len(words) > 2 else ''
-                
-                return {
-                    'street': street,
-                    'city': city,
-                    'state': state,
-                    'zip': zip_code
-                }
-        
-        # Return as-is if parsing fails
-        return {'street': address_str}
+        return normalize_address(address_str).to_api_dict()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,108 @@
+"""
+BatchData API credentials
+Loads batchapi.csv once per process and reloads it when the file changes
+"""
+
+import csv
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+CREDENTIALS_FILENAME = 'batchapi.csv'
+# Seconds between checks of the credentials file for changes
+RELOAD_CHECK_INTERVAL = 2.0
+
+
+def candidate_paths() -> List[str]:
+    """Locations searched for batchapi.csv, in order"""
+    return [
+        os.path.join('..', CREDENTIALS_FILENAME),  # As specified in project_plan
+        os.path.join('.', CREDENTIALS_FILENAME),   # Current directory
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), CREDENTIALS_FILENAME)
+    ]
+
+
+def token_env_var(env: str) -> str:
+    """Environment variable that overrides one environment's token, e.g. BATCHDATA_API_TOKEN_PROD"""
+    return f"BATCHDATA_API_TOKEN_{env.upper()}"
+
+
+class CredentialStore:
+    """Environment -> API token map backed by batchapi.csv"""
+
+    def __init__(self, paths: Optional[List[str]] = None, check_interval: float = RELOAD_CHECK_INTERVAL):
+        self._paths = paths
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._tokens: Dict[str, str] = {}
+        self._source: Optional[Tuple[str, float]] = None
+        self._last_check = float('-inf')
+        self._warned = False
+        self.loads = 0
+
+    def _find(self) -> Optional[Tuple[str, float]]:
+        for path in self._paths or candidate_paths():
+            try:
+                return os.path.abspath(path), os.stat(path).st_mtime
+            except OSError:
+                continue
+        return None
+
+    def _load(self, path: str) -> Dict[str, str]:
+        tokens = {}
+        with open(path, 'r') as f:
+            for row in csv.reader(f):
+                if len(row) >= 2 and row[0].strip():
+                    tokens[row[0].strip()] = row[1].strip()
+        return tokens
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload the tokens if the file appeared, moved or changed
+
+        Returns:
+            True if the tokens were (re)loaded
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_check < self.check_interval:
+                return False
+            self._last_check = now
+
+            source = self._find()
+            if source == self._source and not force:
+                return False
+            self._source = source
+            if source is None:
+                self._tokens = {}
+                if not self._warned:
+                    print(f"Warning: {CREDENTIALS_FILENAME} not found in any expected location")
+                    self._warned = True
+                return True
+            try:
+                self._tokens = self._load(source[0])
+            except OSError as e:
+                print(f"Warning: could not read {source[0]}: {e}")
+                self._tokens = {}
+            self._warned = False
+            self.loads += 1
+            return True
+
+    def get_token(self, env: str) -> Optional[str]:
+        """Token for an environment; BATCHDATA_API_TOKEN_<ENV> overrides the file for that environment only
+
+        e.g. BATCHDATA_API_TOKEN_PROD never reaches the sandbox or local endpoints.
+        """
+        override = os.environ.get(token_env_var(env))
+        if override:
+            return override
+        self.refresh()
+        return self._tokens.get(env)
+
+
+_default_store = CredentialStore()
+
+
+def get_credential_store() -> CredentialStore:
+    """Return the process-wide credential store"""
+    return _default_store
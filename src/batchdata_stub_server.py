@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Local BatchData stand-in server for load and soak testing
+Speaks the skip-trace propertyAddress/responses/persons/phoneNumbers JSON shape
+with configurable latency, error rate, 429 throttling and batch limits
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+SKIP_TRACE_PATH = '/api/v1/property/skip-trace'
+
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'normal', 'lognormal')
+
+
+@dataclass
+class StubConfig:
+    """Behaviour of the stand-in server"""
+    latency_ms: float = 50.0
+    latency_distribution: str = 'lognormal'
+    latency_jitter_ms: float = 25.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    rate_limit: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: float = 1.0
+    max_batch_size: int = 100
+    hit_rate: float = 0.7
+    max_phones: int = 3
+    token: Optional[str] = None
+    seed: Optional[int] = None
+
+
+def phones_for_address(address: Dict[str, str], max_phones: int = 3, hit_rate: float = 1.0) -> List[str]:
+    """Deterministic phone numbers for an address (same address, same answer)"""
+    key = '|'.join(str(address.get(field) or '').strip().upper() for field in ('street', 'city', 'state', 'zip'))
+    digest = hashlib.sha256(key.encode('utf-8')).digest()
+    if digest[0] / 255.0 >= hit_rate or max_phones <= 0:
+        return []
+    count = 1 + digest[1] % max_phones
+    return [
+        f"860-{digest[2 + i] % 900 + 100:03d}-{int.from_bytes(digest[10 + 2 * i:12 + 2 * i], 'big') % 10000:04d}"
+        for i in range(count)
+    ]
+
+
+class StubState:
+    """Shared counters and throttle window for all handler threads"""
+
+    def __init__(self, config: StubConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.lock = threading.Lock()
+        self.window_start = time.monotonic()
+        self.window_count = 0
+        self.counters = {'requests': 0, 'addresses': 0, 'ok': 0, 'errors': 0, 'throttled': 0, 'rejected': 0}
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self.lock:
+            self.counters[name] += amount
+
+    def latency(self) -> float:
+        """Draw one response delay in seconds"""
+        config = self.config
+        with self.lock:
+            if config.latency_distribution == 'fixed':
+                ms = config.latency_ms
+            elif config.latency_distribution == 'uniform':
+                ms = self.random.uniform(config.latency_ms - config.latency_jitter_ms,
+                                         config.latency_ms + config.latency_jitter_ms)
+            elif config.latency_distribution == 'normal':
+                ms = self.random.gauss(config.latency_ms, config.latency_jitter_ms)
+            else:
+                # Long-tailed: median latency_ms, jitter widens the tail
+                sigma = config.latency_jitter_ms / config.latency_ms if config.latency_ms else 0.0
+                ms = config.latency_ms * self.random.lognormvariate(0.0, sigma)
+        return max(ms, 0.0) / 1000.0
+
+    def throttle_delay(self) -> Optional[float]:
+        """Retry-After seconds if this request must be answered 429, else None
+
+        Requests beyond rate_limit in the current one-second window wait for
+        the window to end; throttle_rate adds random 429s on top.
+        """
+        config = self.config
+        with self.lock:
+            if config.rate_limit > 0:
+                now = time.monotonic()
+                if now - self.window_start >= 1.0:
+                    self.window_start = now
+                    self.window_count = 0
+                self.window_count += 1
+                if self.window_count > config.rate_limit:
+                    return max(config.retry_after, self.window_start + 1.0 - now)
+            if config.throttle_rate > 0 and self.random.random() < config.throttle_rate:
+                return config.retry_after
+            return None
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            return self.config.error_rate > 0 and self.random.random() < self.config.error_rate
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """Handles POST skip-trace requests and GET /stats"""
+    protocol_version = 'HTTP/1.1'
+    server_version = 'BatchDataStub/1.0'
+    # Headers and body are written separately; without TCP_NODELAY each response stalls on delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, body, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up on this request, e.g. a hedged duplicate that lost
+            self.close_connection = True
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/stats':
+            state = self.server.state
+            with state.lock:
+                counters = dict(state.counters)
+            self._send_json(200, {'counters': counters, 'config': asdict(state.config)})
+        else:
+            self._send_json(404, {'status': {'code': 404, 'text': 'Not Found'}})
+
+    def do_POST(self):
+        state = self.server.state
+        config = state.config
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        state.count('requests')
+
+        if self.path.split('?')[0].rstrip('/') != SKIP_TRACE_PATH:
+            self._send_json(404, {'status': {'code': 404, 'text': 'Not Found'}})
+            return
+
+        if config.token and self.headers.get('Authorization') != f'Bearer {config.token}':
+            state.count('rejected')
+            self._send_json(401, {'status': {'code': 401, 'text': 'Unauthorized'}})
+            return
+
+        retry_after = state.throttle_delay()
+        if retry_after is not None:
+            state.count('throttled')
+            self._send_json(429, {'status': {'code': 429, 'text': 'Too Many Requests'}},
+                            headers={'Retry-After': f"{retry_after:.3g}"})
+            return
+
+        try:
+            requests_list = json.loads(raw or b'{}').get('requests')
+        except (ValueError, AttributeError):
+            requests_list = None
+        if not isinstance(requests_list, list) or not requests_list:
+            state.count('rejected')
+            self._send_json(400, {'status': {'code': 400, 'text': "Body must contain a non-empty 'requests' array"}})
+            return
+        if len(requests_list) > config.max_batch_size:
+            state.count('rejected')
+            self._send_json(400, {'status': {'code': 400,
+                                             'text': f"At most {config.max_batch_size} requests per call"}})
+            return
+
+        time.sleep(state.latency())
+
+        if state.should_fail():
+            state.count('errors')
+            self._send_json(config.error_status, {'status': {'code': config.error_status, 'text': 'Stub error'}})
+            return
+
+        state.count('ok')
+        state.count('addresses', len(requests_list))
+        self._send_json(200, {
+            'status': {'code': 200, 'text': 'OK'},
+            'results': {},
+            'responses': [self._response_for(entry) for entry in requests_list]
+        })
+
+    def _response_for(self, entry) -> Dict:
+        """Build one entry of the 'responses' array"""
+        config = self.server.state.config
+        address = (entry or {}).get('propertyAddress') or {}
+        phones = phones_for_address(address, config.max_phones, config.hit_rate)
+        persons = []
+        if phones:
+            persons.append({
+                'propertyAddress': address,
+                'name': {'full': 'STUB PERSON'},
+                'phoneNumbers': [
+                    {'number': number, 'type': 'Mobile' if i == 0 else 'Land Line', 'score': 90 - 10 * i}
+                    for i, number in enumerate(phones)
+                ]
+            })
+        return {
+            'input': {'propertyAddress': address},
+            'results': {'persons': persons}
+        }
+
+
+def make_server(config: StubConfig, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                verbose: bool = False) -> ThreadingHTTPServer:
+    """Create (but do not start) a stand-in server"""
+    if config.latency_distribution not in LATENCY_DISTRIBUTIONS:
+        raise ValueError(f"latency_distribution must be one of {LATENCY_DISTRIBUTIONS}")
+    server = ThreadingHTTPServer((host, port), StubRequestHandler)
+    server.daemon_threads = True
+    server.state = StubState(config)
+    server.verbose = verbose
+    return server
+
+
+def start_in_thread(config: Optional[StubConfig] = None, host: str = DEFAULT_HOST,
+                    port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Start a stand-in server on a background thread
+
+    Returns:
+        (server, skip-trace URL); call server.shutdown() when done
+    """
+    server = make_server(config or StubConfig(), host, port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}{SKIP_TRACE_PATH}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a local BatchData skip-trace stand-in server')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='Median/mean response latency')
+    parser.add_argument('--latency-distribution', choices=LATENCY_DISTRIBUTIONS, default='lognormal')
+    parser.add_argument('--latency-jitter-ms', type=float, default=25.0, help='Spread of the latency distribution')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests answered with an error')
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='Requests per second before 429 (0 = off)')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Share of requests randomly answered 429')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds sent with 429')
+    parser.add_argument('--max-batch-size', type=int, default=100)
+    parser.add_argument('--hit-rate', type=float, default=0.7, help='Share of addresses that return phones')
+    parser.add_argument('--max-phones', type=int, default=3)
+    parser.add_argument('--token', help='Require this bearer token')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    args = parser.parse_args()
+
+    config = StubConfig(
+        latency_ms=args.latency_ms,
+        latency_distribution=args.latency_distribution,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        rate_limit=args.rate_limit,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        max_batch_size=args.max_batch_size,
+        hit_rate=args.hit_rate,
+        max_phones=args.max_phones,
+        token=args.token,
+        seed=args.seed
+    )
+    server = make_server(config, args.host, args.port, verbose=args.verbose)
+    print(f"BatchData stand-in listening on http://{args.host}:{server.server_port}{SKIP_TRACE_PATH}")
+    print(f"Point the connector at it with env='local' (and BATCHDATA_LOCAL_URL if not on the default port)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+Process-wide registry of warm BatchData connectors
+One connector per environment, sharing credentials, rate-limit state and the result cache
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import weakref
+from typing import Dict, Optional, Tuple
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from batch_api_connector import BatchAPIConnector
+from async_batch_api_connector import AsyncBatchAPIConnector
+from batchdata_credentials import CredentialStore, get_credential_store
+from rate_governor import RateGovernor
+from request_hedger import RequestHedger
+from skip_trace_cache import get_default_cache
+
+
+class ConnectorRegistry:
+    """Hands out long-lived connectors instead of building one per request
+
+    Sync connectors are shared by every thread. Async connectors hold an
+    httpx client and semaphore bound to an event loop, so one is kept per
+    environment per running loop. All connectors for an environment share
+    one RateGovernor, so concurrent jobs respect the same plan limits, and
+    one RequestHedger, so the hedges-per-minute cap holds process-wide.
+    """
+
+    def __init__(self, credentials: Optional[CredentialStore] = None):
+        self.credentials = credentials or get_credential_store()
+        self._lock = threading.Lock()
+        self._governors: Dict[str, RateGovernor] = {}
+        self._hedgers: Dict[str, RequestHedger] = {}
+        self._connectors: Dict[Tuple[str, bool], BatchAPIConnector] = {}
+        self._async_connectors: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+        self.created = 0
+        self.reused = 0
+
+    def governor(self, env: str) -> RateGovernor:
+        """Shared rate governor for an environment"""
+        with self._lock:
+            return self._governor(env)
+
+    def _governor(self, env: str) -> RateGovernor:
+        if env not in self._governors:
+            self._governors[env] = RateGovernor.from_env()
+        return self._governors[env]
+
+    def _hedger(self, env: str) -> RequestHedger:
+        if env not in self._hedgers:
+            self._hedgers[env] = RequestHedger.from_env()
+        return self._hedgers[env]
+
+    def get_connector(self, env: str = 'sandbox', use_cache: bool = True) -> BatchAPIConnector:
+        """Warm sync connector for an environment"""
+        key = (env, use_cache)
+        with self._lock:
+            connector = self._connectors.get(key)
+            if connector is None:
+                connector = BatchAPIConnector(env, cache=get_default_cache() if use_cache else None,
+                                              governor=self._governor(env), credentials=self.credentials,
+                                              hedger=self._hedger(env))
+                self._connectors[key] = connector
+                self.created += 1
+            else:
+                self.reused += 1
+        self._apply_config(connector)
+        return connector
+
+    def get_async_connector(self, env: str = 'sandbox', use_cache: bool = True) -> AsyncBatchAPIConnector:
+        """Warm async connector for an environment on the running event loop"""
+        loop = asyncio.get_running_loop()
+        key = (env, use_cache)
+        with self._lock:
+            per_loop = self._async_connectors.setdefault(loop, {})
+            connector = per_loop.get(key)
+            if connector is None:
+                connector = AsyncBatchAPIConnector(env, cache=get_default_cache() if use_cache else None,
+                                                   governor=self._governor(env), credentials=self.credentials,
+                                                   hedger=self._hedger(env))
+                per_loop[key] = connector
+                self.created += 1
+            else:
+                self.reused += 1
+        self._apply_config(connector)
+        return connector
+
+    def _apply_config(self, connector: BatchAPIConnector) -> None:
+        """Pick up credential or endpoint changes without rebuilding the connector"""
+        connector.api_token = connector._get_api_token(connector.env)
+        connector.base_url = connector._get_base_url(connector.env)
+
+    def reload(self) -> None:
+        """Re-read batchapi.csv now and push the new tokens to every connector"""
+        self.credentials.refresh(force=True)
+        with self._lock:
+            connectors = list(self._connectors.values())
+            for per_loop in self._async_connectors.values():
+                connectors.extend(per_loop.values())
+        for connector in connectors:
+            self._apply_config(connector)
+
+    def close(self) -> None:
+        """Close sync connectors and forget every connector"""
+        with self._lock:
+            connectors = list(self._connectors.values())
+            self._connectors.clear()
+            self._async_connectors = weakref.WeakKeyDictionary()
+        for connector in connectors:
+            connector.close()
+
+    async def aclose(self) -> None:
+        """Close the async connectors bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            per_loop = self._async_connectors.pop(loop, {})
+        for connector in per_loop.values():
+            await connector.aclose()
+
+    def stats(self) -> Dict[str, object]:
+        """Connector counts and per-environment governor and hedging state"""
+        with self._lock:
+            return {
+                'connectors': len(self._connectors),
+                'async_connectors': sum(len(per_loop) for per_loop in self._async_connectors.values()),
+                'created': self.created,
+                'reused': self.reused,
+                'credential_loads': self.credentials.loads,
+                'governors': {env: governor.stats() for env, governor in self._governors.items()},
+                'hedging': {env: hedger.stats() for env, hedger in self._hedgers.items()}
+            }
+
+
+_registry: Optional[ConnectorRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_connector_registry() -> ConnectorRegistry:
+    """Return the process-wide connector registry"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ConnectorRegistry()
+        return _registry
@@ -3,21 +3,95 @@ Database connector for Supabase
 Handles all database operations for the foreclosure scraper
 """
 
+import base64
+import json
 import os
+import sys
+import threading
+from datetime import datetime
 from typing import Optional, List, Dict, Any
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
 from supabase import create_client, Client
 from dotenv import load_dotenv
 import logging
 
+from response_archive import RESPONSES_TABLE, ArchivedResponse, build_archive_rows
+from write_behind import WriteBehindBuffer
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Rows per multi-row insert request
+BULK_CHUNK_SIZE = 500
+# Values per "in" filter; keeps the query string well under URL length limits
+IN_FILTER_CHUNK = 200
+# Rows per page when reading; matches PostgREST's default max-rows cap
+SELECT_PAGE_SIZE = 1000
+
+# Natural keys used as ON CONFLICT targets (unique indexes in SCHEMA_MIGRATION_V4_natural_keys.sql)
+CASE_KEY = 'docket_number'
+TOWN_KEY = 'town'
+SKIPTRACE_KEY = 'docket_number,phone_number'
+COST_KEY = 'docket_number,is_sandbox'
+
+# Addresses held by the eligibility screen, unique per defendant address (SCHEMA_MIGRATION_V4_review_queue.sql)
+REVIEW_QUEUE_TABLE = 'skiptrace_review_queue'
+REVIEW_QUEUE_KEY = 'docket_number,defendant_name,address'
+
+# Trigger-maintained counts per town (SCHEMA_MIGRATION_V4_town_stats_table.sql)
+TOWN_STATS_TABLE = 'town_stats'
+# Atomic per-docket cost increments, also appended to the spend ledger
+# (SCHEMA_MIGRATION_V4_cost_increment.sql, SCHEMA_MIGRATION_V4_spend_rpc.sql)
+COST_INCREMENT_RPC = 'increment_skip_trace_costs'
+SPEND_TOTAL_RPC = 'skip_trace_spend_total'
+# Paid-for and found dockets per town (SCHEMA_MIGRATION_V4_hit_rates.sql)
+HIT_RATES_RPC = 'skip_trace_hit_rates'
+# Server-side cost aggregation (SCHEMA_MIGRATION_V4_cost_summary.sql)
+COST_SUMMARY_RPC = 'skip_trace_cost_summary'
+COST_DETAILS_RPC = 'skip_trace_cost_details'
+
+# Skip trace columns for callers that only show phones
+PHONE_COLUMNS = 'id, docket_number, phone_number, phone_type'
+
+# Row counts PostgREST can return with a page (Prefer: count=...)
+COUNT_METHODS = ('exact', 'planned', 'estimated')
+
+
+def encode_cursor(row: Dict[str, Any]) -> str:
+    """Opaque keyset cursor pointing just past a row, from its (created_at, id)"""
+    raw = json.dumps([row['created_at'], row['id']]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """(created_at, id) from encode_cursor; ValueError if the cursor is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return str(created_at), int(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
 class DatabaseConnector:
     """Manages Supabase database connections and operations"""
 
-    def __init__(self):
-        """Initialize Supabase client"""
+    def __init__(self, client: Optional[Client] = None):
+        """Initialize Supabase client
+
+        Long-running processes should use get_database() instead, which
+        builds one connector and reuses its client and HTTP connections.
+
+        Args:
+            client: Supabase client to use instead of building one from
+                SUPABASE_URL and SUPABASE_ANON_KEY (tests pass a stand-in)
+        """
+        if client is not None:
+            self.url = self.key = None
+            self.client = client
+            return
+
         load_dotenv()
 
         self.url = os.environ.get("SUPABASE_URL")
@@ -29,6 +103,25 @@ class DatabaseConnector:
         self.client: Client = create_client(self.url, self.key)
         logger.info("Database connection initialized")
 
+    @property
+    def write_buffer(self) -> WriteBehindBuffer:
+        """Write-behind buffer for skip trace and cost rows, created on first use"""
+        with _write_buffer_lock:
+            if getattr(self, '_write_buffer', None) is None:
+                self._write_buffer = WriteBehindBuffer(self)
+            return self._write_buffer
+
+    def close(self) -> None:
+        """Flush buffered writes, then close the client's pooled HTTP connections"""
+        buffer = getattr(self, '_write_buffer', None)
+        if buffer is not None:
+            buffer.close()
+        try:
+            # Despite the name, postgrest's aclose() closes its sync httpx session
+            self.client.postgrest.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing database connections: {e}")
+
     def test_connection(self) -> bool:
         """Test database connection"""
         try:
@@ -39,6 +132,126 @@ class DatabaseConnector:
             logger.error(f"Database connection failed: {e}")
             return False
 
+    # Request builders shared with AsyncDatabaseConnector: each returns the
+    # unexecuted PostgREST request, which this class executes and the async one awaits
+    @staticmethod
+    def _upsert_request(client, table_name: str, rows: List[Dict[str, Any]], on_conflict: str,
+                        ignore_duplicates: bool = False):
+        """Upsert with rows repeating a key collapsed first (last wins, or first with ignore_duplicates)"""
+        columns = on_conflict.split(',')
+        unique: Dict[tuple, Dict[str, Any]] = {}
+        for row in rows:
+            key = tuple(row.get(column) for column in columns)
+            if ignore_duplicates:
+                unique.setdefault(key, row)
+            else:
+                unique[key] = row
+        return client.table(table_name).upsert(
+            list(unique.values()), on_conflict=on_conflict, ignore_duplicates=ignore_duplicates,
+            default_to_null=False
+        )
+
+    @staticmethod
+    def _docket_chunks(docket_numbers: List[str]) -> List[List[str]]:
+        """Distinct dockets split into IN_FILTER_CHUNK-sized "in" filters"""
+        dockets = list(dict.fromkeys(docket_numbers))
+        return [dockets[start:start + IN_FILTER_CHUNK] for start in range(0, len(dockets), IN_FILTER_CHUNK)]
+
+    @staticmethod
+    def _docket_page_request(client, table_name: str, columns: str, chunk: List[str], offset: int):
+        """One SELECT_PAGE_SIZE page, by id, of the rows for a chunk of dockets"""
+        return client.table(table_name).select(columns).in_(
+            'docket_number', chunk
+        ).order('id').range(offset, offset + SELECT_PAGE_SIZE - 1)
+
+    @staticmethod
+    def _group_by_docket(docket_numbers: List[str], rows: List[Dict]) -> Dict[str, List[Dict]]:
+        """{docket_number: [rows]} with an entry (possibly empty) for every docket"""
+        grouped: Dict[str, List[Dict]] = {docket: [] for docket in docket_numbers}
+        for row in rows:
+            grouped.setdefault(row['docket_number'], []).append(row)
+        return grouped
+
+    @staticmethod
+    def _full_case_request(client, include_sandbox: bool, skiptrace_columns: str):
+        """Select of cases with their defendants and skip traces embedded"""
+        select = f"*, defendants(*), skiptraces:skiptrace({skiptrace_columns})"
+        if include_sandbox:
+            select += f", skiptraces_sandbox:skiptrace_sandbox({skiptrace_columns})"
+        return client.table('cases').select(select)
+
+    @staticmethod
+    def _list_page_request(client, table_name: str, filters: Optional[Dict[str, Any]], skip: int, limit: int,
+                           cursor: Optional[str], count: Optional[str]):
+        """See list_page; raises ValueError if the cursor is malformed"""
+        query = client.table(table_name).select("*", count=count)
+        for column, value in (filters or {}).items():
+            if value is not None:
+                query = query.eq(column, value)
+
+        if cursor:
+            created_at, row_id = decode_cursor(cursor)
+            query = query.or_(f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{row_id})')
+            skip = 0
+
+        # One extra row tells whether another page follows without relying on the count
+        return query.order('created_at', desc=True).order('id', desc=True).range(skip, skip + limit)
+
+    @staticmethod
+    def _page_result(response, limit: int) -> Dict[str, Any]:
+        """Shape a _list_page_request response as the list_page result"""
+        rows = response.data or []
+        items = rows[:limit]
+        has_more = len(rows) > limit
+        return {
+            'items': items,
+            'total': response.count,
+            'has_more': has_more,
+            'next_cursor': encode_cursor(items[-1]) if has_more else None
+        }
+
+    @staticmethod
+    def _insert_chunk_request(client, table_name: str, batch: List[Dict[str, Any]], on_conflict: Optional[str]):
+        """Multi-row insert for _insert_chunked; with on_conflict, existing keys are skipped"""
+        query = client.table(table_name)
+        # Columns missing from a row take their database default, not NULL
+        if on_conflict:
+            return query.upsert(batch, on_conflict=on_conflict, ignore_duplicates=True, default_to_null=False)
+        return query.insert(batch, default_to_null=False)
+
+    # Conflict-aware writes keyed on natural keys
+    def upsert_rows(self, table_name: str, rows: List[Dict[str, Any]], on_conflict: str,
+                    ignore_duplicates: bool = False) -> Optional[List[Dict]]:
+        """Insert rows and let the database resolve natural-key conflicts, in one request
+
+        Args:
+            table_name: Table to write
+            rows: Rows to write; rows repeating a key keep only the last (upsert) or first (ignore)
+            on_conflict: Comma-separated unique columns, e.g. CASE_KEY
+            ignore_duplicates: False updates existing rows with the new values (upsert),
+                True leaves them untouched (insert-ignore)
+
+        Returns:
+            Rows written (with ignore_duplicates, only the newly inserted ones),
+            or None if the request failed
+        """
+        if not rows:
+            return []
+        try:
+            response = self._upsert_request(self.client, table_name, rows, on_conflict, ignore_duplicates).execute()
+            return response.data if response.data else []
+        except Exception as e:
+            logger.error(f"Error upserting into {table_name}: {e}")
+            return None
+
+    def insert_ignore(self, table_name: str, rows: List[Dict[str, Any]], on_conflict: str) -> Optional[List[Dict]]:
+        """Insert rows whose natural key is not present yet; existing rows are left as they are
+
+        Returns:
+            The newly inserted rows ([] if all existed), or None if the request failed
+        """
+        return self.upsert_rows(table_name, rows, on_conflict, ignore_duplicates=True)
+
     # Case operations
     def insert_case(self, case_data: Dict[str, Any]) -> Optional[Dict]:
         """Insert a new case"""
@@ -99,18 +312,14 @@ class DatabaseConnector:
 
     # CT Towns operations
     def insert_ct_town(self, town: str, county: str) -> Optional[Dict]:
-        """Insert a Connecticut town and county"""
-        try:
-            town_data = {'town': town, 'county': county}
-            response = self.client.table('ct_towns').insert(town_data).execute()
+        """Insert a Connecticut town and county (None if the town already exists)"""
+        inserted = self.insert_ignore('ct_towns', [{'town': town, 'county': county}], TOWN_KEY)
+        if inserted:
             logger.info(f"CT town inserted: {town}, {county} County")
-            return response.data[0] if response.data else None
-        except Exception as e:
-            if 'duplicate key' in str(e).lower():
-                logger.debug(f"Town already exists: {town}")
-            else:
-                logger.error(f"Error inserting CT town: {e}")
-            return None
+            return inserted[0]
+        if inserted is not None:
+            logger.debug(f"Town already exists: {town}")
+        return None
 
     def get_all_ct_towns(self) -> List[Dict]:
         """Get all Connecticut towns and counties"""
@@ -150,26 +359,28 @@ class DatabaseConnector:
             return False
 
     def populate_ct_towns(self, towns_data: List[tuple]) -> int:
-        """Bulk insert Connecticut towns and counties"""
-        inserted_count = 0
-        for town, county in towns_data:
-            result = self.insert_ct_town(town, county)
-            if result:
-                inserted_count += 1
+        """Bulk insert Connecticut towns and counties; towns already present are kept"""
+        inserted = self.insert_ignore('ct_towns', [{'town': town, 'county': county} for town, county in towns_data],
+                                      TOWN_KEY)
+        inserted_count = len(inserted or [])
         logger.info(f"Inserted {inserted_count} towns into database")
         return inserted_count
 
     # Skip trace operations
-    def insert_skiptraces(self, skiptrace_data: List[Dict[str, Any]], is_sandbox: bool = False) -> List[Dict]:
-        """Insert multiple skip trace records to appropriate table"""
+    def insert_skiptraces(self, skiptrace_data: List[Dict[str, Any]], is_sandbox: bool = False) -> Optional[List[Dict]]:
+        """Insert multiple skip trace records to appropriate table
+
+        A phone number already stored for the docket is not inserted again.
+
+        Returns:
+            The newly inserted records, or None if the request failed
+        """
         table_name = 'skiptrace_sandbox' if is_sandbox else 'skiptrace'
-        try:
-            response = self.client.table(table_name).insert(skiptrace_data).execute()
-            logger.info(f"Inserted {len(skiptrace_data)} skip trace records to {table_name}")
-            return response.data if response.data else []
-        except Exception as e:
-            logger.error(f"Error inserting skip trace records to {table_name}: {e}")
-            return []
+        inserted = self.insert_ignore(table_name, skiptrace_data, SKIPTRACE_KEY)
+        if inserted is None:
+            return None
+        logger.info(f"Inserted {len(inserted)} of {len(skiptrace_data)} skip trace records to {table_name}")
+        return inserted
 
     def get_skiptraces_by_docket(self, docket_number: str, is_sandbox: bool = False) -> List[Dict]:
         """Get all skip trace records for a case by docket number from appropriate table"""
@@ -181,6 +392,121 @@ class DatabaseConnector:
             logger.error(f"Error fetching skip trace records from {table_name}: {e}")
             return []
 
+    # Multi-docket reads
+    def _select_by_dockets(self, table_name: str, docket_numbers: List[str],
+                           columns: str = "*") -> Optional[Dict[str, List[Dict]]]:
+        """Fetch rows for many dockets with chunked "in" filters, grouped by docket
+
+        Each chunk is paged by id so a response capped at the server's row
+        limit is not silently truncated.
+
+        Returns:
+            {docket_number: [rows]} with an entry (possibly empty) for every docket,
+            or None if any chunk failed (a partial result would look like missing rows)
+        """
+        rows = []
+        try:
+            for chunk in self._docket_chunks(docket_numbers):
+                offset = 0
+                while True:
+                    response = self._docket_page_request(self.client, table_name, columns, chunk, offset).execute()
+                    page = response.data or []
+                    rows.extend(page)
+                    if len(page) < SELECT_PAGE_SIZE:
+                        break
+                    offset += SELECT_PAGE_SIZE
+        except Exception as e:
+            logger.error(f"Error fetching {table_name} for {len(docket_numbers)} dockets: {e}")
+            return None
+        return self._group_by_docket(docket_numbers, rows)
+
+    def get_cases_by_dockets(self, docket_numbers: List[str]) -> Optional[Dict[str, Dict]]:
+        """Get many cases keyed by docket number (dockets with no case are left out), or None on error"""
+        grouped = self._select_by_dockets('cases', docket_numbers)
+        if grouped is None:
+            return None
+        return {docket: rows[0] for docket, rows in grouped.items() if rows}
+
+    def get_defendants_by_dockets(self, docket_numbers: List[str]) -> Optional[Dict[str, List[Dict]]]:
+        """Get the defendants of many cases, grouped by docket number"""
+        return self._select_by_dockets('defendants', docket_numbers)
+
+    def get_skiptraces_by_dockets(self, docket_numbers: List[str],
+                                  is_sandbox: bool = False) -> Optional[Dict[str, List[Dict]]]:
+        """Get the skip trace records of many cases, grouped by docket number"""
+        table_name = 'skiptrace_sandbox' if is_sandbox else 'skiptrace'
+        return self._select_by_dockets(table_name, docket_numbers)
+
+    def have_been_skip_traced(self, docket_numbers: List[str], is_sandbox: bool = False) -> Optional[Dict[str, bool]]:
+        """Batched has_been_skip_traced: {docket_number: True if it has skip trace records}, or None on error"""
+        table_name = 'skiptrace_sandbox' if is_sandbox else 'skiptrace'
+        grouped = self._select_by_dockets(table_name, docket_numbers, columns="id, docket_number")
+        if grouped is None:
+            return None
+        return {docket: bool(rows) for docket, rows in grouped.items()}
+
+    # Raw response archive
+    def archive_raw_responses(self, payloads: List[Any]) -> List[Optional[str]]:
+        """Store raw BatchData payloads compressed and deduplicated by content hash
+
+        Args:
+            payloads: Raw response entries (None/empty entries are skipped)
+
+        Returns:
+            response_hash per payload, for the skiptrace rows to reference
+            (None for skipped payloads, or for all of them if the write fails)
+        """
+        hashes, rows = build_archive_rows(payloads)
+        if not rows:
+            return hashes
+        try:
+            # Identical payloads archived earlier are left untouched
+            self._upsert_request(self.client, RESPONSES_TABLE, rows, 'response_hash', ignore_duplicates=True).execute()
+            raw = sum(row['raw_size'] for row in rows)
+            compressed = sum(row['compressed_size'] for row in rows)
+            logger.info(f"Archived {len(rows)} raw responses ({raw} bytes -> {compressed} bytes)")
+            return hashes
+        except Exception as e:
+            logger.error(f"Error archiving raw responses: {e}")
+            return [None] * len(hashes)
+
+    def get_raw_responses(self, response_hashes: List[str]) -> Dict[str, ArchivedResponse]:
+        """Fetch archived responses by hash; payloads are decompressed on first access"""
+        wanted = list({h for h in response_hashes if h})
+        if not wanted:
+            return {}
+        try:
+            response = self.client.table(RESPONSES_TABLE).select(
+                "response_hash,payload,raw_size"
+            ).in_('response_hash', wanted).execute()
+            return {
+                row['response_hash']: ArchivedResponse(row['response_hash'], row['payload'], row.get('raw_size'))
+                for row in response.data or []
+            }
+        except Exception as e:
+            logger.error(f"Error fetching raw responses: {e}")
+            return {}
+
+    def get_skiptrace_raw_response(self, skip_trace_id: int, is_sandbox: bool = False) -> Optional[Any]:
+        """Return the raw BatchData payload behind one skip trace record"""
+        table_name = 'skiptrace_sandbox' if is_sandbox else 'skiptrace'
+        try:
+            response = self.client.table(table_name).select(
+                "response_hash,api_response"
+            ).eq('id', skip_trace_id).execute()
+            if not response.data:
+                return None
+            record = response.data[0]
+            if record.get('response_hash'):
+                archived = self.get_raw_responses([record['response_hash']]).get(record['response_hash'])
+                if archived:
+                    return archived.payload
+            # Rows written before the archive existed may carry the payload inline
+            return record.get('api_response')
+        except Exception as e:
+            logger.error(f"Error fetching raw response for skip trace {skip_trace_id}: {e}")
+            return None
+
     # Batch operations
     def insert_case_with_defendants(self, case_data: Dict, defendants: List[Dict]) -> Optional[Dict]:
         """Insert a case with multiple defendants in a transaction-like manner"""
@@ -201,34 +527,229 @@ class DatabaseConnector:
             logger.error(f"Error in batch insert: {e}")
             return None
 
-    def get_full_case_data(self, docket_number: str, include_sandbox: bool = False) -> Optional[Dict]:
-        """Get complete case data with defendants and skip trace records"""
-        try:
-            # Get case
-            case = self.get_case_by_docket(docket_number)
-            if not case:
-                return None
+    # Bulk ingest
+    def _insert_chunked(self, table_name: str, rows: List[Dict[str, Any]], chunk_size: int,
+                        on_conflict: Optional[str] = None) -> List[Optional[str]]:
+        """Insert rows in multi-row requests
 
-            # Get defendants by docket number
-            defendants = self.get_defendants_by_docket(docket_number)
+        With on_conflict, rows whose natural key already exists are skipped by
+        the database. A chunk that fails is retried row by row so one bad row
+        does not sink its neighbours.
 
-            # Get production skip trace records for the case
-            skiptraces = self.get_skiptraces_by_docket(docket_number, is_sandbox=False)
+        Returns:
+            Per row: None if inserted, 'exists' if skipped as a duplicate,
+            otherwise the error message
+        """
+        outcomes: List[Optional[str]] = [None] * len(rows)
 
-            # Optionally get sandbox skip trace records
-            skiptraces_sandbox = []
-            if include_sandbox:
-                skiptraces_sandbox = self.get_skiptraces_by_docket(docket_number, is_sandbox=True)
+        def write(start, batch):
+            response = self._insert_chunk_request(self.client, table_name, batch, on_conflict).execute()
+            self._mark_existing(outcomes, start, batch, response, on_conflict)
 
-            case['defendants'] = defendants
-            case['skiptraces'] = skiptraces
-            if include_sandbox:
-                case['skiptraces_sandbox'] = skiptraces_sandbox
-            return case
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            try:
+                write(start, chunk)
+                continue
+            except Exception as e:
+                logger.warning(f"Bulk insert of {len(chunk)} rows into {table_name} failed ({e}); retrying row by row")
+            for offset, row in enumerate(chunk):
+                try:
+                    write(start + offset, [row])
+                except Exception as e:
+                    outcomes[start + offset] = str(e)
+        return outcomes
+
+    @staticmethod
+    def _mark_existing(outcomes: List[Optional[str]], start: int, batch: List[Dict[str, Any]], response,
+                       on_conflict: Optional[str]) -> None:
+        """Mark the rows of an insert-ignore batch the database skipped as 'exists'"""
+        if not on_conflict:
+            return
+        columns = on_conflict.split(',')
+        written = {tuple(row.get(c) for c in columns) for row in response.data or []}
+        for offset, row in enumerate(batch):
+            if tuple(row.get(c) for c in columns) not in written:
+                outcomes[start + offset] = 'exists'
+
+    def bulk_ingest_cases(self, cases: List[Dict[str, Any]], defendants: List[Dict[str, Any]],
+                          chunk_size: int = BULK_CHUNK_SIZE) -> Dict[str, Any]:
+        """Store a town's scraped cases and their defendants in a few requests
+
+        Cases are insert-ignored on docket_number, so dockets already in the
+        database (or earlier in the list) are skipped along with their
+        defendants without a separate existence check.
+
+        Args:
+            cases: Case rows (Case.to_dict())
+            defendants: Defendant rows (Defendant.to_dict()), each with docket_number
+            chunk_size: Rows per insert request
+
+        Returns:
+            Dictionary with one result per case in input order
+            ({'docket_number', 'status': inserted|exists|failed, 'error'}),
+            one per defendant ({'docket_number', 'name', 'status', 'error'}),
+            and the counts of each status
+        """
+        case_results, new_rows, new_indices = self._plan_case_rows(cases)
+        inserted = self._record_case_outcomes(
+            case_results, new_indices, self._insert_chunked('cases', new_rows, chunk_size, on_conflict=CASE_KEY)
+        )
+        defendant_results, defendant_rows, defendant_indices = self._plan_defendant_rows(defendants, inserted)
+        self._record_defendant_outcomes(
+            defendant_results, defendant_indices, self._insert_chunked('defendants', defendant_rows, chunk_size)
+        )
+        return self._bulk_summary(case_results, defendant_results)
+
+    @staticmethod
+    def _plan_case_rows(cases: List[Dict[str, Any]]):
+        """Per-case results plus the rows (and their indices) to insert; repeated dockets are 'exists'"""
+        case_results = [{'docket_number': case.get('docket_number'), 'status': None, 'error': None}
+                        for case in cases]
+        new_rows = []
+        new_indices = []
+        seen = set()
+        for i, case in enumerate(cases):
+            if case['docket_number'] in seen:
+                case_results[i]['status'] = 'exists'
+                continue
+            seen.add(case['docket_number'])
+            new_rows.append(case)
+            new_indices.append(i)
+        return case_results, new_rows, new_indices
+
+    @staticmethod
+    def _record_case_outcomes(case_results: List[Dict], indices: List[int], outcomes: List[Optional[str]]) -> set:
+        """Fill in case statuses from _insert_chunked; returns the dockets that were inserted"""
+        inserted = set()
+        for i, outcome in zip(indices, outcomes):
+            if outcome is None:
+                case_results[i]['status'] = 'inserted'
+                inserted.add(case_results[i]['docket_number'])
+            elif outcome == 'exists':
+                case_results[i]['status'] = 'exists'
+            else:
+                case_results[i].update(status='failed', error=outcome)
+        return inserted
+
+    @staticmethod
+    def _plan_defendant_rows(defendants: List[Dict[str, Any]], inserted: set):
+        """Per-defendant results plus the rows to insert: only those of newly inserted cases"""
+        defendant_results = [{'docket_number': d.get('docket_number'), 'name': d.get('name'), 'status': None,
+                              'error': None} for d in defendants]
+        defendant_rows = []
+        defendant_indices = []
+        for i, defendant in enumerate(defendants):
+            if defendant.get('docket_number') in inserted:
+                defendant_rows.append(defendant)
+                defendant_indices.append(i)
+            else:
+                defendant_results[i]['status'] = 'skipped'
+        return defendant_results, defendant_rows, defendant_indices
+
+    @staticmethod
+    def _record_defendant_outcomes(defendant_results: List[Dict], indices: List[int],
+                                   outcomes: List[Optional[str]]) -> None:
+        for i, error in zip(indices, outcomes):
+            defendant_results[i].update(status='inserted' if error is None else 'failed', error=error)
+
+    @staticmethod
+    def _bulk_summary(case_results: List[Dict], defendant_results: List[Dict]) -> Dict[str, Any]:
+        """Counts per status alongside the per-row results"""
+        def count(results, status):
+            return sum(1 for result in results if result['status'] == status)
+
+        summary = {
+            'cases': case_results,
+            'defendants': defendant_results,
+            'cases_inserted': count(case_results, 'inserted'),
+            'cases_existing': count(case_results, 'exists'),
+            'cases_failed': count(case_results, 'failed'),
+            'defendants_inserted': count(defendant_results, 'inserted'),
+            'defendants_failed': count(defendant_results, 'failed')
+        }
+        logger.info(f"Bulk ingest: {summary['cases_inserted']} cases inserted, {summary['cases_existing']} existing, "
+                    f"{summary['cases_failed']} failed; {summary['defendants_inserted']} defendants inserted")
+        return summary
+
+    @staticmethod
+    def _shape_full_case(case: Dict, include_sandbox: bool) -> Dict:
+        """Embedded rows come back unordered; keep them in insertion order"""
+        keys = ['defendants', 'skiptraces'] + (['skiptraces_sandbox'] if include_sandbox else [])
+        for key in keys:
+            case[key] = sorted(case.get(key) or [], key=lambda row: row.get('id') or 0)
+        return case
+
+    def get_full_case_data(self, docket_number: str, include_sandbox: bool = False,
+                           skiptrace_columns: str = "*") -> Optional[Dict]:
+        """Get complete case data with defendants and skip trace records
+
+        Defendants and skip traces are embedded in the case select, so the
+        whole aggregate is one request.
+
+        Args:
+            docket_number: The docket number
+            include_sandbox: Also embed skiptrace_sandbox records
+            skiptrace_columns: Skip trace columns to return, e.g. PHONE_COLUMNS
+        """
+        try:
+            response = self._full_case_request(self.client, include_sandbox, skiptrace_columns).eq(
+                'docket_number', docket_number
+            ).execute()
+            if not response.data:
+                return None
+            return self._shape_full_case(response.data[0], include_sandbox)
         except Exception as e:
             logger.error(f"Error fetching full case data: {e}")
             return None
 
+    def get_full_cases_data(self, docket_numbers: List[str], include_sandbox: bool = False,
+                            skiptrace_columns: str = "*") -> Optional[Dict[str, Dict]]:
+        """Multi-docket get_full_case_data, one request per IN_FILTER_CHUNK dockets
+
+        Returns:
+            {docket_number: full case}; dockets not found are left out.
+            None if any chunk failed (a partial result would look like missing cases)
+        """
+        cases: Dict[str, Dict] = {}
+        try:
+            for chunk in self._docket_chunks(docket_numbers):
+                response = self._full_case_request(self.client, include_sandbox, skiptrace_columns).in_(
+                    'docket_number', chunk
+                ).execute()
+                for case in response.data or []:
+                    cases[case['docket_number']] = self._shape_full_case(case, include_sandbox)
+        except Exception as e:
+            logger.error(f"Error fetching full case data for {len(docket_numbers)} dockets: {e}")
+            return None
+        return cases
+
+    # Paginated listing
+    def list_page(self, table_name: str, filters: Optional[Dict[str, Any]] = None, skip: int = 0,
+                  limit: int = 100, cursor: Optional[str] = None, count: Optional[str] = 'exact') -> Dict[str, Any]:
+        """Read one page of a table, newest first, with paging done by the database
+
+        Rows are ordered by (created_at, id) descending. Without a cursor the
+        page is an offset range; with one, it is the rows after the cursor
+        (keyset paging), which stays fast however deep the caller pages.
+
+        Args:
+            table_name: Table to read
+            filters: Column equality filters; None values are ignored
+            skip: Rows to skip (offset paging; ignored with a cursor)
+            limit: Page size
+            cursor: next_cursor from the previous page
+            count: 'exact', 'planned' or 'estimated' total row count, or None for no count
+
+        Returns:
+            {'items': rows, 'total': count or None, 'has_more': bool, 'next_cursor': str or None}
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        response = self._list_page_request(self.client, table_name, filters, skip, limit, cursor, count).execute()
+        return self._page_result(response, limit)
+
     # Utility methods
     def delete_case(self, docket_number: str) -> bool:
         """Delete a case (cascades to defendants and skip trace records)"""
@@ -263,53 +784,52 @@ class DatabaseConnector:
 
     def get_town_skip_trace_stats(self, town: str) -> Dict:
         """Get skip trace statistics for a town
+
+        One row of town_stats, kept current by triggers on every write.
+
         Returns:
             - total_cases: Total unique docket numbers for the town
             - traced_cases: Number of cases that have been skip traced
             - untraced_cases: Number of cases not yet skip traced
+            - total_defendants, total_phones: Row counts for the town
+            - sandbox_traced_cases, total_sandbox_phones: The same for sandbox skip traces
         """
         try:
-            # Get all cases for the town
-            cases = self.get_cases_by_town(town)
-            docket_numbers = list(set(case['docket_number'] for case in cases))
-            total_cases = len(docket_numbers)
-
-            if total_cases == 0:
-                return {
-                    'town': town,
-                    'scraped': False,
-                    'total_cases': 0,
-                    'traced_cases': 0,
-                    'untraced_cases': 0
-                }
-
-            # Get skip traces for these docket numbers
-            traced_dockets = set()
-            for docket in docket_numbers:
-                skiptraces = self.get_skiptraces_by_docket(docket)
-                if skiptraces:
-                    traced_dockets.add(docket)
-
-            traced_cases = len(traced_dockets)
-            untraced_cases = total_cases - traced_cases
-
-            return {
-                'town': town,
-                'scraped': True,
-                'total_cases': total_cases,
-                'traced_cases': traced_cases,
-                'untraced_cases': untraced_cases
-            }
+            response = self.client.table(TOWN_STATS_TABLE).select("*").eq('town', town).execute()
+            if not response.data:
+                return self._town_stats_row({'town': town})
+            return self._town_stats_row(response.data[0])
         except Exception as e:
             logger.error(f"Error getting town skip trace stats: {str(e)}")
-            return {
-                'town': town,
-                'scraped': False,
-                'total_cases': 0,
-                'traced_cases': 0,
-                'untraced_cases': 0,
-                'error': str(e)
-            }
+            stats = self._town_stats_row({'town': town})
+            stats['error'] = str(e)
+            return stats
+
+    def get_all_town_skip_trace_stats(self) -> List[Dict]:
+        """Get skip trace statistics for every scraped town in one request, by town name"""
+        try:
+            response = self.client.table(TOWN_STATS_TABLE).select("*").gt('total_cases', 0).order('town').execute()
+            return [self._town_stats_row(row) for row in response.data or []]
+        except Exception as e:
+            logger.error(f"Error getting skip trace stats for all towns: {e}")
+            return []
+
+    @staticmethod
+    def _town_stats_row(row: Dict) -> Dict:
+        """Shape a town_stats row (or a town without cases) as the stats dict"""
+        total_cases = row.get('total_cases') or 0
+        traced_cases = row.get('traced_cases') or 0
+        return {
+            'town': row['town'],
+            'scraped': total_cases > 0,
+            'total_cases': total_cases,
+            'traced_cases': traced_cases,
+            'untraced_cases': total_cases - traced_cases,
+            'total_defendants': row.get('total_defendants') or 0,
+            'total_phones': row.get('total_phones') or 0,
+            'sandbox_traced_cases': row.get('sandbox_traced_cases') or 0,
+            'total_sandbox_phones': row.get('total_sandbox_phones') or 0
+        }
 
     # Skip trace status checking methods
     def has_been_skip_traced(self, docket_number: str, is_sandbox: bool = False) -> bool:
@@ -335,6 +855,8 @@ class DatabaseConnector:
                                cost_per_lookup: float = 0.07, is_sandbox: bool = False) -> Optional[Dict]:
         """Record the cost of a skip trace operation
 
+        Adds lookup_count to the docket's running total in one atomic request.
+
         Args:
             docket_number: The docket number
             lookup_count: Number of lookups performed
@@ -342,85 +864,181 @@ class DatabaseConnector:
             is_sandbox: Whether this was a sandbox operation
 
         Returns:
-            The created cost record or None
+            The docket's cost record after the increment, or None
+        """
+        records = self.record_skip_trace_costs({docket_number: lookup_count}, cost_per_lookup, is_sandbox)
+        return records[0] if records else None
+
+    def record_skip_trace_costs(self, lookup_counts: Dict[str, int], cost_per_lookup: float = 0.07,
+                                is_sandbox: bool = False) -> Optional[List[Dict]]:
+        """Add lookup counts for many dockets to their cost records in one call
+
+        The increment runs server-side (increment_skip_trace_costs), so
+        concurrent workers cannot overwrite each other's counts; the same
+        statement appends each docket's lookups to the dated spend ledger.
+
+        Args:
+            lookup_counts: {docket_number: lookups to add}; zero counts are skipped
+
+        Returns:
+            The updated cost records, or None if the request failed
         """
+        deltas = self._cost_deltas(lookup_counts, cost_per_lookup, is_sandbox)
+        if not deltas:
+            return []
         try:
-            cost_data = {
-                'docket_number': docket_number,
-                'lookup_count': lookup_count,
-                'cost_per_lookup': cost_per_lookup,
-                'is_sandbox': is_sandbox
-            }
-            response = self.client.table('skiptrace_costs').insert(cost_data).execute()
-            logger.info(f"Recorded skip trace cost for {docket_number}: ${lookup_count * cost_per_lookup:.2f}")
-            return response.data[0] if response.data else None
+            response = self.client.rpc(COST_INCREMENT_RPC, {'deltas': deltas}).execute()
+            total = sum(delta['lookup_count'] for delta in deltas)
+            logger.info(f"Recorded skip trace cost for {len(deltas)} dockets: "
+                        f"{total} lookups, ${total * cost_per_lookup:.2f}")
+            return response.data or []
         except Exception as e:
-            # Try to update existing record if unique constraint violated
-            if 'duplicate key' in str(e).lower():
-                try:
-                    # Get existing record
-                    existing = self.client.table('skiptrace_costs').select("*").eq('docket_number', docket_number).eq('is_sandbox', is_sandbox).execute()
-                    if existing.data:
-                        current_count = existing.data[0]['lookup_count']
-                        # Update with new count
-                        response = self.client.table('skiptrace_costs').update({
-                            'lookup_count': current_count + lookup_count
-                        }).eq('docket_number', docket_number).eq('is_sandbox', is_sandbox).execute()
-                        logger.info(f"Updated skip trace cost for {docket_number}: added {lookup_count} lookups")
-                        return response.data[0] if response.data else None
-                except Exception as update_e:
-                    logger.error(f"Error updating skip trace cost: {update_e}")
-            else:
-                logger.error(f"Error recording skip trace cost: {e}")
+            logger.error(f"Error recording skip trace costs: {e}")
             return None
 
-    def get_skip_trace_costs(self, town: str = None, is_sandbox: Optional[bool] = None) -> Dict[str, Any]:
-        """Get skip trace cost summary
+    @staticmethod
+    def _cost_deltas(lookup_counts: Dict[str, int], cost_per_lookup: float, is_sandbox: bool) -> List[Dict]:
+        """increment_skip_trace_costs arguments; zero counts are left out"""
+        return [
+            {'docket_number': docket, 'lookup_count': count, 'cost_per_lookup': cost_per_lookup,
+             'is_sandbox': is_sandbox}
+            for docket, count in lookup_counts.items() if count
+        ]
+
+    def get_skip_trace_spend(self, since: datetime, is_sandbox: bool = False) -> float:
+        """Total dollars billed since a point in time, summed in the database
+
+        The ledger gets a row per docket with every record_skip_trace_costs
+        call. Returns infinity when the ledger cannot be read, so budget checks
+        fail closed instead of spending blind.
+        """
+        try:
+            response = self.client.rpc(SPEND_TOTAL_RPC, {
+                'p_since': since.isoformat(),
+                'p_is_sandbox': is_sandbox
+            }).execute()
+            return float(response.data or 0)
+        except Exception as e:
+            logger.error(f"Error reading skip trace spend: {e}")
+            return float('inf')
+
+    def get_skip_trace_hit_rates(self, is_sandbox: bool = False) -> Dict[str, Dict[str, int]]:
+        """Per-town count of paid-for dockets and how many of them returned phones
+
+        Grouped by town in the database (skip_trace_hit_rates).
+
+        Returns:
+            {town: {'traced': n, 'hits': m}}; empty when the history cannot be read
+        """
+        try:
+            response = self.client.rpc(HIT_RATES_RPC, {'p_is_sandbox': is_sandbox}).execute()
+            return self._hit_rates(response.data or [])
+        except Exception as e:
+            logger.error(f"Error reading skip trace hit rates: {e}")
+            return {}
+
+    @staticmethod
+    def _hit_rates(rows: List[Dict]) -> Dict[str, Dict[str, int]]:
+        """Shape skip_trace_hit_rates rows as {town: {'traced', 'hits'}}"""
+        return {row['town']: {'traced': row['traced'], 'hits': row['hits']} for row in rows}
+
+    # Review queue for addresses held back by the eligibility screen
+    def queue_addresses_for_review(self, rows: List[Dict[str, Any]]) -> List[Dict]:
+        """Add held addresses to the review queue
 
         Args:
-            town: Optional town filter
-            is_sandbox: Optional filter for sandbox/production (None = both)
+            rows: Dicts with docket_number, defendant_name, address, reason and score.
+                An address already queued for the same defendant is left as is.
 
         Returns:
-            Dictionary with cost statistics
+            Newly queued records
         """
+        if not rows:
+            return []
         try:
-            query = self.client.table('skiptrace_costs').select("*")
+            response = self._upsert_request(self.client, REVIEW_QUEUE_TABLE, rows, REVIEW_QUEUE_KEY,
+                                            ignore_duplicates=True).execute()
+            logger.info(f"Queued {len(rows)} address(es) for review")
+            return response.data if response.data else []
+        except Exception as e:
+            logger.error(f"Error queueing addresses for review: {e}")
+            return []
 
-            if is_sandbox is not None:
-                query = query.eq('is_sandbox', is_sandbox)
+    def get_review_queue(self, status: str = 'pending', limit: int = 100) -> List[Dict]:
+        """Held addresses awaiting review, oldest first"""
+        try:
+            response = self.client.table(REVIEW_QUEUE_TABLE).select("*").eq(
+                'status', status
+            ).order('created_at').limit(limit).execute()
+            return response.data if response.data else []
+        except Exception as e:
+            logger.error(f"Error fetching review queue: {e}")
+            return []
 
-            response = query.execute()
-            costs = response.data if response.data else []
+    def get_skip_trace_costs(self, town: str = None, is_sandbox: Optional[bool] = None,
+                             since: Optional[datetime] = None, until: Optional[datetime] = None,
+                             details_limit: int = 0, details_offset: int = 0) -> Dict[str, Any]:
+        """Get skip trace cost summary
 
-            # If town filter, need to join with cases
-            if town and costs:
-                case_dockets = self.get_cases_by_town(town)
-                town_dockets = {c['docket_number'] for c in case_dockets}
-                costs = [c for c in costs if c['docket_number'] in town_dockets]
+        Totals and the per-environment, per-town and per-day breakdowns are
+        aggregated server-side (skip_trace_cost_summary), so the response does
+        not grow with the cost tables. A date range and the per-day rows come
+        from the spend ledger, which every record_skip_trace_costs call writes;
+        costs recorded before the ledger existed only count in all-time totals.
 
-            # Calculate totals
-            total_lookups = sum(c['lookup_count'] for c in costs)
-            total_cost = sum(c['lookup_count'] * c['cost_per_lookup'] for c in costs)
+        Args:
+            town: Optional town filter
+            is_sandbox: Optional filter for sandbox/production (None = both)
+            since: Optional start of a date range (inclusive)
+            until: Optional end of a date range (exclusive)
+            details_limit: Per-docket cost rows to include (0 = none)
+            details_offset: Rows of details to skip
 
-            return {
-                'total_cases': len(costs),
-                'total_lookups': total_lookups,
-                'total_cost': total_cost,
-                'average_lookups_per_case': total_lookups / len(costs) if costs else 0,
-                'cost_per_lookup': 0.07,
-                'details': costs
-            }
+        Returns:
+            Dictionary with cost statistics
+        """
+        params = self._cost_params(town, is_sandbox)
+        try:
+            response = self.client.rpc(COST_SUMMARY_RPC, {
+                **params,
+                'p_since': since.isoformat() if since else None,
+                'p_until': until.isoformat() if until else None
+            }).execute()
+            summary = response.data or {}
+            details = []
+            if details_limit > 0:
+                details = self.client.rpc(COST_DETAILS_RPC, {
+                    **params, 'p_limit': details_limit + 1, 'p_offset': details_offset
+                }).execute().data or []
+            return self._cost_summary(summary, details, details_limit)
         except Exception as e:
             logger.error(f"Error getting skip trace costs: {e}")
-            return {
-                'total_cases': 0,
-                'total_lookups': 0,
-                'total_cost': 0,
-                'average_lookups_per_case': 0,
-                'cost_per_lookup': 0.07,
-                'details': []
-            }
+            return self._cost_summary({}, [], details_limit)
+
+    @staticmethod
+    def _cost_params(town: Optional[str], is_sandbox: Optional[bool]) -> Dict[str, Any]:
+        """Filter arguments shared by the cost summary and details RPCs"""
+        return {'p_town': town, 'p_is_sandbox': is_sandbox}
+
+    @staticmethod
+    def _cost_summary(summary: Dict, details: List[Dict], details_limit: int) -> Dict[str, Any]:
+        """Shape a skip_trace_cost_summary document; details holds up to details_limit + 1 rows"""
+        total_cases = summary.get('total_cases') or 0
+        total_lookups = summary.get('total_lookups') or 0
+        total_cost = float(summary.get('total_cost') or 0)
+        return {
+            'total_cases': total_cases,
+            'total_lookups': total_lookups,
+            'total_cost': total_cost,
+            'average_lookups_per_case': total_lookups / total_cases if total_cases else 0,
+            # Recorded prices vary (sandbox lookups are free), so this is the average
+            'cost_per_lookup': total_cost / total_lookups if total_lookups else 0.0,
+            'by_environment': summary.get('by_environment') or [],
+            'by_town': summary.get('by_town') or [],
+            'by_day': summary.get('by_day') or [],
+            'details': details[:details_limit],
+            'details_has_more': len(details) > details_limit
+        }
 
     # Sandbox-specific helper methods
     def clear_sandbox_skiptraces(self, docket_number: str = None) -> bool:
@@ -463,7 +1081,8 @@ class DatabaseConnector:
                     'docket_number': record['docket_number'],
                     'phone_number': record['phone_number'],
                     'phone_type': record.get('phone_type'),
-                    'api_response': record.get('api_response')
+                    'api_response': record.get('api_response'),
+                    'response_hash': record.get('response_hash')
                 }
                 production_data.append(data)
 
@@ -475,4 +1094,31 @@ class DatabaseConnector:
             return False
         except Exception as e:
             logger.error(f"Error copying sandbox to production: {e}")
-            return False
\ No newline at end of file
+            return False
+
+
+_database: Optional[DatabaseConnector] = None
+_database_lock = threading.Lock()
+_write_buffer_lock = threading.Lock()
+
+
+def get_database() -> DatabaseConnector:
+    """Return the process-wide DatabaseConnector
+
+    The Supabase client and its keep-alive HTTP connection pool are created
+    on first use and shared by every request and thread after that.
+    """
+    global _database
+    with _database_lock:
+        if _database is None:
+            _database = DatabaseConnector()
+        return _database
+
+
+def close_database() -> None:
+    """Close the process-wide connector; the next get_database() builds a new one"""
+    global _database
+    with _database_lock:
+        database, _database = _database, None
+    if database is not None:
+        database.close()
@@ -61,6 +61,7 @@ class SkipTrace:
     docket_number: str
     phone_number: str
     phone_type: Optional[str] = None
+    response_hash: Optional[str] = None  # Key into skiptrace_responses (raw API payload)
     id: Optional[int] = None
     created_at: Optional[datetime] = None
 
@@ -72,6 +73,8 @@ class SkipTrace:
         }
         if self.phone_type:
             data['phone_type'] = self.phone_type
+        if self.response_hash:
+            data['response_hash'] = self.response_hash
         return data
 
 @dataclass
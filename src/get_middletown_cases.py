@@ -1,7 +1,8 @@
 import csv
 import time
 from case_scraper import CaseScraper
-from batch_api_connector import BatchAPIConnector
+from connector_registry import get_connector_registry
+from address_eligibility import AddressEligibility
 
 def main():
     print("="*60)
@@ -23,7 +24,8 @@ def main():
     
     # Step 2: Get phone numbers from BatchData API
     print("\n[Step 2] Fetching phone numbers from BatchData API...")
-    connector = BatchAPIConnector('prod')
+    connector = get_connector_registry().get_connector('prod', use_cache=False)
+    eligibility = AddressEligibility()
     
     enriched_cases = []
     for i, case in enumerate(cases, 1):
@@ -31,9 +33,10 @@ def main():
         print(f"  Case: {case['case_name']}")
         print(f"  Address: {case['address']}")
         
-        # Skip if address is unclear
-        if "See Clerk" in case['address'] or not case['address']:
-            print("  Skipping - invalid address")
+        # Skip addresses the eligibility screen says cannot match
+        verdict = eligibility.evaluate(case['address'], town='Middletown')
+        if not verdict.eligible:
+            print(f"  Skipping - {verdict.reason}")
             enriched_case = case.copy()
             enriched_case['phone_numbers'] = ''
             enriched_cases.append(enriched_case)
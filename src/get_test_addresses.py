@@ -1,4 +1,5 @@
 from case_scraper import CaseScraper
+from address_eligibility import AddressEligibility
 import json
 
 scraper = CaseScraper('Middletown')
@@ -7,9 +8,10 @@ cases = scraper.scrape_cases()
 if cases and len(cases) >= 2:
     # Get first two addresses for Phase 6 testing
     test_addresses = []
+    eligibility = AddressEligibility()
     for case in cases[:2]:
         address_str = case.get('address', '')
-        if address_str and "See Clerk" not in address_str:
+        if eligibility.evaluate(address_str, town='Middletown').eligible:
             # Parse the address (simplified)
             test_addresses.append({
                 'street': address_str,
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Load test the skip trace lookup path against the local BatchData stand-in server
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from batchdata_stub_server import StubConfig, LATENCY_DISTRIBUTIONS, start_in_thread
+from batch_api_connector import BatchAPIConnector, DEFAULT_BATCH_SIZE
+from async_batch_api_connector import AsyncBatchAPIConnector, DEFAULT_MAX_CONCURRENCY
+from rate_governor import RateGovernor
+from request_hedger import RequestHedger
+
+
+def make_addresses(count):
+    """Distinct synthetic Connecticut addresses"""
+    towns = ['Middletown', 'Hartford', 'New Haven', 'Bridgeport', 'Waterbury']
+    streets = ['Main St', 'Elm St', 'Washington Ave', 'Oak Ridge Dr', 'Pine Hill Rd']
+    return [{
+        'street': f"{i // len(streets) + 1} {streets[i % len(streets)]}",
+        'city': towns[i % len(towns)],
+        'state': 'CT',
+        'zip': f"06{400 + i % 100:03d}"
+    } for i in range(count)]
+
+
+def run_sync(connector, addresses, hedge=False):
+    return connector.lookup_batch(addresses, bypass_cache=True, hedge=hedge)
+
+
+async def run_async(connector, addresses, hedge=False):
+    try:
+        return await connector.lookup_batch(addresses, bypass_cache=True, hedge=hedge)
+    finally:
+        await connector.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test skip trace lookups against the stand-in server')
+    parser.add_argument('--url', help='Skip-trace URL of a running stand-in server (default: start one in-process)')
+    parser.add_argument('--addresses', type=int, default=1000, help='Number of distinct addresses to look up')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--async', dest='use_async', action='store_true', help='Use AsyncBatchAPIConnector')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY)
+    parser.add_argument('--client-rate', type=float, default=1000.0, help='Rate governor requests per second')
+    parser.add_argument('--latency-ms', type=float, default=50.0)
+    parser.add_argument('--latency-distribution', choices=LATENCY_DISTRIBUTIONS, default='lognormal')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='Server requests per second before 429')
+    parser.add_argument('--max-batch-size', type=int, default=100)
+    parser.add_argument('--hedge', action='store_true', help='Hedge slow requests and report p99 with and without')
+    parser.add_argument('--hedge-percentile', type=float, default=95.0)
+    parser.add_argument('--max-hedges-per-minute', type=int, default=10000)
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if not url:
+        server, url = start_in_thread(StubConfig(
+            latency_ms=args.latency_ms,
+            latency_distribution=args.latency_distribution,
+            error_rate=args.error_rate,
+            rate_limit=args.rate_limit,
+            max_batch_size=args.max_batch_size
+        ))
+
+    governor = RateGovernor(rate_per_second=args.client_rate, burst=max(int(args.client_rate), 1))
+    hedger = RequestHedger(hedge_percentile=args.hedge_percentile, max_hedges_per_minute=args.max_hedges_per_minute,
+                           default_delay=args.latency_ms * 3 / 1000.0)
+    addresses = make_addresses(args.addresses)
+
+    start = time.perf_counter()
+    if args.use_async:
+        connector = AsyncBatchAPIConnector('local', batch_size=args.batch_size, base_url=url, governor=governor,
+                                           hedger=hedger, max_concurrency=args.concurrency)
+        results = asyncio.run(run_async(connector, addresses, args.hedge))
+    else:
+        connector = BatchAPIConnector('local', batch_size=args.batch_size, base_url=url, governor=governor,
+                                      hedger=hedger)
+        results = run_sync(connector, addresses, args.hedge)
+    elapsed = time.perf_counter() - start
+
+    statuses = Counter(result.status for result in results)
+    print(f"\n{'='*60}")
+    print(f"Load Test Results ({'async' if args.use_async else 'sync'})")
+    print(f"{'='*60}")
+    print(f"Addresses: {len(addresses)} in {elapsed:.2f}s ({len(addresses) / elapsed:.1f} addresses/s)")
+    for status, count in sorted(statuses.items()):
+        print(f"  {status}: {count}")
+    print(f"Connector stats: {connector.get_connection_stats()}")
+    if args.hedge:
+        hedging = hedger.stats()
+        print(f"Hedges sent: {hedging['hedges_sent']} (won {hedging['hedges_won']}, denied {hedging['hedges_denied']})")
+        print(f"p99 latency: {hedging['p99_ms']} ms hedged, {hedging['p99_unhedged_ms']} ms unhedged")
+    if not args.use_async:
+        connector.close()
+
+    if server:
+        print(f"Server counters: {server.state.counters}")
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -11,34 +11,20 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from case_scraper import CaseScraper
-from batch_api_connector import BatchAPIConnector
+from connector_registry import get_connector_registry
 from scraper_db_integration import ScraperDatabaseIntegration
-from db_connector import DatabaseConnector
+from db_connector import PHONE_COLUMNS, get_database
 from skip_trace_integration import SkipTraceIntegration
 from ct_town_scraper import CTTownScraper
+from address_normalizer import normalize_address
 
 
 def parse_address_to_dict(address_str):
     """Parse address string into structured format for API."""
-    parts = address_str.split(',')
-    if len(parts) >= 2:
-        street = parts[0].strip()
-        remainder = parts[1].strip()
-
-        # Split city, state, zip
-        words = remainder.split()
-        if len(words) >= 2:
-            zip_code = words[-1]
-            state = words[-2]
-            city = ' '.join(words[:-2]) if len(words) > 2 else words[0]
-
-            return {
-                'street': street,
-                'city': city,
-                'state': state,
-                'zip': zip_code
-            }
-    return None
+    record = normalize_address(address_str)
+    if not record.street or not (record.city or record.zip):
+        return None
+    return record.to_api_dict()
 
 
 def main():
@@ -79,8 +65,8 @@ def main():
             # Initialize database integration
             integration = ScraperDatabaseIntegration()
 
-            # Test database connection
-            db = DatabaseConnector()
+            # Test database connection (the same client the integrations use)
+            db = get_database()
             if not db.test_connection():
                 print("ERROR: Could not connect to database")
                 print("Please check your Supabase credentials in .env file")
@@ -157,6 +143,7 @@ def main():
                 print("Sample Cases from Database (First 5):")
                 print(f"{'-'*40}")
 
+                sample_defendants = db.get_defendants_by_dockets([case['docket_number'] for case in recent_cases]) or {}
                 for i, case in enumerate(recent_cases, 1):
                     print(f"\nCase {i}:")
                     print(f"  Case Name: {case['case_name']}")
@@ -165,7 +152,7 @@ def main():
                     print(f"  Stored: {case['created_at']}")
 
                     # Get defendants for this case using docket_number
-                    defendants = db.get_defendants_by_docket(case['docket_number'])
+                    defendants = sample_defendants.get(case['docket_number'], [])
                     if defendants:
                         print(f"  Defendants:")
                         for defendant in defendants:
@@ -196,8 +183,13 @@ def main():
                 # Display sample skip trace data
                 if skip_stats['cases_processed'] > 0:
                     cases_with_skiptraces = db.get_cases_by_town(town_name)[:2]
+                    full_cases = db.get_full_cases_data([case['docket_number'] for case in cases_with_skiptraces],
+                                                        include_sandbox=True, skiptrace_columns=PHONE_COLUMNS)
+                    if full_cases is None:
+                        print("\nCould not load the stored skip trace records")
+                        full_cases = {}
                     for case in cases_with_skiptraces:
-                        full_case = db.get_full_case_data(case['docket_number'], include_sandbox=True)
+                        full_case = full_cases.get(case['docket_number'], {})
                         skiptraces = full_case.get('skiptraces_sandbox' if not use_production else 'skiptraces', [])
                         if skiptraces:
                             print(f"\nCase: {case['case_name']}")
@@ -249,7 +241,7 @@ def main():
                 print(f"{'='*60}")
 
                 # Initialize the batch API connector
-                api_connector = BatchAPIConnector(api_env)
+                api_connector = get_connector_registry().get_connector(api_env, use_cache=False)
 
                 # Process first 2 cases for phone lookup (as per requirements)
                 cases_to_process = cases[:2]
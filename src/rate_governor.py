@@ -0,0 +1,222 @@
+"""
+Rate governor for BatchData API calls
+Token bucket pacing, 429 Retry-After handling and a circuit breaker
+"""
+
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+# Defaults sized to the BatchData plan; override with BATCHDATA_RATE_LIMIT / BATCHDATA_BURST
+DEFAULT_RATE_PER_SECOND = 5.0
+DEFAULT_BURST = 10
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 60.0
+DEFAULT_THROTTLE_RETRIES = 3
+# Wait used when a 429 arrives without a usable Retry-After header
+DEFAULT_THROTTLE_BACKOFF = 2.0
+
+# Rejected credentials; a configuration problem, not an upstream outage
+AUTH_STATUS_CODES = (401, 403)
+
+CIRCUIT_CLOSED = 'closed'
+CIRCUIT_OPEN = 'open'
+CIRCUIT_HALF_OPEN = 'half_open'
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class BatchDataAuthError(Exception):
+    """BatchData rejected the API token (401/403)
+
+    Raised to the caller instead of being counted as a failure, so a bad
+    token does not open the circuit and look like an outage.
+    """
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"HTTP {status_code}: {message}")
+        self.status_code = status_code
+
+
+class RateGovernor:
+    """Paces requests with a token bucket and stops calling a failing API
+
+    The governor never sleeps itself: reserve() returns how long the caller
+    must wait, so the same instance serves thread-based and asyncio callers.
+    """
+
+    def __init__(self, rate_per_second: float = DEFAULT_RATE_PER_SECOND, burst: int = DEFAULT_BURST,
+                 failure_threshold: int = DEFAULT_FAILURE_THRESHOLD, reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+                 max_throttle_retries: int = DEFAULT_THROTTLE_RETRIES):
+        """
+        Args:
+            rate_per_second: Sustained requests per second allowed by the plan
+            burst: Requests that may be sent back-to-back after an idle period
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a probe request
+            max_throttle_retries: Times a throttled request is resent after waiting
+        """
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_throttle_retries = max_throttle_retries
+
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+
+        self._state = CIRCUIT_CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+        self.requests_admitted = 0
+        self.throttled = 0
+        self.failures = 0
+        self.auth_errors = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+
+    @classmethod
+    def from_env(cls) -> 'RateGovernor':
+        """Build a governor from BATCHDATA_RATE_LIMIT and BATCHDATA_BURST"""
+        rate = os.environ.get('BATCHDATA_RATE_LIMIT')
+        burst = os.environ.get('BATCHDATA_BURST')
+        return cls(
+            rate_per_second=float(rate) if rate else DEFAULT_RATE_PER_SECOND,
+            burst=int(burst) if burst else DEFAULT_BURST
+        )
+
+    @property
+    def state(self) -> str:
+        """Current circuit state"""
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> str:
+        if self._state == CIRCUIT_OPEN and now - self._opened_at >= self.reset_timeout:
+            self._state = CIRCUIT_HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Return False while the circuit is open
+
+        In the half-open state a single probe request is let through; its
+        outcome closes or re-opens the circuit.
+        """
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == CIRCUIT_CLOSED:
+                return True
+            if state == CIRCUIT_HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def reserve(self) -> float:
+        """Take a token and return the seconds to wait before sending
+
+        Tokens may go negative; the wait then covers the time needed to
+        earn them back, so concurrent callers are spread out evenly.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate_per_second)
+            self._last_refill = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate_per_second if self._tokens < 0 else 0.0
+            wait = max(wait, self._blocked_until - now)
+            self.requests_admitted += 1
+            self.total_wait += wait
+            return wait
+
+    def try_reserve(self) -> bool:
+        """Take a token only if one is available right now
+
+        For optional requests (such as hedges) that should be dropped rather
+        than delayed when the plan limit is reached.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate_per_second)
+            self._last_refill = now
+            if self._tokens < 1 or self._blocked_until > now:
+                return False
+            self._tokens -= 1
+            self.requests_admitted += 1
+            return True
+
+    def record_success(self) -> None:
+        """A request succeeded; close the circuit"""
+        with self._lock:
+            self._consecutive_failures = 0
+            self._state = CIRCUIT_CLOSED
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """A request failed; open the circuit after repeated failures"""
+        with self._lock:
+            self.failures += 1
+            self._consecutive_failures += 1
+            now = time.monotonic()
+            if self._current_state(now) == CIRCUIT_HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                self._state = CIRCUIT_OPEN
+                self._opened_at = now
+                self._probe_in_flight = False
+
+    def record_auth_error(self) -> None:
+        """The API rejected the credentials; free a half-open probe without counting a failure"""
+        with self._lock:
+            self.auth_errors += 1
+            self._probe_in_flight = False
+
+    def record_throttle(self, retry_after: Optional[float] = None) -> float:
+        """The API answered 429; hold every caller until Retry-After has passed
+
+        Returns:
+            Seconds the governor is blocked for
+        """
+        delay = retry_after if retry_after is not None else DEFAULT_THROTTLE_BACKOFF
+        with self._lock:
+            self.throttled += 1
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+            # Drain the bucket so requests resume at the sustained rate, not a burst
+            self._tokens = min(self._tokens, 0.0)
+            self._probe_in_flight = False
+            return delay
+
+    def stats(self) -> Dict[str, float]:
+        """Return counters and circuit state"""
+        with self._lock:
+            now = time.monotonic()
+            return {
+                'state': self._current_state(now),
+                'rate_per_second': self.rate_per_second,
+                'burst': self.burst,
+                'requests_admitted': self.requests_admitted,
+                'throttled': self.throttled,
+                'failures': self.failures,
+                'auth_errors': self.auth_errors,
+                'rejected': self.rejected,
+                'total_wait_seconds': round(self.total_wait, 3),
+                'blocked_for_seconds': round(max(self._blocked_until - now, 0.0), 3)
+            }
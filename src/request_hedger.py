@@ -0,0 +1,131 @@
+"""
+Hedged requests for interactive skip trace lookups
+Tracks BatchData latency and decides when a slow request gets a duplicate
+"""
+
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, Optional
+
+# Send the duplicate once the primary is slower than this share of past requests
+DEFAULT_HEDGE_PERCENTILE = 95.0
+# Every hedge is a second billed lookup, so they are capped per minute
+DEFAULT_MAX_HEDGES_PER_MINUTE = 10
+# Delay used until enough latencies have been observed for a percentile
+DEFAULT_HEDGE_DELAY = 2.0
+DEFAULT_MIN_SAMPLES = 20
+DEFAULT_WINDOW = 1000
+
+
+def percentile(samples: Iterable[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile, or None without samples"""
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    rank = max(math.ceil(pct / 100.0 * len(ordered)), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class RequestHedger:
+    """Hedge policy and latency bookkeeping shared by sync and async connectors
+
+    The connector sends the request, waits hedge_delay() seconds and, if no
+    response has arrived and try_hedge() allows it, sends the same request
+    again; whichever answers first wins. Latency is tracked twice: the
+    primary request alone (what callers would see without hedging) and the
+    winning response (what they see with it).
+    """
+
+    def __init__(self, hedge_percentile: float = DEFAULT_HEDGE_PERCENTILE,
+                 max_hedges_per_minute: int = DEFAULT_MAX_HEDGES_PER_MINUTE,
+                 default_delay: float = DEFAULT_HEDGE_DELAY, min_samples: int = DEFAULT_MIN_SAMPLES,
+                 window: int = DEFAULT_WINDOW):
+        """
+        Args:
+            hedge_percentile: Primary latency percentile after which a hedge is sent
+            max_hedges_per_minute: Hard cap on duplicates sent in any 60 second window
+            default_delay: Hedge delay in seconds until min_samples latencies are known
+            min_samples: Latencies needed before the percentile is trusted
+            window: Most recent latencies kept per series
+        """
+        self.hedge_percentile = hedge_percentile
+        self.max_hedges_per_minute = max_hedges_per_minute
+        self.default_delay = default_delay
+        self.min_samples = min_samples
+
+        self._lock = threading.Lock()
+        self._primary = deque(maxlen=window)
+        self._effective = deque(maxlen=window)
+        self._hedge_times = deque()
+
+        self.requests = 0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self.hedges_denied = 0
+
+    @classmethod
+    def from_env(cls) -> 'RequestHedger':
+        """Build a hedger from BATCHDATA_HEDGE_PERCENTILE and BATCHDATA_MAX_HEDGES_PER_MINUTE"""
+        pct = os.environ.get('BATCHDATA_HEDGE_PERCENTILE')
+        cap = os.environ.get('BATCHDATA_MAX_HEDGES_PER_MINUTE')
+        return cls(
+            hedge_percentile=float(pct) if pct else DEFAULT_HEDGE_PERCENTILE,
+            max_hedges_per_minute=int(cap) if cap else DEFAULT_MAX_HEDGES_PER_MINUTE
+        )
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait on the primary before hedging"""
+        with self._lock:
+            if len(self._primary) < self.min_samples:
+                return self.default_delay
+            return percentile(self._primary, self.hedge_percentile)
+
+    def try_hedge(self) -> bool:
+        """Take a hedge from the per-minute allowance; False once it is used up"""
+        with self._lock:
+            now = time.monotonic()
+            while self._hedge_times and now - self._hedge_times[0] >= 60.0:
+                self._hedge_times.popleft()
+            if len(self._hedge_times) >= self.max_hedges_per_minute:
+                self.hedges_denied += 1
+                return False
+            self._hedge_times.append(now)
+            self.hedges_sent += 1
+            return True
+
+    def record_primary(self, latency: float) -> None:
+        """Latency of a primary request, whether or not it won"""
+        with self._lock:
+            self._primary.append(latency)
+
+    def record(self, latency: float, hedge_won: bool = False) -> None:
+        """Latency the caller saw for one hedge-enabled request"""
+        with self._lock:
+            self.requests += 1
+            self._effective.append(latency)
+            if hedge_won:
+                self.hedges_won += 1
+
+    def stats(self) -> Dict[str, object]:
+        """Hedge counters and p50/p99 latency in ms with and without hedging"""
+        def ms(value):
+            return round(value * 1000, 1) if value is not None else None
+
+        with self._lock:
+            primary = list(self._primary)
+            effective = list(self._effective)
+            return {
+                'requests': self.requests,
+                'hedges_sent': self.hedges_sent,
+                'hedges_won': self.hedges_won,
+                'hedges_denied': self.hedges_denied,
+                'hedge_delay_ms': ms(self.default_delay if len(primary) < self.min_samples
+                                     else percentile(primary, self.hedge_percentile)),
+                'p50_ms': ms(percentile(effective, 50)),
+                'p99_ms': ms(percentile(effective, 99)),
+                'p50_unhedged_ms': ms(percentile(primary, 50)),
+                'p99_unhedged_ms': ms(percentile(primary, 99))
+            }
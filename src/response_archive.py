@@ -0,0 +1,77 @@
+"""
+Compressed, deduplicated archive of raw BatchData responses
+Payloads are stored once in skiptrace_responses keyed by content hash and
+referenced from skiptrace rows through response_hash
+"""
+
+import base64
+import hashlib
+import json
+import zlib
+from functools import cached_property
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+RESPONSES_TABLE = 'skiptrace_responses'
+COMPRESSION_LEVEL = 9
+
+
+def canonical_json(payload: Any) -> bytes:
+    """Serialize a payload so equal responses produce identical bytes"""
+    return json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def encode_payload(payload: Any) -> Tuple[str, str, int]:
+    """Hash and compress a payload
+
+    Returns:
+        (response_hash, compressed base64 text, uncompressed size in bytes)
+    """
+    data = canonical_json(payload)
+    response_hash = hashlib.sha256(data).hexdigest()
+    compressed = base64.b64encode(zlib.compress(data, COMPRESSION_LEVEL)).decode('ascii')
+    return response_hash, compressed, len(data)
+
+
+def decode_payload(compressed: str) -> Any:
+    """Inverse of encode_payload"""
+    return json.loads(zlib.decompress(base64.b64decode(compressed)).decode('utf-8'))
+
+
+def build_archive_rows(payloads: Iterable[Any]) -> Tuple[List[Optional[str]], List[Dict[str, Any]]]:
+    """Prepare skiptrace_responses rows for a batch of payloads
+
+    Returns:
+        (hash per payload (None for empty payloads), distinct rows to insert)
+    """
+    hashes = []
+    rows = {}
+    for payload in payloads:
+        if not payload:
+            hashes.append(None)
+            continue
+        response_hash, compressed, size = encode_payload(payload)
+        hashes.append(response_hash)
+        if response_hash not in rows:
+            rows[response_hash] = {
+                'response_hash': response_hash,
+                'payload': compressed,
+                'raw_size': size,
+                'compressed_size': len(compressed)
+            }
+    return hashes, list(rows.values())
+
+
+class ArchivedResponse:
+    """Archived payload that is only decompressed when .payload is read"""
+
+    def __init__(self, response_hash: str, compressed: str, raw_size: Optional[int] = None):
+        self.response_hash = response_hash
+        self.compressed = compressed
+        self.raw_size = raw_size
+
+    @cached_property
+    def payload(self) -> Any:
+        return decode_payload(self.compressed)
+
+    def __repr__(self) -> str:
+        return f"ArchivedResponse({self.response_hash[:12]}, {len(self.compressed)} bytes compressed)"
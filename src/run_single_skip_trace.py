@@ -8,7 +8,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from skip_trace_integration import SkipTraceIntegration
-from db_connector import DatabaseConnector
+from db_connector import PHONE_COLUMNS, get_database
 import argparse
 
 def main():
@@ -16,11 +16,12 @@ def main():
     parser.add_argument('docket_number', help='Docket number to process')
     parser.add_argument('--prod', action='store_true', help='Use production API (default: sandbox)')
     parser.add_argument('--force', action='store_true', help='Force skip trace even if already done')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore cached results and call the API')
 
     args = parser.parse_args()
 
-    # Initialize database connection
-    db = DatabaseConnector()
+    # Initialize database connection (shared with SkipTraceIntegration)
+    db = get_database()
 
     # Test connection
     if not db.test_connection():
@@ -35,7 +36,7 @@ def main():
     print(f"{'='*60}\n")
 
     # Get case details
-    case = db.get_full_case_data(args.docket_number, include_sandbox=True)
+    case = db.get_full_case_data(args.docket_number, include_sandbox=True, skiptrace_columns=PHONE_COLUMNS)
     if not case:
         print(f"ERROR: Case {args.docket_number} not found in database")
         sys.exit(1)
@@ -65,7 +66,7 @@ def main():
     print(f"{'-'*40}\n")
 
     # Process the case
-    stats = skip_trace.process_case_skip_trace(args.docket_number, force=args.force)
+    stats = skip_trace.process_case_skip_trace(args.docket_number, force=args.force, bypass_cache=args.no_cache)
 
     # Display results
     print(f"\n{'='*60}")
@@ -79,6 +80,8 @@ def main():
     else:
         print(f"Defendants processed: {stats['defendants_processed']}")
         print(f"Addresses processed: {stats['addresses_processed']}")
+        if stats.get('addresses_held'):
+            print(f"Addresses held for review: {stats['addresses_held']}")
         print(f"Phone numbers found: {stats['phone_numbers_found']}")
         print(f"Records stored: {stats['records_stored']}")
 
@@ -95,7 +98,7 @@ def main():
             print(f"  - {error}")
 
     # Get updated case data to show new skip traces
-    updated_case = db.get_full_case_data(args.docket_number, include_sandbox=True)
+    updated_case = db.get_full_case_data(args.docket_number, include_sandbox=True, skiptrace_columns=PHONE_COLUMNS)
 
     if args.prod:
         new_skiptraces = updated_case.get('skiptraces', [])
@@ -10,8 +10,9 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from datetime import datetime
 from typing import List, Dict, Optional
 from case_scraper import CaseScraper
-from db_connector import DatabaseConnector
+from db_connector import get_database
 from db_models import Case, Defendant
+from address_normalizer import normalize_address
 import logging
 
 # Configure logging
@@ -23,28 +24,17 @@ class ScraperDatabaseIntegration:
 
     def __init__(self):
         """Initialize database connection"""
-        self.db = DatabaseConnector()
+        self.db = get_database()
 
     def parse_address(self, address_str: str) -> Dict[str, str]:
         """Parse address string into components"""
-        # Basic parsing - can be enhanced based on actual data format
-        parts = address_str.split(',')
-        result = {
-            'address': address_str,
-            'state': 'CT',  # Default to Connecticut
-            'zip': None
+        record = normalize_address(address_str)
+        return {
+            'address': record.street_line or address_str,
+            'state': record.state,
+            'zip': record.zip or None
         }
 
-        if len(parts) >= 2:
-            result['address'] = parts[0].strip()
-            # Try to extract zip from last part
-            city_zip = parts[-1].strip()
-            zip_parts = city_zip.split()
-            if zip_parts and zip_parts[-1].isdigit() and len(zip_parts[-1]) == 5:
-                result['zip'] = zip_parts[-1]
-
-        return result
-
     def scrape_and_store_cases(self, town: str) -> Dict[str, any]:
         """
         Scrape cases for a town and store them in the database
@@ -79,19 +69,12 @@ class ScraperDatabaseIntegration:
             stats['errors'].append(error_msg)
             return stats
 
-        # Store each case in database
+        # Build every case and defendant row, then store them in bulk
+        case_rows = []
+        defendant_rows = []
         for case_data in cases:
             try:
                 docket_number = case_data['docket_number']
-
-                # Check if case already exists
-                existing_case = self.db.get_case_by_docket(docket_number)
-                if existing_case:
-                    logger.info(f"Case {docket_number} already exists, skipping")
-                    stats['cases_skipped'] += 1
-                    continue
-
-                # Prepare case data (no search_date anymore)
                 case_model = Case(
                     case_name=case_data['case_name'],
                     docket_number=docket_number,
@@ -99,16 +82,6 @@ class ScraperDatabaseIntegration:
                     town=town
                 )
 
-                # Insert case
-                inserted_case = self.db.insert_case(case_model.to_dict())
-                if not inserted_case:
-                    error_msg = f"Failed to insert case {docket_number}"
-                    logger.error(error_msg)
-                    stats['errors'].append(error_msg)
-                    continue
-
-                stats['cases_stored'] += 1
-
                 # Parse address and create defendant
                 address_info = self.parse_address(case_data.get('address', ''))
                 defendant_model = Defendant(
@@ -119,23 +92,26 @@ class ScraperDatabaseIntegration:
                     state=address_info['state'],
                     zip=address_info['zip']
                 )
-
-                # Insert defendant
-                inserted_defendant = self.db.insert_defendant(defendant_model.to_dict())
-                if inserted_defendant:
-                    stats['defendants_stored'] += 1
-                    logger.info(f"Stored case {docket_number} with defendant {defendant_model.name}")
-                else:
-                    error_msg = f"Failed to insert defendant for case {docket_number}"
-                    logger.warning(error_msg)
-                    stats['errors'].append(error_msg)
-
             except Exception as e:
                 error_msg = f"Error processing case {case_data.get('docket_number', 'unknown')}: {e}"
                 logger.error(error_msg)
                 stats['errors'].append(error_msg)
                 continue
 
+            case_rows.append(case_model.to_dict())
+            defendant_rows.append(defendant_model.to_dict())
+
+        result = self.db.bulk_ingest_cases(case_rows, defendant_rows)
+        stats['cases_stored'] = result['cases_inserted']
+        stats['cases_skipped'] = result['cases_existing']
+        stats['defendants_stored'] = result['defendants_inserted']
+        for row in result['cases']:
+            if row['status'] == 'failed':
+                stats['errors'].append(f"Failed to insert case {row['docket_number']}: {row['error']}")
+        for row in result['defendants']:
+            if row['status'] == 'failed':
+                stats['errors'].append(f"Failed to insert defendant for case {row['docket_number']}: {row['error']}")
+
         # Log summary
         logger.info(f"Scraping complete for {town}")
         logger.info(f"Cases found: {stats['cases_found']}")
@@ -148,35 +124,22 @@ class ScraperDatabaseIntegration:
         return stats
 
     def get_town_statistics(self, town: str, include_sandbox: bool = False) -> Dict[str, any]:
-        """Get statistics for cases in a specific town"""
-        cases = self.db.get_cases_by_town(town)
+        """Get statistics for cases in a specific town (one town_stats row)"""
+        town_stats = self.db.get_town_skip_trace_stats(town)
 
         stats = {
             'town': town,
-            'total_cases': len(cases),
-            'total_defendants': 0,
-            'cases_with_skiptraces': 0,
-            'total_skiptraces': 0,
+            'total_cases': town_stats['total_cases'],
+            'total_defendants': town_stats['total_defendants'],
+            'cases_with_skiptraces': town_stats['traced_cases'],
+            'total_skiptraces': town_stats['total_phones'],
             'cases_with_sandbox_skiptraces': 0,
             'total_sandbox_skiptraces': 0
         }
 
-        for case in cases:
-            # Get defendants by docket number
-            defendants = self.db.get_defendants_by_docket(case['docket_number'])
-            stats['total_defendants'] += len(defendants)
-
-            # Get production skip traces by docket number
-            skiptraces = self.db.get_skiptraces_by_docket(case['docket_number'], is_sandbox=False)
-            if skiptraces:
-                stats['cases_with_skiptraces'] += 1
-                stats['total_skiptraces'] += len(skiptraces)
-
-            # Get sandbox skip traces if requested
-            if include_sandbox:
-                sandbox_skiptraces = self.db.get_skiptraces_by_docket(case['docket_number'], is_sandbox=True)
-                if sandbox_skiptraces:
-                    stats['cases_with_sandbox_skiptraces'] += 1
-                    stats['total_sandbox_skiptraces'] += len(sandbox_skiptraces)
+        # Sandbox skip traces if requested
+        if include_sandbox:
+            stats['cases_with_sandbox_skiptraces'] = town_stats['sandbox_traced_cases']
+            stats['total_sandbox_skiptraces'] = town_stats['total_sandbox_phones']
 
         return stats
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+Single-flight coalescing of identical in-flight calls
+The first caller for a key does the work; concurrent callers for the same key share its result
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Hashable, Iterable, List, Tuple
+
+
+class SingleFlight:
+    """Tracks in-flight calls by key
+
+    Futures are concurrent.futures.Future, so thread-based callers block on
+    future.result() and asyncio callers await wait_async(future).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self.leaders = 0
+        self.saved_calls = 0
+
+    def claim(self, keys: Iterable[Hashable]) -> List[Tuple[Future, bool]]:
+        """Register interest in each key
+
+        Returns:
+            One (future, is_leader) pair per key. A leader must later call
+            resolve() or fail() for the key; everyone else waits on the future.
+        """
+        claims = []
+        with self._lock:
+            for key in keys:
+                future = self._calls.get(key)
+                if future is None:
+                    future = Future()
+                    self._calls[key] = future
+                    self.leaders += 1
+                    claims.append((future, True))
+                else:
+                    self.saved_calls += 1
+                    claims.append((future, False))
+        return claims
+
+    def resolve(self, key: Hashable, value: Any) -> None:
+        """Hand the leader's result to every waiter and forget the key"""
+        with self._lock:
+            future = self._calls.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(value)
+
+    def fail(self, key: Hashable, error: BaseException) -> None:
+        """Propagate the leader's exception to every waiter and forget the key"""
+        with self._lock:
+            future = self._calls.pop(key, None)
+        if future is not None and not future.done():
+            future.set_exception(error)
+
+    @staticmethod
+    async def wait_async(future: Future) -> Any:
+        """Await a claim's future from asyncio code"""
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, int]:
+        """Return leader/saved counters and the number of keys in flight"""
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'leader_calls': self.leaders,
+                'saved_calls': self.saved_calls
+            }
+
+
+# Shared by every connector in the process so separate workers coalesce too
+_default_single_flight = SingleFlight()
+
+
+def get_default_single_flight() -> SingleFlight:
+    """Return the process-wide SingleFlight"""
+    return _default_single_flight
@@ -0,0 +1,243 @@
+"""
+Persistent skip trace result cache
+Stores BatchData phone results in a local SQLite file keyed by normalized address
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+import logging
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from address_normalizer import normalize_address_fields
+
+logger = logging.getLogger(__name__)
+
+# Defaults, overridable through environment variables
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  'data', 'skiptrace_cache.sqlite3')
+DEFAULT_TTL_SECONDS = 90 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 100000
+# Hot entries kept in memory so repeated lookups skip SQLite entirely
+DEFAULT_MEMORY_ENTRIES = 5000
+
+
+class SkipTraceCache:
+    """Address-keyed cache of skip trace results with TTL and size-bounded eviction"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, memory_entries: int = DEFAULT_MEMORY_ENTRIES):
+        """Open (or create) the cache file
+
+        Args:
+            path: SQLite file location, or ':memory:'
+            ttl_seconds: Age after which an entry is treated as a miss
+            max_entries: Maximum entries kept; least recently used are evicted
+            memory_entries: Size of the in-process front cache
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._memory: OrderedDict = OrderedDict()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS skiptrace_cache (
+                cache_key TEXT PRIMARY KEY,
+                phones TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_skiptrace_cache_last_accessed ON skiptrace_cache(last_accessed)"
+        )
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM skiptrace_cache").fetchone()[0]
+
+    @staticmethod
+    def make_key(env: str, address: Dict[str, str]) -> str:
+        """Build the cache key for an address in an environment"""
+        record = normalize_address_fields(
+            address.get('street'), address.get('city'), address.get('state'), address.get('zip')
+        )
+        return f"{env}|{record.cache_key}"
+
+    def get(self, env: str, address: Dict[str, str]) -> Optional[List[str]]:
+        """Return cached phone numbers, or None on a miss"""
+        return self.get_many(env, [address])[0]
+
+    def get_many(self, env: str, addresses: Sequence[Dict[str, str]]) -> List[Optional[List[str]]]:
+        """Return cached phone numbers for each address (None for misses)"""
+        now = time.time()
+        keys = [self.make_key(env, address) for address in addresses]
+        results: List[Optional[List[str]]] = [None] * len(keys)
+
+        with self._lock:
+            to_read = []
+            for i, key in enumerate(keys):
+                entry = self._memory.get(key)
+                if entry is not None and now - entry[1] < self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    results[i] = list(entry[0])
+                else:
+                    to_read.append(i)
+
+            if to_read:
+                found = {}
+                unique_keys = list({keys[i] for i in to_read})
+                for start in range(0, len(unique_keys), 500):
+                    chunk = unique_keys[start:start + 500]
+                    rows = self._conn.execute(
+                        f"SELECT cache_key, phones, created_at FROM skiptrace_cache "
+                        f"WHERE cache_key IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    ).fetchall()
+                    for cache_key, phones, created_at in rows:
+                        if now - created_at < self.ttl_seconds:
+                            found[cache_key] = (json.loads(phones), created_at)
+
+                if found:
+                    self._conn.executemany(
+                        "UPDATE skiptrace_cache SET last_accessed = ? WHERE cache_key = ?",
+                        [(now, key) for key in found]
+                    )
+                    self._conn.commit()
+                    for key, entry in found.items():
+                        self._remember(key, entry)
+
+                for i in to_read:
+                    entry = found.get(keys[i])
+                    if entry is not None:
+                        results[i] = list(entry[0])
+
+            hits = sum(1 for result in results if result is not None)
+            self.hits += hits
+            self.misses += len(results) - hits
+
+        return results
+
+    def set(self, env: str, address: Dict[str, str], phones: List[str]) -> None:
+        """Store phone numbers for an address"""
+        self.set_many(env, [address], [phones])
+
+    def set_many(self, env: str, addresses: Sequence[Dict[str, str]], phone_lists: Sequence[List[str]]) -> None:
+        """Store phone numbers for several addresses in one transaction"""
+        now = time.time()
+        rows = {self.make_key(env, address): list(phones) for address, phones in zip(addresses, phone_lists)}
+        if not rows:
+            return
+
+        with self._lock:
+            existing = self._count_existing(list(rows))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO skiptrace_cache (cache_key, phones, created_at, last_accessed) "
+                "VALUES (?, ?, ?, ?)",
+                [(key, json.dumps(phones), now, now) for key, phones in rows.items()]
+            )
+            self._size += len(rows) - existing
+            for key, phones in rows.items():
+                self._remember(key, (phones, now))
+            self._evict()
+            self._conn.commit()
+
+    def _count_existing(self, keys: List[str]) -> int:
+        """Number of keys already stored (used to keep the size counter exact)"""
+        count = 0
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            count += self._conn.execute(
+                f"SELECT COUNT(*) FROM skiptrace_cache WHERE cache_key IN ({','.join('?' * len(chunk))})",
+                chunk
+            ).fetchone()[0]
+        return count
+
+    def _remember(self, key: str, entry) -> None:
+        """Add an entry to the in-memory front cache"""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self) -> None:
+        """Drop expired entries, then least recently used ones beyond max_entries"""
+        if self._size <= self.max_entries:
+            return
+
+        cutoff = time.time() - self.ttl_seconds
+        removed = self._conn.execute("DELETE FROM skiptrace_cache WHERE created_at < ?", (cutoff,)).rowcount
+        overflow = self._size - removed - self.max_entries
+        if overflow > 0:
+            removed += self._conn.execute(
+                "DELETE FROM skiptrace_cache WHERE cache_key IN "
+                "(SELECT cache_key FROM skiptrace_cache ORDER BY last_accessed LIMIT ?)",
+                (overflow,)
+            ).rowcount
+        self._size -= removed
+        self.evictions += removed
+        self._memory.clear()
+
+    def clear(self) -> None:
+        """Remove every cached entry"""
+        with self._lock:
+            self._conn.execute("DELETE FROM skiptrace_cache")
+            self._conn.commit()
+            self._memory.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': self._size,
+            'evictions': self.evictions,
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds
+        }
+
+    def close(self) -> None:
+        """Close the SQLite connection"""
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache: Optional[SkipTraceCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> SkipTraceCache:
+    """Return the process-wide cache configured from the environment
+
+    SKIPTRACE_CACHE_PATH, SKIPTRACE_CACHE_TTL_DAYS and SKIPTRACE_CACHE_MAX_ENTRIES
+    override the defaults.
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            ttl_days = os.environ.get('SKIPTRACE_CACHE_TTL_DAYS')
+            max_entries = os.environ.get('SKIPTRACE_CACHE_MAX_ENTRIES')
+            _default_cache = SkipTraceCache(
+                path=os.environ.get('SKIPTRACE_CACHE_PATH', DEFAULT_CACHE_PATH),
+                ttl_seconds=float(ttl_days) * 24 * 3600 if ttl_days else DEFAULT_TTL_SECONDS,
+                max_entries=int(max_entries) if max_entries else DEFAULT_MAX_ENTRIES
+            )
+        return _default_cache
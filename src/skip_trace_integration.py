@@ -3,14 +3,20 @@ Integration module for BatchData API skip trace with database storage
 Handles phone lookup and storage in Supabase
 """
 
+import asyncio
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from typing import List, Dict, Optional
-from batch_api_connector import BatchAPIConnector
-from db_connector import DatabaseConnector
+from typing import List, Dict, Optional, Tuple
+from batch_api_connector import LOOKUP_THROTTLED
+from async_batch_api_connector import AsyncBatchAPIConnector
+from connector_registry import get_connector_registry
+from address_normalizer import normalize_address
+from address_eligibility import AddressEligibility, HitRates
+from db_connector import PHONE_COLUMNS, get_database
 from db_models import SkipTrace
+from write_behind import FlushResult
 import logging
 import json
 
@@ -18,177 +24,503 @@ import json
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# BatchData production price per address lookup
+COST_PER_LOOKUP = 0.07
+
 class SkipTraceIntegration:
     """Integrates BatchData API with database operations"""
 
-    def __init__(self, use_sandbox: bool = True):
+    def __init__(self, use_sandbox: bool = True, use_cache: bool = True, screen_addresses: bool = True,
+                 db=None, api=None):
         """Initialize with database connection and API connector
 
         Args:
             use_sandbox: If True, use sandbox API and skiptrace_sandbox table
+            use_cache: If True, answer repeated addresses from the local result cache
+            screen_addresses: If True, hold likely misses for review instead of paying for them
+            db: Optional DatabaseConnector (defaults to the process-wide one)
+            api: Optional BatchAPIConnector (defaults to the shared one for the environment)
         """
-        self.db = DatabaseConnector()
+        self.db = db if db is not None else get_database()
         self.use_sandbox = use_sandbox
         env = 'sandbox' if use_sandbox else 'prod'
-        self.api = BatchAPIConnector(env)
+        self.env = env
+        self.use_cache = use_cache
+        self.screen_addresses = screen_addresses
+        self._eligibility = None
+        # Connectors are shared process-wide; building an integration does no HTTP or file setup
+        self.api = api if api is not None else get_connector_registry().get_connector(env, use_cache=use_cache)
+        self.cache = self.api.cache
         self.table_name = 'skiptrace_sandbox' if use_sandbox else 'skiptrace'
 
         logger.info(f"SkipTrace integration initialized (sandbox={use_sandbox})")
 
-    def parse_address(self, address_str: str, town: str = None) -> Dict[str, str]:
-        """Parse address string into components for API"""
-        parts = address_str.split(',')
-        result = {
-            'street': address_str,
-            'city': town if town else '',
-            'state': 'CT',
-            'zip': ''
-        }
-
-        if len(parts) >= 2:
-            result['street'] = parts[0].strip()
-            # Try to extract city, state, zip from remaining parts
-            remainder = ','.join(parts[1:]).strip()
-            words = remainder.split()
-
-            if words:
-                # Last word might be zip
-                if words[-1].replace('-', '').isdigit():
-                    result['zip'] = words[-1]
-                    words = words[:-1]
+    @property
+    def async_api(self) -> AsyncBatchAPIConnector:
+        """Shared async connector for the running event loop"""
+        return get_connector_registry().get_async_connector(self.env, use_cache=self.use_cache)
 
-                # Second to last might be state
-                if words and len(words[-1]) == 2:
-                    result['state'] = words[-1]
-                    words = words[:-1]
+    @property
+    def cost_per_lookup(self) -> float:
+        """Dollars billed per answered lookup; sandbox lookups are free"""
+        return 0.0 if self.use_sandbox else COST_PER_LOOKUP
 
-                # Remaining is city
-                if words:
-                    result['city'] = ' '.join(words)
+    @property
+    def eligibility(self) -> AddressEligibility:
+        """Eligibility screen, seeded with hit rates from past runs on first use"""
+        if self._eligibility is None:
+            hit_rates = HitRates.from_counts(self.db.get_skip_trace_hit_rates(is_sandbox=self.use_sandbox))
+            self._eligibility = AddressEligibility(hit_rates)
+        return self._eligibility
 
-        return result
+    def parse_address(self, address_str: str, town: str = None) -> Dict[str, str]:
+        """Parse address string into components for API"""
+        return normalize_address(address_str, default_city=town).to_api_dict()
 
-    def process_case_skip_trace(self, docket_number: str, force: bool = False) -> Dict[str, any]:
+    def process_case_skip_trace(self, docket_number: str, force: bool = False,
+                                bypass_cache: bool = False, hedge: bool = False) -> Dict[str, any]:
         """Process skip trace for a single case
 
         Args:
             docket_number: The docket number to process
             force: If True, skip trace even if already done (default: False)
+            bypass_cache: If True, call the API even for cached addresses
+            hedge: If True, resend slow requests (for interactive callers; hedges are billed)
 
         Returns:
             Statistics about the processing
         """
-        stats = {
+        stats, lookups = self._collect_case_lookups(docket_number, force=force)
+        if lookups:
+            self.run_lookups(lookups, [stats], bypass_cache=bypass_cache, hedge=hedge)
+        self._finish_case(stats, lookups)
+        return stats
+
+    async def process_case_skip_trace_async(self, docket_number: str, force: bool = False,
+                                            bypass_cache: bool = False, hedge: bool = False) -> Dict[str, any]:
+        """Async counterpart of process_case_skip_trace using AsyncBatchAPIConnector
+
+        The database phases run in a worker thread so the event loop keeps
+        serving other requests while they wait on Supabase.
+        """
+        stats, lookups = await asyncio.to_thread(self._collect_case_lookups, docket_number, force=force)
+        if lookups:
+            await self.run_lookups_async(lookups, [stats], bypass_cache=bypass_cache, hedge=hedge)
+        await asyncio.to_thread(self._finish_case, stats, lookups)
+        return stats
+
+    def _finish_case(self, stats: Dict[str, any], lookups: List[Dict]) -> None:
+        """Store a case's phones and cost, and wait until both are written"""
+        self.store_case_results(stats, lookups)
+        self._queue_costs([stats], lookups)
+        self.db.write_buffer.flush()
+
+    def _new_case_stats(self, docket_number: str) -> Dict[str, any]:
+        """Empty per-case statistics record"""
+        return {
             'docket_number': docket_number,
             'defendants_processed': 0,
             'addresses_processed': 0,
             'phone_numbers_found': 0,
             'records_stored': 0,
+            'addresses_held': 0,
+            'lookups_throttled': 0,
+            'lookups_failed': 0,
+            'lookups_billed': 0,
             'skipped': False,
             'errors': []
         }
 
+    def collect_lookups(self, docket_numbers: List[str], force: bool = False,
+                        cases: Optional[List[Dict]] = None) -> Optional[List[Tuple[Dict, List[Dict]]]]:
+        """Gather the lookups for many cases with a few batched reads
+
+        Skip trace status, defendants and any case rows the caller does not
+        pass in are read with chunked multi-docket requests, and addresses
+        held by the eligibility screen are queued for review in one write.
+
+        Args:
+            docket_numbers: Dockets to plan; results come back in this order
+            force: If True, plan dockets that already have skip trace records
+            cases: Case rows the caller already has
+
+        Returns:
+            List of (case statistics, lookups), one per docket, or None if a
+            batched read failed (every case would otherwise look untraced)
+        """
+        known = {case['docket_number']: case for case in cases or []}
+        missing = [docket for docket in docket_numbers if docket not in known]
+        if missing:
+            fetched = self.db.get_cases_by_dockets(missing)
+            if fetched is None:
+                return None
+            known.update(fetched)
+
+        traced = {} if force else self.db.have_been_skip_traced(docket_numbers, is_sandbox=self.use_sandbox)
+        defendants = self.db.get_defendants_by_dockets(docket_numbers)
+        if traced is None or defendants is None:
+            return None
+
+        held = []
+        planned = []
+        for docket_number in docket_numbers:
+            case = known.get(docket_number)
+            if case:
+                logger.info(f"\nPreparing case {docket_number}: {case['case_name']}")
+            planned.append(self._collect_case_lookups(
+                docket_number, force=force, case=case or {}, defendants=defendants.get(docket_number, []),
+                already_traced=traced.get(docket_number, False), held=held
+            ))
+        if held:
+            self.db.queue_addresses_for_review(held)
+        return planned
+
+    def _collect_case_lookups(self, docket_number: str, force: bool = False, case: Optional[Dict] = None,
+                              defendants: Optional[List[Dict]] = None, already_traced: Optional[bool] = None,
+                              held: Optional[List[Dict]] = None):
+        """Gather the addresses that need a lookup for one case
+
+        collect_lookups passes in the case, its defendants and its skip trace
+        status from batched fetches, plus a list collecting held addresses;
+        otherwise each is read (and held addresses queued) for this docket alone.
+
+        Returns:
+            Tuple of (case statistics, list of lookup dicts). Each lookup holds
+            the defendant name, raw address and parsed address dict; the
+            'phone_numbers' and 'result' keys are filled in by run_lookups.
+        """
+        stats = self._new_case_stats(docket_number)
+
         # Check if already skip traced (unless force flag is set)
-        if not force and self.db.has_been_skip_traced(docket_number, is_sandbox=self.use_sandbox):
+        if not force and already_traced is None:
+            already_traced = self.db.has_been_skip_traced(docket_number, is_sandbox=self.use_sandbox)
+        if not force and already_traced:
             logger.info(f"Case {docket_number} has already been skip traced in {self.table_name}")
             stats['skipped'] = True
             stats['errors'].append(f"Case already skip traced. Use force=True to override.")
-            return stats
+            return stats, []
 
         # Get case and defendants
-        case = self.db.get_case_by_docket(docket_number)
+        if case is None:
+            case = self.db.get_case_by_docket(docket_number)
         if not case:
             error_msg = f"Case {docket_number} not found"
             logger.error(error_msg)
             stats['errors'].append(error_msg)
-            return stats
+            return stats, []
 
-        defendants = self.db.get_defendants_by_docket(docket_number)
+        if defendants is None:
+            defendants = self.db.get_defendants_by_docket(docket_number)
         if not defendants:
             logger.info(f"No defendants found for case {docket_number}")
-            return stats
+            return stats, []
 
         stats['defendants_processed'] = len(defendants)
 
-        # Process each defendant's address
-        all_skiptraces = []
-
+        lookups = []
+        case_held = []
         for defendant in defendants:
             address = defendant.get('address')
             if not address:
                 logger.info(f"No address for defendant {defendant['name']}")
                 continue
 
+            # Parse address, include town from defendant or case
+            town = defendant.get('town') or case.get('town')
+
+            # Likely misses go to the review queue instead of the paid API
+            if self.screen_addresses:
+                verdict = self.eligibility.evaluate(address, town=town)
+                if not verdict.eligible:
+                    logger.info(f"Holding address for {defendant['name']} ({verdict.reason}): {address}")
+                    case_held.append({
+                        'docket_number': docket_number,
+                        'defendant_name': defendant['name'],
+                        'address': address,
+                        'reason': verdict.reason,
+                        'score': round(verdict.score, 4)
+                    })
+                    continue
+
             stats['addresses_processed'] += 1
+            lookups.append({
+                'docket_number': docket_number,
+                'defendant': defendant['name'],
+                'address': address,
+                'address_dict': self.parse_address(address, town=town),
+                'phone_numbers': [],
+                'result': None
+            })
+
+        if case_held:
+            stats['addresses_held'] = len(case_held)
+            if held is not None:
+                held.extend(case_held)
+            else:
+                self.db.queue_addresses_for_review(case_held)
 
-            # Parse address and call API, include town from defendant or case
-            town = defendant.get('town') or case.get('town')
-            address_dict = self.parse_address(address, town=town)
-            logger.info(f"Processing address for {defendant['name']}: {address}")
+        return stats, lookups
 
-            try:
-                # Call BatchData API
-                phone_numbers = self.api.send_skip_trace_request(address_dict)
+    def run_lookups(self, lookups: List[Dict], case_stats: List[Dict], bypass_cache: bool = False,
+                    hedge: bool = False) -> None:
+        """Send all lookups to BatchData in batched requests
 
-                if phone_numbers:
-                    stats['phone_numbers_found'] += len(phone_numbers)
+        The LookupResult and its phone numbers are written back onto each
+        lookup dict. If the batch call raises, the error is recorded on every
+        affected case.
+        """
+        logger.info(f"Sending {len(lookups)} address(es) to BatchData in batches of {self.api.batch_size}")
+        try:
+            results = self.api.lookup_batch(
+                [lookup['address_dict'] for lookup in lookups], bypass_cache=bypass_cache, hedge=hedge
+            )
+        except Exception as e:
+            error_msg = f"Error calling BatchData API: {e}"
+            logger.error(error_msg)
+            for stats in case_stats:
+                stats['errors'].append(error_msg)
+            return
+
+        for lookup, result in zip(lookups, results):
+            lookup['result'] = result
+            lookup['phone_numbers'] = result.phone_numbers
+
+    async def run_lookups_async(self, lookups: List[Dict], case_stats: List[Dict],
+                                bypass_cache: bool = False, hedge: bool = False) -> None:
+        """Async counterpart of run_lookups; chunks are sent concurrently"""
+        logger.info(f"Sending {len(lookups)} address(es) to BatchData "
+                    f"(up to {self.async_api.max_concurrency} requests in flight)")
+        try:
+            results = await self.async_api.lookup_batch(
+                [lookup['address_dict'] for lookup in lookups], bypass_cache=bypass_cache, hedge=hedge
+            )
+        except Exception as e:
+            error_msg = f"Error calling BatchData API: {e}"
+            logger.error(error_msg)
+            for stats in case_stats:
+                stats['errors'].append(error_msg)
+            return
 
-                    # Create skip trace records
-                    for phone in phone_numbers:
-                        # Determine phone type based on pattern (simplified)
-                        phone_type = 'mobile' if any(x in phone for x in ['555-01', '860-']) else 'landline'
+        for lookup, result in zip(lookups, results):
+            lookup['result'] = result
+            lookup['phone_numbers'] = result.phone_numbers
 
-                        skiptrace_data = {
-                            'docket_number': docket_number,
-                            'phone_number': phone,
-                            'phone_type': phone_type
-                        }
-                        all_skiptraces.append(skiptrace_data)
+    def billed_lookups(self, lookups: List[Dict]) -> Dict[str, int]:
+        """Lookups that were sent to BatchData and answered, per docket
 
-                    logger.info(f"Found {len(phone_numbers)} phone numbers for {defendant['name']}")
-                else:
-                    logger.info(f"No phone numbers found for {defendant['name']}")
+        Cached answers, lookups answered by another caller's in-flight request
+        and failed or throttled lookups are not billed. An address asked for by
+        several lookups was sent once, so it is billed to the first docket only.
+        """
+        seen = set()
+        billed: Dict[str, int] = {}
+        for lookup in lookups:
+            result = lookup.get('result')
+            if result is None or not result.ok or result.cached or result.coalesced:
+                continue
+            key = self.api.address_key(lookup['address_dict'])
+            if key in seen:
+                continue
+            seen.add(key)
+            billed[lookup['docket_number']] = billed.get(lookup['docket_number'], 0) + 1
+        return billed
+
+    def _queue_costs(self, case_stats: List[Dict], lookups: List[Dict]) -> None:
+        """Queue one cost increment for the billed lookups of a run
+
+        The increment also appends to the spend ledger, and goes out with the
+        next write-behind flush alongside the run's phone records.
+        """
+        billed = self.billed_lookups(lookups)
+        for stats in case_stats:
+            stats['lookups_billed'] = billed.get(stats['docket_number'], 0)
+        if billed:
+            self.db.write_buffer.add_costs(billed, self.cost_per_lookup, is_sandbox=self.use_sandbox)
+
+    async def perform_skip_trace_async(self, docket_number: str, addresses: List[Dict[str, str]],
+                                       bypass_cache: bool = False, hedge: bool = False) -> Dict[str, any]:
+        """Look up the given addresses for a case and store the phones found
 
-            except Exception as e:
-                error_msg = f"Error processing {defendant['name']}: {e}"
-                logger.error(error_msg)
+        Args:
+            docket_number: Case the phone numbers belong to
+            addresses: Address dicts with street, city, state, zip
+            bypass_cache: If True, call the API even for cached addresses
+            hedge: If True, resend slow requests (for interactive callers; hedges are billed)
+
+        Returns:
+            Dict with success, phone_numbers, cost and error
+        """
+        stats = self._new_case_stats(docket_number)
+        lookups = [{
+            'docket_number': docket_number,
+            'defendant': address.get('street', ''),
+            'address': address.get('street', ''),
+            'address_dict': address,
+            'phone_numbers': [],
+            'result': None
+        } for address in addresses]
+        stats['addresses_processed'] = len(lookups)
+
+        await self.run_lookups_async(lookups, [stats], bypass_cache=bypass_cache, hedge=hedge)
+        await asyncio.to_thread(self._finish_case, stats, lookups)
+
+        phone_numbers = [phone for lookup in lookups for phone in lookup['phone_numbers']]
+        cost = stats['lookups_billed'] * self.cost_per_lookup
+        return {
+            'success': not stats['errors'],
+            'phone_numbers': phone_numbers,
+            'records_stored': stats['records_stored'],
+            'cost': cost,
+            'error': '; '.join(stats['errors']) if stats['errors'] else None
+        }
+
+    def store_case_results(self, stats: Dict[str, any], lookups: List[Dict]) -> None:
+        """Build skip trace records for one case and queue them for storage
+
+        Records go through the database's write-behind buffer so many cases
+        share one insert; records_stored is filled in when the buffer writes
+        them. Callers flush the buffer before reading the stats.
+        """
+        docket_number = stats['docket_number']
+        all_skiptraces = []
+
+        # Archive each raw payload once; phone rows reference it by hash
+        archived = [lookup for lookup in lookups
+                    if lookup['phone_numbers'] and lookup.get('result') is not None and lookup['result'].raw_response]
+        response_hashes = {}
+        if archived:
+            hashes = self.db.archive_raw_responses([lookup['result'].raw_response for lookup in archived])
+            response_hashes = {id(lookup): response_hash for lookup, response_hash in zip(archived, hashes)}
+
+        for lookup in lookups:
+            result = lookup.get('result')
+            if result is not None and not result.ok:
+                # Throttled or failed lookups are not "no phones found"; report them so the case is retried
+                if result.status == LOOKUP_THROTTLED:
+                    stats['lookups_throttled'] += 1
+                else:
+                    stats['lookups_failed'] += 1
+                error_msg = f"Lookup {result.status} for {lookup['defendant']}: {result.error}"
+                logger.warning(error_msg)
                 stats['errors'].append(error_msg)
+                continue
 
-        # Store all skip trace records
-        if all_skiptraces:
-            stored = self.db.insert_skiptraces(all_skiptraces, is_sandbox=self.use_sandbox)
-            stats['records_stored'] = len(stored) if stored else 0
-            logger.info(f"Stored {stats['records_stored']} skip trace records in {self.table_name}")
+            phone_numbers = lookup['phone_numbers']
+            if phone_numbers:
+                stats['phone_numbers_found'] += len(phone_numbers)
+
+                # Create skip trace records
+                for phone in phone_numbers:
+                    # Determine phone type based on pattern (simplified)
+                    phone_type = 'mobile' if any(x in phone for x in ['555-01', '860-']) else 'landline'
+
+                    skiptrace_data = {
+                        'docket_number': docket_number,
+                        'phone_number': phone,
+                        'phone_type': phone_type
+                    }
+                    if response_hashes.get(id(lookup)):
+                        skiptrace_data['response_hash'] = response_hashes[id(lookup)]
+                    all_skiptraces.append(skiptrace_data)
+
+                logger.info(f"Found {len(phone_numbers)} phone numbers for {lookup['defendant']}")
+            else:
+                logger.info(f"No phone numbers found for {lookup['defendant']}")
 
-        return stats
+        # Queue all skip trace records
+        if all_skiptraces:
+            pending = self.db.write_buffer.add_skiptraces(all_skiptraces, is_sandbox=self.use_sandbox)
+            pending.add_done_callback(lambda future: self._record_stored(stats, future.result()))
+
+    def _record_stored(self, stats: Dict[str, any], result: FlushResult) -> None:
+        """Fill in a case's stored count once the buffer has written its records"""
+        if not result.ok:
+            # Reported as an error so the case is retried, like a failed lookup
+            error_msg = f"Storing skip trace records in {self.table_name} failed: {result.error}"
+            logger.error(error_msg)
+            stats['errors'].append(error_msg)
+            return
+        stats['records_stored'] = len(result.rows)
+        logger.info(f"Stored {stats['records_stored']} skip trace records for {stats['docket_number']} "
+                    f"in {self.table_name} ({result.latency * 1000:.0f} ms after queueing)")
 
-    def process_town_skip_traces(self, town: str, limit: Optional[int] = None, force: bool = False) -> Dict[str, any]:
+    def process_town_skip_traces(self, town: str, limit: Optional[int] = None, force: bool = False,
+                                 bypass_cache: bool = False, cases: Optional[List[Dict]] = None) -> Dict[str, any]:
         """Process skip traces for all cases in a town
 
+        Addresses from every case are collected first and sent to BatchData
+        in batched requests, so a town run costs a handful of HTTP calls.
+
         Args:
             town: Town name to process
             limit: Optional limit on number of cases to process
             force: If True, skip trace even if already done (default: False)
+            bypass_cache: If True, call the API even for cached addresses
+            cases: The town's cases if the caller has already fetched them
 
         Returns:
             Statistics about the processing
         """
+        stats, pending = self._prepare_town(town, limit=limit, force=force, cases=cases)
+
+        all_lookups = [lookup for _, case_lookups in pending for lookup in case_lookups]
+        if all_lookups:
+            self.run_lookups(all_lookups, [case_stats for case_stats, case_lookups in pending if case_lookups],
+                             bypass_cache=bypass_cache)
+
+        return self._finish_town(stats, pending)
+
+    async def process_town_skip_traces_async(self, town: str, limit: Optional[int] = None,
+                                             force: bool = False, bypass_cache: bool = False,
+                                             cases: Optional[List[Dict]] = None) -> Dict[str, any]:
+        """Async counterpart of process_town_skip_traces
+
+        Batched requests are sent concurrently through AsyncBatchAPIConnector
+        instead of one after another. The database phases run in a worker
+        thread so they do not block the event loop.
+        """
+        stats, pending = await asyncio.to_thread(self._prepare_town, town, limit=limit, force=force, cases=cases)
+
+        all_lookups = [lookup for _, case_lookups in pending for lookup in case_lookups]
+        if all_lookups:
+            await self.run_lookups_async(all_lookups, [case_stats for case_stats, case_lookups in pending if case_lookups],
+                                         bypass_cache=bypass_cache)
+
+        return await asyncio.to_thread(self._finish_town, stats, pending)
+
+    def _prepare_town(self, town: str, limit: Optional[int] = None, force: bool = False,
+                      cases: Optional[List[Dict]] = None):
+        """Collect the lookups for every case in a town before calling the API
+
+        Defendants and skip trace status are fetched for all cases in a few
+        chunked requests rather than per case.
+
+        Returns:
+            Tuple of (town statistics, list of (case statistics, lookups))
+        """
         stats = {
             'town': town,
             'cases_processed': 0,
             'cases_skipped': 0,
+            'cases_failed': 0,
             'total_defendants': 0,
             'total_addresses': 0,
             'total_phone_numbers': 0,
             'total_records_stored': 0,
+            'total_addresses_held': 0,
+            'total_lookups_throttled': 0,
+            'total_lookups_failed': 0,
+            'total_lookups_billed': 0,
+            'total_cost': 0.0,
             'errors': []
         }
 
         # Get all cases for the town
-        cases = self.db.get_cases_by_town(town)
+        if cases is None:
+            cases = self.db.get_cases_by_town(town)
         if not cases:
             logger.info(f"No cases found for town {town}")
-            return stats
+            return stats, []
 
         # Apply limit if specified
         if limit:
@@ -196,24 +528,44 @@ class SkipTraceIntegration:
 
         logger.info(f"Processing skip traces for {len(cases)} cases in {town}")
 
-        # Process each case
-        for case in cases:
-            docket_number = case['docket_number']
-            logger.info(f"\nProcessing case {docket_number}: {case['case_name']}")
+        pending = self.collect_lookups([case['docket_number'] for case in cases], force=force, cases=cases)
+        if pending is None:
+            error_msg = f"Could not load skip trace status or defendants for {town}; run aborted"
+            logger.error(error_msg)
+            stats['errors'].append(error_msg)
+            return stats, []
 
-            case_stats = self.process_case_skip_trace(docket_number, force=force)
+        return stats, pending
 
+    def _finish_town(self, stats: Dict[str, any], pending: List) -> Dict[str, any]:
+        """Store the results of a town run and log the summary"""
+        for case_stats, case_lookups in pending:
+            self.store_case_results(case_stats, case_lookups)
+        self._queue_costs([case_stats for case_stats, _ in pending],
+                          [lookup for _, case_lookups in pending for lookup in case_lookups])
+        self.db.write_buffer.flush()
+
+        for case_stats, _ in pending:
             if case_stats['skipped']:
                 stats['cases_skipped'] += 1
             else:
                 stats['cases_processed'] += 1
+                if case_stats['errors']:
+                    stats['cases_failed'] += 1
                 stats['total_defendants'] += case_stats['defendants_processed']
                 stats['total_addresses'] += case_stats['addresses_processed']
                 stats['total_phone_numbers'] += case_stats['phone_numbers_found']
                 stats['total_records_stored'] += case_stats['records_stored']
+                stats['total_addresses_held'] += case_stats['addresses_held']
+                stats['total_lookups_throttled'] += case_stats['lookups_throttled']
+                stats['total_lookups_failed'] += case_stats['lookups_failed']
+                stats['total_lookups_billed'] += case_stats['lookups_billed']
 
             stats['errors'].extend(case_stats['errors'])
 
+        stats['total_cost'] = round(stats['total_lookups_billed'] * self.cost_per_lookup, 2)
+        town = stats['town']
+
         # Log summary
         logger.info(f"\n{'='*60}")
         logger.info(f"Skip Trace Processing Complete for {town}")
@@ -224,8 +576,14 @@ class SkipTraceIntegration:
         logger.info(f"Cases skipped (already traced): {stats['cases_skipped']}")
         logger.info(f"Defendants processed: {stats['total_defendants']}")
         logger.info(f"Addresses processed: {stats['total_addresses']}")
+        if stats['total_addresses_held']:
+            logger.info(f"Addresses held for review: {stats['total_addresses_held']}")
         logger.info(f"Phone numbers found: {stats['total_phone_numbers']}")
         logger.info(f"Records stored: {stats['total_records_stored']}")
+        logger.info(f"Lookups billed: {stats['total_lookups_billed']} (${stats['total_cost']:.2f})")
+        if stats['total_lookups_throttled'] or stats['total_lookups_failed']:
+            logger.warning(f"Lookups throttled: {stats['total_lookups_throttled']}, "
+                           f"failed: {stats['total_lookups_failed']}")
 
         if stats['errors']:
             logger.warning(f"Errors encountered: {len(stats['errors'])}")
@@ -236,7 +594,7 @@ class SkipTraceIntegration:
 
     def get_skip_trace_report(self, docket_number: str) -> Dict[str, any]:
         """Get a report of skip trace data for a case"""
-        case = self.db.get_full_case_data(docket_number, include_sandbox=True)
+        case = self.db.get_full_case_data(docket_number, include_sandbox=True, skiptrace_columns=PHONE_COLUMNS)
 
         if not case:
             return None
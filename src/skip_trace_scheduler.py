@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Budget-aware skip trace scheduler
+Queues dockets, orders them by priority and dispatches batched lookups
+without letting paid lookups exceed a daily or monthly spend cap
+"""
+
+import argparse
+import asyncio
+import heapq
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from skip_trace_integration import SkipTraceIntegration, COST_PER_LOOKUP
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Addresses sent per dispatch; several connector batches so requests stay full
+DEFAULT_DISPATCH_SIZE = 500
+# Dockets planned per batched read of skip trace status and defendants
+PLAN_BATCH_SIZE = 100
+
+# "MMX-CV-24-6042001-S" -> year 24, sequence 6042001
+_DOCKET_RE = re.compile(r'CV-?(\d{2})-?(\d{5,7})', re.IGNORECASE)
+
+
+@dataclass
+class QueuedDocket:
+    """A docket waiting to be skip traced"""
+    docket_number: str
+    town: Optional[str] = None
+    created_at: Optional[str] = None
+    # The case row when it was queued from one; saves a read when planning
+    case: Optional[Dict] = field(default=None, repr=False, compare=False)
+
+    @property
+    def filing_key(self) -> Tuple[int, int, float]:
+        """Sort key that grows with filing date: docket year and sequence, then created_at"""
+        try:
+            created = datetime.fromisoformat(self.created_at).timestamp() if self.created_at else 0.0
+        except ValueError:
+            created = 0.0
+        match = _DOCKET_RE.search(self.docket_number or '')
+        if match:
+            return int(match.group(1)), int(match.group(2)), created
+        return -1, -1, created
+
+
+def default_priority(preferred_towns: Sequence[str] = ()) -> Callable[[QueuedDocket], tuple]:
+    """Preferred towns first, then newest filings first (lower key runs first)"""
+    preferred = [town.lower() for town in preferred_towns]
+
+    def priority(item: QueuedDocket) -> tuple:
+        town = (item.town or '').lower()
+        town_rank = preferred.index(town) if town in preferred else len(preferred)
+        year, sequence, created = item.filing_key
+        return town_rank, -year, -sequence, -created
+
+    return priority
+
+
+@dataclass
+class DispatchReport:
+    """Outcome of a scheduler run"""
+    dispatched: List[str] = field(default_factory=list)
+    deferred: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    lookups: int = 0
+    billed_lookups: int = 0
+    spent: float = 0.0
+    remaining_budget: Optional[float] = None
+    case_stats: List[Dict] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return {
+            'dispatched': self.dispatched,
+            'deferred': self.deferred,
+            'skipped': self.skipped,
+            'lookups': self.lookups,
+            'billed_lookups': self.billed_lookups,
+            'spent': round(self.spent, 2),
+            'remaining_budget': None if self.remaining_budget is None else round(self.remaining_budget, 2),
+            'cases': len(self.case_stats)
+        }
+
+
+class SkipTraceScheduler:
+    """Priority queue of dockets dispatched within a spend budget
+
+    Before each dispatch the scheduler counts the addresses of the chosen
+    dockets that are not in the result cache; that is an upper bound on
+    what the dispatch can bill, and the dispatch only goes out if the
+    bound fits in what is left of the daily and monthly budgets. Dockets
+    that do not fit stay queued for a later run.
+    """
+
+    def __init__(self, integration: SkipTraceIntegration, daily_budget: Optional[float] = None,
+                 monthly_budget: Optional[float] = None, preferred_towns: Sequence[str] = (),
+                 priority: Optional[Callable[[QueuedDocket], tuple]] = None,
+                 cost_per_lookup: float = COST_PER_LOOKUP, dispatch_size: int = DEFAULT_DISPATCH_SIZE):
+        """
+        Args:
+            integration: SkipTraceIntegration used for lookups and storage
+            daily_budget: Maximum dollars billed per calendar day (UTC), None for no cap
+            monthly_budget: Maximum dollars billed per calendar month (UTC), None for no cap
+            preferred_towns: Towns dispatched before all others, in order
+            priority: Optional key function; lower keys are dispatched first
+            cost_per_lookup: Dollars billed per uncached address
+            dispatch_size: Maximum addresses sent per dispatch
+        """
+        self.integration = integration
+        self.db = integration.db
+        self.daily_budget = daily_budget
+        self.monthly_budget = monthly_budget
+        self.priority = priority or default_priority(preferred_towns)
+        # Sandbox lookups are free
+        self.cost_per_lookup = 0.0 if integration.use_sandbox else cost_per_lookup
+        self.dispatch_size = dispatch_size
+        self._queue: List[Tuple[tuple, int, QueuedDocket]] = []
+        self._queued: set = set()
+        self._deferred: List[QueuedDocket] = []
+        self._counter = 0
+
+    # Queue management
+    def enqueue(self, item: QueuedDocket) -> bool:
+        """Queue a docket; returns False if it is already queued"""
+        if item.docket_number in self._queued:
+            return False
+        heapq.heappush(self._queue, (self.priority(item), self._counter, item))
+        self._counter += 1
+        self._queued.add(item.docket_number)
+        return True
+
+    def enqueue_cases(self, cases: Iterable[Dict]) -> int:
+        """Queue case rows (as returned by DatabaseConnector)"""
+        return sum(
+            self.enqueue(QueuedDocket(case['docket_number'], case.get('town'), case.get('created_at'), case=case))
+            for case in cases
+        )
+
+    def enqueue_town(self, town: str, limit: Optional[int] = None) -> int:
+        """Queue every case in a town"""
+        cases = self.db.get_cases_by_town(town)
+        return self.enqueue_cases(cases[:limit] if limit else cases)
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def _pop(self, count: int) -> List[QueuedDocket]:
+        """Remove up to count dockets from the queue, highest priority first"""
+        items = []
+        while self._queue and len(items) < count:
+            _, _, item = heapq.heappop(self._queue)
+            self._queued.discard(item.docket_number)
+            items.append(item)
+        return items
+
+    # Budget
+    def remaining_budget(self) -> Optional[float]:
+        """Dollars left under the tighter of the daily and monthly caps (None = uncapped)"""
+        if self.cost_per_lookup == 0:
+            return None
+        now = datetime.now(timezone.utc)
+        remaining = []
+        if self.daily_budget is not None:
+            start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            remaining.append(self.daily_budget - self.db.get_skip_trace_spend(start_of_day))
+        if self.monthly_budget is not None:
+            start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+            remaining.append(self.monthly_budget - self.db.get_skip_trace_spend(start_of_month))
+        return max(min(remaining), 0.0) if remaining else None
+
+    def _billable(self, lookups: List[Dict], bypass_cache: bool = False) -> int:
+        """Addresses that would be sent to the API (cache misses)"""
+        cache = self.integration.cache
+        if not lookups or cache is None or bypass_cache:
+            return len(lookups)
+        cached = cache.get_many(self.integration.env, [lookup['address_dict'] for lookup in lookups])
+        return sum(1 for phones in cached if phones is None)
+
+    # Dispatch
+    def _plan_dispatch(self, report: DispatchReport, budget: Optional[float], force: bool,
+                       bypass_cache: bool) -> List[Tuple[Dict, List[Dict]]]:
+        """Pop the highest-priority dockets that fit the budget left in this run
+
+        Returns:
+            List of (case statistics, lookups) to send together
+        """
+        if budget is not None:
+            budget -= report.spent
+        selected = []
+        addresses = 0
+
+        while self._queue and addresses < self.dispatch_size:
+            items = self._pop(PLAN_BATCH_SIZE)
+            planned = self.integration.collect_lookups([item.docket_number for item in items], force=force,
+                                                       cases=[item.case for item in items if item.case])
+            if planned is None:
+                # Skip trace status or defendants could not be read; try these again next run
+                self._deferred.extend(items)
+                break
+
+            for index, (item, (case_stats, lookups)) in enumerate(zip(items, planned)):
+                if addresses >= self.dispatch_size:
+                    # Dispatch is full; the rest go back in the queue
+                    for rest in items[index:]:
+                        self.enqueue(rest)
+                    break
+                if case_stats['skipped'] or not lookups:
+                    report.skipped.append(item.docket_number)
+                    report.case_stats.append(case_stats)
+                    continue
+
+                cost = self._billable(lookups, bypass_cache) * self.cost_per_lookup
+                if budget is not None and cost > budget + 1e-9:
+                    # Held back until the run ends; a smaller docket may still fit
+                    self._deferred.append(item)
+                    continue
+
+                if budget is not None:
+                    budget -= cost
+                selected.append((case_stats, lookups))
+                addresses += len(lookups)
+
+        return selected
+
+    def _settle(self, report: DispatchReport, selected: List[Tuple[Dict, List[Dict]]]) -> None:
+        """Store the results of one dispatch and record what it billed
+
+        An address shared by several dockets in the dispatch was sent once,
+        so it is billed to the first docket only. Phone records and the
+        per-docket cost increments (which also append to the spend ledger)
+        go through the write-behind buffer, flushed once for the whole dispatch.
+        """
+        billed_by_docket = self.integration.billed_lookups(
+            [lookup for _, lookups in selected for lookup in lookups]
+        )
+        for case_stats, lookups in selected:
+            self.integration.store_case_results(case_stats, lookups)
+            billed = billed_by_docket.get(case_stats['docket_number'], 0)
+            case_stats['lookups_billed'] = billed
+            report.dispatched.append(case_stats['docket_number'])
+            report.lookups += len(lookups)
+            report.billed_lookups += billed
+            report.spent += billed * self.cost_per_lookup
+            report.case_stats.append(case_stats)
+        self.db.write_buffer.add_costs(billed_by_docket, self.cost_per_lookup,
+                                       is_sandbox=self.integration.use_sandbox)
+        self.db.write_buffer.flush()
+
+    def _finish(self, report: DispatchReport, budget: Optional[float]) -> DispatchReport:
+        """Re-queue deferred dockets for the next run and log the summary"""
+        for item in self._deferred:
+            report.deferred.append(item.docket_number)
+            self.enqueue(item)
+        self._deferred = []
+        remaining = None if budget is None else max(budget - report.spent, 0.0)
+        report.remaining_budget = remaining
+        logger.info(f"Scheduler dispatched {len(report.dispatched)} dockets, {report.billed_lookups} billed lookups "
+                    f"(${report.spent:.2f}); {len(report.deferred)} deferred, "
+                    f"remaining budget {'uncapped' if remaining is None else f'${remaining:.2f}'}")
+        return report
+
+    def run(self, force: bool = False, bypass_cache: bool = False) -> DispatchReport:
+        """Dispatch queued dockets until the queue is empty or the budget is spent
+
+        Args:
+            force: Re-trace dockets that already have results
+            bypass_cache: Send cached addresses to the API too (they are then billed
+                          and counted against the budget)
+        """
+        report = DispatchReport()
+        # Read the ledger once; spend during the run is tracked in the report
+        budget = self.remaining_budget()
+        while self._queue:
+            selected = self._plan_dispatch(report, budget, force, bypass_cache)
+            if not selected:
+                break
+            lookups = [lookup for _, case_lookups in selected for lookup in case_lookups]
+            self.integration.run_lookups(lookups, [case_stats for case_stats, _ in selected],
+                                         bypass_cache=bypass_cache)
+            self._settle(report, selected)
+        return self._finish(report, budget)
+
+    async def run_async(self, force: bool = False, bypass_cache: bool = False) -> DispatchReport:
+        """Async counterpart of run; each dispatch's requests are sent concurrently
+
+        Budget reads, planning and settling hit the database, so they run in a
+        worker thread instead of blocking the event loop.
+        """
+        report = DispatchReport()
+        budget = await asyncio.to_thread(self.remaining_budget)
+        while self._queue:
+            selected = await asyncio.to_thread(self._plan_dispatch, report, budget, force, bypass_cache)
+            if not selected:
+                break
+            lookups = [lookup for _, case_lookups in selected for lookup in case_lookups]
+            await self.integration.run_lookups_async(lookups, [case_stats for case_stats, _ in selected],
+                                                     bypass_cache=bypass_cache)
+            await asyncio.to_thread(self._settle, report, selected)
+        return self._finish(report, budget)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Skip trace queued towns within a spend budget')
+    parser.add_argument('towns', nargs='+', help='Towns whose cases are queued')
+    parser.add_argument('--daily-budget', type=float, help='Maximum dollars per day')
+    parser.add_argument('--monthly-budget', type=float, help='Maximum dollars per month')
+    parser.add_argument('--prefer', action='append', default=[], help='Town to dispatch first (repeatable)')
+    parser.add_argument('--limit', type=int, help='Maximum cases queued per town')
+    parser.add_argument('--prod', action='store_true', help='Use production API (default: sandbox)')
+    parser.add_argument('--force', action='store_true', help='Re-trace cases that already have results')
+    args = parser.parse_args()
+
+    if args.prod and args.daily_budget is None and args.monthly_budget is None:
+        parser.error('--prod requires --daily-budget or --monthly-budget')
+
+    scheduler = SkipTraceScheduler(
+        SkipTraceIntegration(use_sandbox=not args.prod),
+        daily_budget=args.daily_budget,
+        monthly_budget=args.monthly_budget,
+        preferred_towns=args.prefer
+    )
+    for town in args.towns:
+        print(f"Queued {scheduler.enqueue_town(town, limit=args.limit)} cases from {town}")
+
+    report = scheduler.run(force=args.force)
+    for key, value in report.to_dict().items():
+        if isinstance(value, list):
+            print(f"{key}: {len(value)}")
+        else:
+            print(f"{key}: {value}")
+
+
+if __name__ == '__main__':
+    main()
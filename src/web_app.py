@@ -13,7 +13,7 @@ import json
 # Add the src directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from db_connector import DatabaseConnector
+from db_connector import get_database
 from scraper_db_integration import ScraperDatabaseIntegration
 from skip_trace_integration import SkipTraceIntegration
 from case_scraper import CaseScraper
@@ -25,8 +25,8 @@ app = Flask(__name__,
 app.secret_key = os.environ.get('FLASK_SECRET_KEY', 'dev-secret-key-change-in-production')
 CORS(app)
 
-# Initialize database connection
-db = DatabaseConnector()
+# Shared database connection, also used by the integrations below
+db = get_database()
 scraper_integration = ScraperDatabaseIntegration()
 
 # Routes
@@ -76,13 +76,17 @@ def cases():
         response = db.client.table('cases').select('*').order('created_at', desc=True).execute()
         cases = response.data if response.data else []
 
-    # Get skip trace status for each case
+    # Get skip trace status for all cases at once
+    dockets = [case['docket_number'] for case in cases]
+    defendants = db.get_defendants_by_dockets(dockets)
+    skiptraces = db.get_skiptraces_by_dockets(dockets)
+    if defendants is None or skiptraces is None:
+        flash('Could not load defendants and skip traces for these cases', 'error')
+        defendants, skiptraces = defendants or {}, skiptraces or {}
     for case in cases:
-        case['has_skiptrace'] = db.has_been_skip_traced(case['docket_number'])
-        defendants = db.get_defendants_by_docket(case['docket_number'])
-        case['defendant_count'] = len(defendants)
-        skiptraces = db.get_skiptraces_by_docket(case['docket_number'])
-        case['phone_count'] = len(skiptraces)
+        case['defendant_count'] = len(defendants.get(case['docket_number'], []))
+        case['phone_count'] = len(skiptraces.get(case['docket_number'], []))
+        case['has_skiptrace'] = case['phone_count'] > 0
 
     return render_template('cases.html', cases=cases, selected_town=town)
 
@@ -131,12 +135,14 @@ def skip_trace(docket_number):
         # Check if production or sandbox
         use_production = request.form.get('production') == 'true'
         force = request.form.get('force') == 'true'
+        bypass_cache = request.form.get('bypass_cache') == 'true'
 
         # Initialize skip trace
         skip_trace_int = SkipTraceIntegration(use_sandbox=not use_production)
 
-        # Process the case
-        stats = skip_trace_int.process_case_skip_trace(docket_number, force=force)
+        # Process the case; someone is waiting on the button, so slow responses are hedged
+        stats = skip_trace_int.process_case_skip_trace(docket_number, force=force, bypass_cache=bypass_cache,
+                                                       hedge=True)
 
         if stats['skipped'] and not force:
             return jsonify({
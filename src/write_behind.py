@@ -0,0 +1,259 @@
+"""
+Write-behind buffer for skip trace and cost rows
+Collects rows from many cases and writes them in a few batched requests
+"""
+
+import atexit
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Buffered rows that trigger a flush; matches db_connector.BULK_CHUNK_SIZE
+DEFAULT_MAX_ROWS = 500
+# Seconds a row may wait in the buffer before it is written
+DEFAULT_FLUSH_INTERVAL = 2.0
+
+
+@dataclass
+class FlushResult:
+    """Outcome of the flush that wrote one caller's rows"""
+    # Newly inserted skip traces, or the cost records after the increment
+    rows: List[Dict] = field(default_factory=list)
+    # Seconds from add_*() until the write finished
+    latency: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self):
+        """True if the rows reached the database."""
+        return self.error is None
+
+
+@dataclass
+class _Entry:
+    rows: List[Dict]
+    future: Future
+    added_at: float
+    is_sandbox: bool = False
+    cost_per_lookup: float = 0.0
+
+
+class WriteBehindBuffer:
+    """Batches skip trace inserts and cost increments behind the callers
+
+    add_skiptraces() and add_costs() return immediately with a Future that
+    resolves to a FlushResult once the rows are written. A background thread
+    flushes when max_rows are buffered or the oldest row has waited
+    flush_interval seconds; flush() writes everything now, and close() (also
+    run at interpreter exit) flushes before stopping the thread.
+    """
+
+    def __init__(self, db, max_rows: int = DEFAULT_MAX_ROWS, flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        """
+        Args:
+            db: DatabaseConnector the rows are written through
+            max_rows: Buffered rows that trigger a flush (also the most rows per request)
+            flush_interval: Seconds the oldest buffered row may wait
+        """
+        self.db = db
+        self.max_rows = max_rows
+        self.flush_interval = flush_interval
+
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._skiptraces: List[_Entry] = []
+        self._costs: List[_Entry] = []
+        self._pending_rows = 0
+        self._oldest: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        self.flushes = 0
+        self.requests = 0
+        self.rows_written = 0
+        self.failures = 0
+        self.last_flush_latency = 0.0
+        self.max_flush_latency = 0.0
+
+        atexit.register(self.close)
+
+    @property
+    def pending_rows(self) -> int:
+        with self._cond:
+            return self._pending_rows
+
+    def add_skiptraces(self, rows: List[Dict], is_sandbox: bool = False) -> Future:
+        """Queue skip trace rows for skiptrace or skiptrace_sandbox
+
+        Returns:
+            Future resolving to a FlushResult with the rows that were newly inserted
+        """
+        entry = _Entry(list(rows), Future(), time.monotonic(), is_sandbox=is_sandbox)
+        self._add(self._skiptraces, entry)
+        return entry.future
+
+    def add_costs(self, lookup_counts: Dict[str, int], cost_per_lookup: float = 0.07,
+                  is_sandbox: bool = False) -> Future:
+        """Queue lookup counts to add to the dockets' cost records
+
+        Counts for the same docket are summed before they are sent.
+
+        Returns:
+            Future resolving to a FlushResult with the updated cost records
+        """
+        rows = [{'docket_number': docket, 'lookup_count': count} for docket, count in lookup_counts.items() if count]
+        entry = _Entry(rows, Future(), time.monotonic(), is_sandbox=is_sandbox, cost_per_lookup=cost_per_lookup)
+        self._add(self._costs, entry)
+        return entry.future
+
+    def _add(self, queue: List[_Entry], entry: _Entry) -> None:
+        if not entry.rows:
+            entry.future.set_result(FlushResult())
+            return
+        with self._cond:
+            queue.append(entry)
+            self._pending_rows += len(entry.rows)
+            if self._oldest is None:
+                self._oldest = entry.added_at
+            closed = self._closed
+            if not closed and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+        if closed:
+            # Nothing will flush for us after close()
+            self.flush()
+
+    def _due(self) -> bool:
+        if self._pending_rows >= self.max_rows:
+            return True
+        return self._oldest is not None and time.monotonic() - self._oldest >= self.flush_interval
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed and not self._due():
+                    timeout = None
+                    if self._oldest is not None:
+                        timeout = max(self._oldest + self.flush_interval - time.monotonic(), 0.0)
+                    self._cond.wait(timeout)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                # Keep the thread alive so later rows are still written
+                logger.error(f"Write-behind flush thread error: {e}")
+
+    def flush(self) -> None:
+        """Write every buffered row now; returns once rows added before the call are written"""
+        with self._flush_lock:
+            with self._cond:
+                skiptraces, self._skiptraces = self._skiptraces, []
+                costs, self._costs = self._costs, []
+                self._pending_rows = 0
+                self._oldest = None
+            if not skiptraces and not costs:
+                return
+
+            start = time.monotonic()
+            try:
+                for is_sandbox in (False, True):
+                    self._write_skiptraces([entry for entry in skiptraces if entry.is_sandbox == is_sandbox],
+                                           is_sandbox)
+                groups: Dict[tuple, List[_Entry]] = {}
+                for entry in costs:
+                    groups.setdefault((entry.is_sandbox, entry.cost_per_lookup), []).append(entry)
+                for (is_sandbox, cost_per_lookup), entries in groups.items():
+                    self._write_costs(entries, cost_per_lookup, is_sandbox)
+            except Exception as e:
+                # Anything outside _write (grouping, matching rows back to callers) would
+                # otherwise leave the remaining futures unresolved and their callers hanging
+                self.failures += 1
+                logger.error(f"Write-behind flush failed: {e}")
+                for entry in skiptraces + costs:
+                    if not entry.future.done():
+                        self._resolve(entry, FlushResult(error=str(e)))
+
+            elapsed = time.monotonic() - start
+            self.flushes += 1
+            self.last_flush_latency = elapsed
+            self.max_flush_latency = max(self.max_flush_latency, elapsed)
+            logger.info(f"Write-behind flush: {sum(len(e.rows) for e in skiptraces + costs)} rows "
+                        f"in {elapsed * 1000:.0f} ms")
+
+    def _chunks(self, entries: List[_Entry]):
+        """Group whole entries into requests of about max_rows rows"""
+        chunk, size = [], 0
+        for entry in entries:
+            if chunk and size + len(entry.rows) > self.max_rows:
+                yield chunk
+                chunk, size = [], 0
+            chunk.append(entry)
+            size += len(entry.rows)
+        if chunk:
+            yield chunk
+
+    def _write_skiptraces(self, entries: List[_Entry], is_sandbox: bool) -> None:
+        for chunk in self._chunks(entries):
+            rows = [row for entry in chunk for row in entry.rows]
+            inserted = self._write(lambda: self.db.insert_skiptraces(rows, is_sandbox=is_sandbox), chunk)
+            if inserted is None:
+                continue
+            self.rows_written += len(inserted)
+            by_key = {(row['docket_number'], row['phone_number']): row for row in inserted}
+            for entry in chunk:
+                stored = [by_key.pop(key) for key in dict.fromkeys((row['docket_number'], row['phone_number'])
+                                                                   for row in entry.rows) if key in by_key]
+                self._resolve(entry, FlushResult(rows=stored))
+
+    def _write_costs(self, entries: List[_Entry], cost_per_lookup: float, is_sandbox: bool) -> None:
+        for chunk in self._chunks(entries):
+            lookup_counts: Dict[str, int] = {}
+            for entry in chunk:
+                for row in entry.rows:
+                    lookup_counts[row['docket_number']] = lookup_counts.get(row['docket_number'], 0) + row['lookup_count']
+            records = self._write(lambda: self.db.record_skip_trace_costs(lookup_counts, cost_per_lookup,
+                                                                          is_sandbox=is_sandbox), chunk)
+            if records is None:
+                continue
+            self.rows_written += len(records)
+            by_docket = {record['docket_number']: record for record in records}
+            for entry in chunk:
+                self._resolve(entry, FlushResult(rows=[by_docket[row['docket_number']] for row in entry.rows
+                                                       if row['docket_number'] in by_docket]))
+
+    def _write(self, write, chunk: List[_Entry]):
+        """Run one batched request; on failure resolve the chunk's futures with the error"""
+        self.requests += 1
+        try:
+            written = write()
+            error = None if written is not None else 'database write failed'
+        except Exception as e:
+            written, error = None, str(e)
+        if error:
+            self.failures += 1
+            logger.error(f"Write-behind flush of {sum(len(e.rows) for e in chunk)} rows failed: {error}")
+            for entry in chunk:
+                self._resolve(entry, FlushResult(error=error))
+        return written
+
+    @staticmethod
+    def _resolve(entry: _Entry, result: FlushResult) -> None:
+        result.latency = time.monotonic() - entry.added_at
+        entry.future.set_result(result)
+
+    def close(self) -> None:
+        """Stop the flush thread and write everything still buffered"""
+        with self._cond:
+            self._closed = True
+            thread = self._thread
+            self._cond.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self.flush()
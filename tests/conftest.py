@@ -0,0 +1,255 @@
+"""
+In-memory Supabase stand-ins shared by the database connector tests
+
+The unittest modules import FakeClient / FakeAsyncClient from here and pass
+them to the connectors' constructors; pytest tests can use the supabase and
+db fixtures instead.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from db_connector import DatabaseConnector
+
+try:
+    import pytest
+except ImportError:
+    # Plain unittest runs import the stand-ins without pytest installed
+    pytest = None
+
+
+class FakeQuery:
+    """One PostgREST request, run against FakeClient.tables when executed
+
+    Supports the filters, ordering, ranges, keyset cursors and writes the
+    connectors build.
+    """
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.predicates = []
+        self.ordering = []
+        self.window = None
+        self.after = None
+        self.count = None
+        self.rows = None
+        self.on_conflict = None
+        self.ignore_duplicates = False
+        self.deleting = False
+
+    def select(self, columns="*", count=None):
+        self.client.selects.append(columns)
+        self.count = count
+        return self
+
+    def eq(self, column, value):
+        self.predicates.append(lambda row: row.get(column) == value)
+        return self
+
+    def in_(self, column, values):
+        values = set(values)
+        self.predicates.append(lambda row: row.get(column) in values)
+        return self
+
+    def gt(self, column, value):
+        self.predicates.append(lambda row: row.get(column) > value)
+        return self
+
+    def or_(self, expression):
+        # Only list_page's keyset filter: created_at.lt."<ts>",and(created_at.eq."<ts>",id.lt.<id>)
+        self.client.or_filters.append(expression)
+        created_at = expression.split('"')[1]
+        row_id = int(expression.rsplit('id.lt.', 1)[1].rstrip(')'))
+        self.after = (created_at, row_id)
+        return self
+
+    def order(self, column, desc=False):
+        self.ordering.append((column, desc))
+        return self
+
+    def range(self, start, end):
+        self.window = (start, end + 1)
+        return self
+
+    def insert(self, rows, default_to_null=True):
+        self.rows = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def upsert(self, rows, on_conflict='', ignore_duplicates=False, default_to_null=True):
+        self.insert(rows)
+        self.on_conflict = on_conflict.split(',')
+        self.ignore_duplicates = ignore_duplicates
+        return self
+
+    def delete(self):
+        self.deleting = True
+        return self
+
+    def execute(self):
+        return self.client._execute(self._run)
+
+    def _run(self):
+        table = self.client.tables.setdefault(self.table, [])
+        if self.rows is not None:
+            return self._write(table)
+
+        rows = [row for row in table if all(predicate(row) for predicate in self.predicates)]
+        if self.deleting:
+            self.client.tables[self.table] = [row for row in table if row not in rows]
+            return SimpleNamespace(data=rows, count=None)
+        for column, desc in reversed(self.ordering):
+            if all(column in row for row in rows):
+                rows.sort(key=lambda row: row[column], reverse=desc)
+        if self.after:
+            rows = [row for row in rows if (row['created_at'], row['id']) < self.after]
+        total = len(rows) if self.count else None
+        if self.window:
+            self.client.windows.append(self.window)
+            rows = rows[self.window[0]:self.window[1]]
+        return SimpleNamespace(data=rows, count=total)
+
+    def _write(self, table):
+        for row in self.rows:
+            if row.get('name') in self.client.reject_names:
+                raise Exception('null value in column "address" violates not-null constraint')
+        if self.on_conflict is None:
+            table.extend(dict(row) for row in self.rows)
+            return SimpleNamespace(data=self.rows, count=None)
+
+        written = []
+        for row in self.rows:
+            key = tuple(row.get(c) for c in self.on_conflict)
+            match = next((r for r in table if tuple(r.get(c) for c in self.on_conflict) == key), None)
+            if match is None:
+                table.append(dict(row))
+                written.append(row)
+            elif not self.ignore_duplicates:
+                match.update(row)
+                written.append(match)
+        return SimpleNamespace(data=written, count=None)
+
+
+class FakeClient:
+    """Sync Supabase client stand-in
+
+    Tables are lists of row dicts. The database functions the connectors call
+    are modelled in Python; rpc_results overrides a function with a fixed
+    result (or a callable taking the params).
+    """
+
+    def __init__(self, tables=None, latency=0.0):
+        self.tables = tables if tables is not None else {}
+        # Seconds each request blocks, like a network round trip
+        self.latency = latency
+        self.requests = 0
+        # 1-based request number that raises, to simulate a dropped connection
+        self.fail_on = None
+        # Rows with these names fail to insert, like a constraint violation
+        self.reject_names = set()
+        self.selects = []
+        self.windows = []
+        self.or_filters = []
+        self.rpc_calls = []
+        self.rpc_results = {}
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        self.rpc_calls.append((name, params))
+        return SimpleNamespace(execute=lambda: self._execute(lambda: self._call(name, params)))
+
+    def _execute(self, run):
+        time.sleep(self.latency)
+        return self._count_request(run)
+
+    def _count_request(self, run):
+        self.requests += 1
+        if self.requests == self.fail_on:
+            raise ConnectionError('connection reset')
+        return run()
+
+    def _call(self, name, params):
+        if name in self.rpc_results:
+            result = self.rpc_results[name]
+            return SimpleNamespace(data=result(params) if callable(result) else result)
+        functions = {
+            'increment_skip_trace_costs': self._increment_costs,
+            'skip_trace_spend_total': self._spend_total,
+            'skip_trace_hit_rates': self._hit_rates
+        }
+        return SimpleNamespace(data=functions[name](params))
+
+    def _increment_costs(self, params):
+        """increment_skip_trace_costs: add to lookup_count per docket and sandbox, and append to the ledger"""
+        table = self.tables.setdefault('skiptrace_costs', [])
+        ledger = self.tables.setdefault('skiptrace_spend', [])
+        written = []
+        for delta in params['deltas']:
+            ledger.append({'docket_number': delta['docket_number'], 'is_sandbox': delta['is_sandbox'],
+                           'amount': round(delta['lookup_count'] * delta['cost_per_lookup'], 4)})
+            match = next((r for r in table if (r['docket_number'], r['is_sandbox']) ==
+                          (delta['docket_number'], delta['is_sandbox'])), None)
+            if match is None:
+                match = dict(delta)
+                table.append(match)
+            else:
+                match['lookup_count'] += delta['lookup_count']
+            written.append(match)
+        return written
+
+    def _spend_total(self, params):
+        """skip_trace_spend_total: the ledger summed server-side (dates are not modelled)"""
+        return sum(row['amount'] for row in self.tables.get('skiptrace_spend', [])
+                   if row['is_sandbox'] == params['p_is_sandbox'])
+
+    def _hit_rates(self, params):
+        """skip_trace_hit_rates: paid-for dockets per town and how many have phones"""
+        towns = {case['docket_number']: case['town'] for case in self.tables.get('cases', [])}
+        table = 'skiptrace_sandbox' if params['p_is_sandbox'] else 'skiptrace'
+        found = {row['docket_number'] for row in self.tables.get(table, [])}
+        rates = {}
+        for cost in self.tables.get('skiptrace_costs', []):
+            if cost['is_sandbox'] != params['p_is_sandbox'] or not cost['lookup_count']:
+                continue
+            town = towns[cost['docket_number']]
+            row = rates.setdefault(town, {'town': town, 'traced': 0, 'hits': 0})
+            row['traced'] += 1
+            row['hits'] += cost['docket_number'] in found
+        return list(rates.values())
+
+
+class FakeAsyncClient(FakeClient):
+    """Async Supabase client stand-in; requests wait latency seconds without blocking the loop"""
+
+    def __init__(self, tables=None, latency=0.0):
+        super().__init__(tables, latency)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _execute(self, run):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        return self._count_request(run)
+
+
+if pytest is not None:
+    @pytest.fixture
+    def supabase():
+        """Empty FakeClient"""
+        return FakeClient()
+
+    @pytest.fixture
+    def db(supabase):
+        """DatabaseConnector over the supabase fixture"""
+        return DatabaseConnector(client=supabase)
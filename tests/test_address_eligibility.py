@@ -0,0 +1,102 @@
+"""
+Test the pre-flight eligibility screen for skip trace addresses
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from address_eligibility import (AddressEligibility, HitRates, REASON_LOW_SCORE, REASON_NO_HOUSE_NUMBER,
+                                 REASON_PARCEL_ID, REASON_PLACEHOLDER, REASON_PLACEHOLDER_ZIP)
+from batch_api_connector import BatchAPIConnector
+from skip_trace_integration import SkipTraceIntegration
+
+
+class FakeDB:
+    """Case data and review queue for the integration"""
+
+    def __init__(self, defendants, hit_rates=None):
+        self.defendants = defendants
+        self.hit_rates = hit_rates or {}
+        self.review_queue = []
+
+    def has_been_skip_traced(self, docket_number, is_sandbox=False):
+        return False
+
+    def get_case_by_docket(self, docket_number):
+        return {'docket_number': docket_number, 'town': 'Middletown'}
+
+    def get_defendants_by_docket(self, docket_number):
+        return self.defendants
+
+    def get_skip_trace_hit_rates(self, is_sandbox=False):
+        return self.hit_rates
+
+    def queue_addresses_for_review(self, rows):
+        self.review_queue.extend(rows)
+        return rows
+
+
+class TestAddressEligibility(unittest.TestCase):
+    """Test the hard rules, hit-rate scoring and the integration hand-off"""
+
+    def test_scraped_placeholders_are_ineligible(self):
+        eligibility = AddressEligibility()
+        cases = {
+            "See Clerk's Note": REASON_PLACEHOLDER,
+            "BOW LANESEE COMPLAINT": REASON_PLACEHOLDER,
+            "Lakeside Ave.Parcel ID R08451": REASON_PARCEL_ID,
+            "Laurel Grove Rd.MBL16-0305": REASON_PARCEL_ID,
+            "Bow Lane": REASON_NO_HOUSE_NUMBER,
+        }
+        for address, reason in cases.items():
+            result = eligibility.evaluate(address, town='Middletown')
+            self.assertFalse(result.eligible, address)
+            self.assertIn(reason, result.reasons)
+
+    def test_good_address_is_eligible(self):
+        result = AddressEligibility().evaluate("#830 Bow Lane", town='Middletown')
+        self.assertTrue(result.eligible)
+        self.assertEqual(result.record.street, '830 BOW LN')
+
+    def test_placeholder_zip_lowers_score(self):
+        eligibility = AddressEligibility()
+        good = eligibility.evaluate("647 Minor St, Middletown, CT 06457")
+        placeholder = eligibility.evaluate("647 Minor St, Middletown, CT 00000")
+        self.assertIn(REASON_PLACEHOLDER_ZIP, placeholder.reasons)
+        self.assertLess(placeholder.score, good.score)
+
+    def test_history_can_hold_weak_addresses(self):
+        # Hartford rarely returns phones; its weak addresses are held, Middletown's are not
+        rates = HitRates.from_counts({
+            'Hartford': {'traced': 200, 'hits': 20},
+            'Middletown': {'traced': 200, 'hits': 160},
+        })
+        self.assertAlmostEqual(rates.prior, 0.45)
+        eligibility = AddressEligibility(rates)
+        weak = eligibility.evaluate("12 Main", town='Hartford')
+        self.assertFalse(weak.eligible)
+        self.assertIn(REASON_LOW_SCORE, weak.reasons)
+        self.assertTrue(eligibility.evaluate("12 Main", town='Middletown').eligible)
+
+    def test_integration_queues_held_addresses(self):
+        db = FakeDB([
+            {'name': 'Jane Doe', 'address': '830 Bow Lane'},
+            {'name': 'John Doe', 'address': "See Clerk's Note"},
+        ])
+        api = BatchAPIConnector('local', api_token='test-token')
+        self.addCleanup(api.close)
+        integration = SkipTraceIntegration(use_sandbox=True, db=db, api=api)
+
+        stats, lookups = integration._collect_case_lookups('MMX-CV-25-6045000-S')
+        self.assertEqual([lookup['defendant'] for lookup in lookups], ['Jane Doe'])
+        self.assertEqual(stats['addresses_processed'], 1)
+        self.assertEqual(stats['addresses_held'], 1)
+        self.assertEqual(db.review_queue[0]['defendant_name'], 'John Doe')
+        self.assertIn(REASON_PLACEHOLDER, db.review_queue[0]['reason'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Test address normalization used for skip trace lookups and cache keys
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from address_normalizer import normalize_address, normalize_addresses, normalize_address_fields
+
+
+class TestAddressNormalizer(unittest.TestCase):
+    """Test parsing of the address formats found in scraped case data"""
+
+    def test_full_address(self):
+        """Street, city, state and ZIP+4 are split and abbreviated"""
+        record = normalize_address("123 North Main Street, Middletown, CT 06457-1234")
+        self.assertEqual(record.street, '123 N MAIN ST')
+        self.assertEqual(record.city, 'MIDDLETOWN')
+        self.assertEqual(record.state, 'CT')
+        self.assertEqual(record.zip, '06457')
+        self.assertEqual(record.house_number, '123')
+
+    def test_city_state_zip_without_commas(self):
+        """"City ST ZIP" in one part is split the same way"""
+        record = normalize_address("1011 Rosegold St, Franklin Square NY 11010-2507")
+        self.assertEqual(record.to_api_dict(), {
+            'street': '1011 ROSEGOLD ST', 'city': 'FRANKLIN SQUARE', 'state': 'NY', 'zip': '11010'
+        })
+
+    def test_full_state_name(self):
+        """A spelled-out state is recognized and abbreviated, not glued onto the city"""
+        record = normalize_address("25 Court St, Middletown, Connecticut 06457")
+        self.assertEqual((record.city, record.state, record.zip), ('MIDDLETOWN', 'CT', '06457'))
+        record = normalize_address("1 Main St, New York New York 10001")
+        self.assertEqual((record.city, record.state), ('NEW YORK', 'NY'))
+        record = normalize_address("25 Court St Middletown Connecticut")
+        self.assertEqual((record.street, record.state), ('25 COURT ST MIDDLETOWN', 'CT'))
+        # Washington, CT keeps its name when no state follows
+        self.assertEqual(normalize_address("2 Green Hill Rd, Washington 06793").city, 'WASHINGTON')
+        self.assertEqual(normalize_address_fields("2 Main St", state="Connecticut").state, 'CT')
+
+    def test_scraped_street_only(self):
+        """Scraped streets get the case's town and the CT default"""
+        record = normalize_address("#830 Bow Lane", default_city='Middletown')
+        self.assertEqual(record.to_api_dict(), {
+            'street': '830 BOW LN', 'city': 'MIDDLETOWN', 'state': 'CT', 'zip': ''
+        })
+
+    def test_units(self):
+        """Unit designators are recognized glued, in their own part, or with #"""
+        self.assertEqual(normalize_address("1 Russell St.Unit 5").street_line, '1 RUSSELL ST UNIT 5')
+        self.assertEqual(normalize_address("1 Russell St., Unit 5, Middletown, CT 06457").street_line,
+                         '1 RUSSELL ST UNIT 5')
+        record = normalize_address("55 Elm Street Apartment 2B")
+        self.assertEqual(record.street, '55 ELM ST')
+        self.assertEqual(record.unit, 'APT 2B')
+
+    def test_streets_named_like_units(self):
+        """A designator that is the street name is not split off as a unit"""
+        record = normalize_address("100 Suite Rd, Hartford, CT")
+        self.assertEqual((record.street, record.unit), ('100 SUITE RD', None))
+        record = normalize_address("77 Lot Ln", default_city='Durham')
+        self.assertEqual((record.street, record.unit), ('77 LOT LN', None))
+        self.assertEqual(normalize_address("12 Unit Rd Apt 3").street_line, '12 UNIT RD APT 3')
+        self.assertEqual(normalize_address("9 Main St Lot 14").unit, 'LOT 14')
+
+    def test_glued_organization_name_dropped(self):
+        """Association names glued onto the street are removed"""
+        record = normalize_address("139 Carriage Crossing LaneCarriage Crossing Association Inc.")
+        self.assertEqual(record.street, '139 CARRIAGE CROSSING LN')
+
+    def test_placeholder_zip(self):
+        """ZIP 00000 from the court site is treated as missing"""
+        self.assertEqual(normalize_address("647 MINOR ST., MIDDLETOWN, CT 00000").zip, '')
+
+    def test_cache_key_matches_across_spellings(self):
+        """Different spellings of one address share a cache key"""
+        records = normalize_addresses([
+            "12 Longworth Avenue, Middletown, CT 06457",
+            "12 LONGWORTH AVE., MIDDLETOWN CT 06457-0001",
+        ])
+        fields = normalize_address_fields('12 longworth ave', 'Middletown', 'ct', '06457')
+        self.assertEqual(records[0].cache_key, records[1].cache_key)
+        self.assertEqual(records[0].cache_key, fields.cache_key)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+"""
+Test AsyncDatabaseConnector and the API routers against a slow in-memory async PostgREST stand-in
+"""
+
+import asyncio
+import os
+import sys
+import time
+import unittest
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+os.environ.setdefault('SUPABASE_URL', 'http://localhost:54321')
+os.environ.setdefault('SUPABASE_ANON_KEY', 'test-key')
+
+import httpx
+from async_db_connector import AsyncDatabaseConnector
+from conftest import FakeAsyncClient
+from api.dependencies import get_db
+from api.main import app
+
+QUERY_LATENCY = 0.1
+
+
+def make_db():
+    cases = [{'id': i, 'case_name': f"Case {i}", 'docket_number': f"D{i}", 'town': 'Middletown',
+              'created_at': '2025-01-01T00:00:00+00:00'} for i in range(10)]
+    return AsyncDatabaseConnector(FakeAsyncClient({'cases': cases, 'defendants': []}, latency=QUERY_LATENCY))
+
+
+class TestAsyncDatabaseConnector(unittest.TestCase):
+    """Test that database waits overlap instead of queueing on the event loop"""
+
+    def test_queries_overlap(self):
+        db = make_db()
+
+        async def run():
+            start = time.perf_counter()
+            cases = await asyncio.gather(*(db.get_case_by_docket(f"D{i}") for i in range(10)))
+            return cases, time.perf_counter() - start
+
+        cases, elapsed = asyncio.run(run())
+        self.assertEqual([case['case_name'] for case in cases], [f"Case {i}" for i in range(10)])
+        self.assertEqual(db.client.max_in_flight, 10)
+        self.assertLess(elapsed, QUERY_LATENCY * 3)
+
+    def test_insert_ignore_dedupes_on_key(self):
+        db = make_db()
+        inserted = asyncio.run(db.insert_ignore('ct_towns', [{'town': 'Durham'}, {'town': 'Durham'}], 'town'))
+        self.assertEqual(inserted, [{'town': 'Durham'}])
+
+    def test_docket_chunks_are_fetched_concurrently(self):
+        db = make_db()
+        db.client.tables['skiptrace'] = [{'id': 1, 'docket_number': 'D3', 'phone_number': '860-555-0100'}]
+        dockets = [f"D{i}" for i in range(450)]
+
+        async def run():
+            start = time.perf_counter()
+            traced = await db.have_been_skip_traced(dockets)
+            return traced, time.perf_counter() - start
+
+        traced, elapsed = asyncio.run(run())
+        self.assertEqual([docket for docket, done in traced.items() if done], ['D3'])
+        self.assertEqual(len(traced), 450)
+        # Three IN_FILTER_CHUNK chunks in flight at once
+        self.assertEqual(db.client.max_in_flight, 3)
+        self.assertLess(elapsed, QUERY_LATENCY * 2)
+
+    def test_failed_chunk_is_not_a_partial_result(self):
+        db = make_db()
+        db.client.fail_on = 2
+        self.assertIsNone(asyncio.run(db.get_full_cases_data([f"D{i}" for i in range(450)])))
+
+    def test_bulk_ingest_skips_existing_dockets(self):
+        db = make_db()
+        cases = [{'case_name': 'Case 1', 'docket_number': 'D1', 'town': 'Middletown'},
+                 {'case_name': 'Case 10', 'docket_number': 'D10', 'town': 'Middletown'}]
+        defendants = [{'name': 'Old Owner', 'docket_number': 'D1'}, {'name': 'New Owner', 'docket_number': 'D10'}]
+        summary = asyncio.run(db.bulk_ingest_cases(cases, defendants))
+        self.assertEqual([case['status'] for case in summary['cases']], ['exists', 'inserted'])
+        self.assertEqual([row['name'] for row in db.client.tables['defendants']], ['New Owner'])
+
+    def test_costs_and_spend_go_through_rpcs(self):
+        db = make_db()
+        db.client.rpc_results = {
+            'increment_skip_trace_costs': lambda params: params['deltas'],
+            'skip_trace_spend_total': 0.21
+        }
+
+        async def run():
+            records = await db.record_skip_trace_costs({'D1': 2, 'D2': 0, 'D3': 1})
+            return records, await db.get_skip_trace_spend(datetime(2025, 1, 1, tzinfo=timezone.utc))
+
+        records, spend = asyncio.run(run())
+        self.assertEqual([(row['docket_number'], row['lookup_count']) for row in records], [('D1', 2), ('D3', 1)])
+        self.assertEqual(spend, 0.21)
+        self.assertEqual(db.client.rpc_calls[1][1]['p_since'], '2025-01-01T00:00:00+00:00')
+
+    def test_routers_serve_requests_concurrently(self):
+        db = make_db()
+        app.dependency_overrides[get_db] = lambda: db
+        self.addCleanup(app.dependency_overrides.clear)
+
+        async def run():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+                start = time.perf_counter()
+                # Each case request makes two sequential queries (case, then defendants)
+                responses = await asyncio.gather(*(client.get(f"/api/v1/cases/D{i}") for i in range(10)))
+                return responses, time.perf_counter() - start
+
+        responses, elapsed = asyncio.run(run())
+        self.assertEqual({response.status_code for response in responses}, {200})
+        self.assertEqual(responses[3].json()['docket_number'], 'D3')
+        self.assertLess(elapsed, QUERY_LATENCY * 2 * 3)
+
+    def test_costs_are_aggregated_server_side(self):
+        db = make_db()
+        db.client.rpc_results = {
+            'skip_trace_cost_summary': {
+                'total_cases': 3, 'total_lookups': 10, 'total_cost': 0.70,
+                'by_environment': [{'is_sandbox': False, 'cases': 2, 'lookups': 8, 'cost': 0.56},
+                                   {'is_sandbox': True, 'cases': 1, 'lookups': 2, 'cost': 0.14}],
+                'by_town': [{'town': 'Middletown', 'cases': 3, 'lookups': 10, 'cost': 0.70}],
+                'by_day': [{'day': '2025-01-01', 'is_sandbox': False, 'lookups': 8, 'cost': 0.56}]
+            },
+            'skip_trace_cost_details': [{'docket_number': 'D1', 'lookup_count': 4},
+                                        {'docket_number': 'D2', 'lookup_count': 4}]
+        }
+        app.dependency_overrides[get_db] = lambda: db
+        self.addCleanup(app.dependency_overrides.clear)
+
+        async def run():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+                return await client.get('/api/v1/skiptraces/costs', params={
+                    'town': 'Middletown', 'end_date': '2025-01-31', 'details_limit': 1
+                })
+
+        response = asyncio.run(run())
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual((body['production_lookups'], body['sandbox_lookups']), (8, 2))
+        self.assertAlmostEqual(body['average_cost_per_lookup'], 0.07)
+        self.assertEqual(body['by_town'][0]['town'], 'Middletown')
+        self.assertEqual([row['docket_number'] for row in body['details']], ['D1'])
+        self.assertTrue(body['details_has_more'])
+        # No table reads: one summary call and one page of details (limit + 1)
+        self.assertEqual(db.client.selects, [])
+        (summary_name, summary), (details_name, details) = db.client.rpc_calls
+        self.assertEqual(summary_name, 'skip_trace_cost_summary')
+        self.assertEqual(summary['p_until'], '2025-02-01T00:00:00+00:00')
+        self.assertEqual((details_name, details['p_limit'], details['p_town']),
+                         ('skip_trace_cost_details', 2, 'Middletown'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -22,5 +22,21 @@ class TestBatchAPIConnector(unittest.TestCase):
                 if response:
                     self.assertIsInstance(response[0], str)
 
+    def test_send_skip_trace_batch(self):
+        """
+        Tests that send_skip_trace_batch returns one phone list per input address,
+        even when the addresses span several requests.
+        """
+        connector = BatchAPIConnector(env='sandbox', batch_size=2)
+        with open('tests/batchapi_test_cases.json', 'r') as f:
+            test_cases = json.load(f)
+
+        addresses = [test_case['propertyAddress'] for test_case in test_cases['requests']]
+        responses = connector.send_skip_trace_batch(addresses)
+        print(f"Output: {responses}")
+        self.assertEqual(len(responses), len(addresses))
+        for response in responses:
+            self.assertIsInstance(response, list)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,146 @@
+"""
+Test BatchAPIConnector against the local BatchData stand-in server
+"""
+
+import asyncio
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+import httpx
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batchdata_stub_server import StubConfig, phones_for_address, start_in_thread
+from batch_api_connector import BatchAPIConnector, LOOKUP_FAILED, LOOKUP_THROTTLED
+from async_batch_api_connector import AsyncBatchAPIConnector
+from rate_governor import CIRCUIT_CLOSED, BatchDataAuthError, RateGovernor
+
+
+ADDRESSES = [{'street': f'{n} Main St', 'city': 'Middletown', 'state': 'CT', 'zip': '06457'} for n in range(1, 21)]
+
+
+class TestStubServer(unittest.TestCase):
+    """Run the connectors against an in-process stand-in server"""
+
+    def start(self, **overrides):
+        config = StubConfig(latency_ms=1, latency_distribution='fixed', seed=1, **overrides)
+        server, url = start_in_thread(config)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server, url
+
+    def test_batch_lookup_matches_deterministic_phones(self):
+        """Every address gets the phones the server derives for it"""
+        server, url = self.start(hit_rate=0.5)
+        connector = BatchAPIConnector('local', batch_size=8, base_url=url)
+        self.addCleanup(connector.close)
+
+        results = connector.send_skip_trace_batch(ADDRESSES)
+        expected = [phones_for_address(connector._to_property_address(a), 3, 0.5) for a in ADDRESSES]
+        self.assertEqual(results, expected)
+        self.assertTrue(any(results) and not all(results))
+        self.assertEqual(server.state.counters['ok'], 3)
+
+    def test_batch_limit_and_errors(self):
+        """Oversized batches and server errors come back as failed lookups"""
+        _, url = self.start(max_batch_size=5)
+        connector = BatchAPIConnector('local', batch_size=10, base_url=url)
+        self.addCleanup(connector.close)
+        statuses = {result.status for result in connector.lookup_batch(ADDRESSES[:10])}
+        self.assertEqual(statuses, {LOOKUP_FAILED})
+
+    def test_throttled_requests_are_retried(self):
+        """429s with Retry-After are waited out and the lookups still succeed"""
+        server, url = self.start(rate_limit=2, retry_after=0.2)
+        connector = BatchAPIConnector('local', batch_size=4, base_url=url,
+                                      governor=RateGovernor(rate_per_second=100, burst=10))
+        self.addCleanup(connector.close)
+
+        results = connector.lookup_batch(ADDRESSES[:16])
+        self.assertTrue(all(result.ok for result in results))
+        self.assertGreater(server.state.counters['throttled'], 0)
+
+    def test_throttle_exhausted(self):
+        """Lookups still throttled after the retries are reported as throttled"""
+        _, url = self.start(throttle_rate=1.0, retry_after=0)
+        connector = BatchAPIConnector('local', base_url=url, governor=RateGovernor(max_throttle_retries=1))
+        self.addCleanup(connector.close)
+        self.assertEqual(connector.lookup_batch(ADDRESSES[:1])[0].status, LOOKUP_THROTTLED)
+
+    def test_rejected_token_raises_without_opening_circuit(self):
+        """401s are raised to the caller and do not count as upstream failures"""
+        server, url = self.start(token='right-token')
+        governor = RateGovernor(failure_threshold=1)
+        connector = BatchAPIConnector('local', base_url=url, api_token='wrong-token', governor=governor)
+        self.addCleanup(connector.close)
+        for _ in range(3):
+            with self.assertRaises(BatchDataAuthError) as raised:
+                connector.lookup_batch(ADDRESSES[:1], bypass_cache=True)
+        self.assertEqual(raised.exception.status_code, 401)
+        self.assertEqual(governor.state, CIRCUIT_CLOSED)
+        self.assertEqual((governor.failures, governor.auth_errors), (0, 3))
+        self.assertEqual(server.state.counters['rejected'], 3)
+
+    def test_rejected_probe_closes_circuit(self):
+        """A 400 answering the half-open probe shows the service is up, so requests resume"""
+        _, url = self.start(max_batch_size=1)
+        governor = RateGovernor(failure_threshold=1, reset_timeout=0.05)
+        connector = BatchAPIConnector('local', base_url=url, governor=governor)
+        self.addCleanup(connector.close)
+        governor.record_failure()
+        time.sleep(0.06)
+
+        results = connector.lookup_batch(ADDRESSES[:2], bypass_cache=True)
+        self.assertTrue(results[0].error.startswith('HTTP 400'))
+        self.assertEqual(governor.state, CIRCUIT_CLOSED)
+        self.assertTrue(connector.lookup_batch(ADDRESSES[:1], bypass_cache=True)[0].ok)
+
+    def test_async_connector(self):
+        """The async connector gets the same answers"""
+        _, url = self.start()
+
+        async def run():
+            connector = AsyncBatchAPIConnector('local', batch_size=5, base_url=url)
+            try:
+                return await connector.send_skip_trace_batch(ADDRESSES)
+            finally:
+                await connector.aclose()
+
+        sync_connector = BatchAPIConnector('local', batch_size=5, base_url=url)
+        self.addCleanup(sync_connector.close)
+        self.assertEqual(asyncio.run(run()), sync_connector.send_skip_trace_batch(ADDRESSES))
+
+
+class TestUnreadableResponse(unittest.TestCase):
+    """A 200 whose body is not JSON fails the chunk instead of raising"""
+
+    def test_sync_connector(self):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'<html>Bad gateway</html>'
+        connector = BatchAPIConnector('local', base_url='http://stub.invalid')
+        self.addCleanup(connector.close)
+        with mock.patch.object(connector.session, 'post', return_value=response):
+            results = connector.lookup_batch(ADDRESSES[:2], bypass_cache=True)
+        self.assertEqual({result.status for result in results}, {LOOKUP_FAILED})
+        self.assertIn('Unreadable', results[0].error)
+
+    def test_async_connector(self):
+        async def run():
+            connector = AsyncBatchAPIConnector('local', base_url='http://stub.invalid')
+            try:
+                with mock.patch.object(connector.session, 'post',
+                                       return_value=httpx.Response(200, text='{"responses": [')):
+                    return await connector.lookup_batch(ADDRESSES[:2], bypass_cache=True)
+            finally:
+                await connector.aclose()
+
+        self.assertEqual({result.status for result in asyncio.run(run())}, {LOOKUP_FAILED})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Test bulk ingest and natural-key upserts against an in-memory Supabase stand-in
+"""
+
+import os
+import sys
+import unittest
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from conftest import FakeClient
+from db_connector import DatabaseConnector, TOWN_KEY
+
+
+def make_db():
+    return DatabaseConnector(client=FakeClient())
+
+
+def make_rows(count):
+    cases = [{'case_name': f"Case {i}", 'docket_number': f"MMX-CV-25-{6045000 + i}-S", 'town': 'Middletown'}
+             for i in range(count)]
+    defendants = [{'name': f"Defendant {i}", 'docket_number': case['docket_number'], 'address': f"{i} Main St"}
+                  for i, case in enumerate(cases)]
+    return cases, defendants
+
+
+class TestBulkIngest(unittest.TestCase):
+    """Test request counts and per-row outcomes"""
+
+    def test_town_takes_a_handful_of_requests(self):
+        db = make_db()
+        cases, defendants = make_rows(500)
+        result = db.bulk_ingest_cases(cases, defendants)
+        self.assertEqual(result['cases_inserted'], 500)
+        self.assertEqual(result['defendants_inserted'], 500)
+        # 1 case insert-ignore + 1 defendant insert
+        self.assertEqual(db.client.requests, 2)
+
+    def test_existing_and_repeated_dockets_are_skipped(self):
+        db = make_db()
+        cases, defendants = make_rows(4)
+        db.client.tables['cases'] = [dict(cases[0])]
+        cases.append(dict(cases[1]))
+        defendants.append({'name': 'Repeat', 'docket_number': cases[1]['docket_number']})
+
+        result = db.bulk_ingest_cases(cases, defendants)
+        self.assertEqual([row['status'] for row in result['cases']],
+                         ['exists', 'inserted', 'inserted', 'inserted', 'exists'])
+        self.assertEqual(result['defendants'][0]['status'], 'skipped')
+        # Defendants of a case that is stored are all kept
+        self.assertEqual(result['defendants'][4]['status'], 'inserted')
+
+    def test_bad_row_does_not_sink_its_chunk(self):
+        db = make_db()
+        cases, defendants = make_rows(10)
+        db.client.reject_names = {'Defendant 3'}
+        result = db.bulk_ingest_cases(cases, defendants)
+        self.assertEqual(result['cases_inserted'], 10)
+        self.assertEqual(result['defendants_inserted'], 9)
+        failed = [row for row in result['defendants'] if row['status'] == 'failed']
+        self.assertEqual([row['name'] for row in failed], ['Defendant 3'])
+        self.assertIn('not-null', failed[0]['error'])
+
+
+class TestNaturalKeyWrites(unittest.TestCase):
+    """Test upsert and insert-ignore keyed on natural keys"""
+
+    def test_skiptraces_are_not_duplicated(self):
+        db = make_db()
+        rows = [{'docket_number': 'D1', 'phone_number': '860-555-0101'},
+                {'docket_number': 'D1', 'phone_number': '860-555-0102'},
+                {'docket_number': 'D1', 'phone_number': '860-555-0101'}]
+        self.assertEqual(len(db.insert_skiptraces(rows)), 2)
+        # A forced re-run stores only the new phone, in one request
+        requests = db.client.requests
+        rows.append({'docket_number': 'D1', 'phone_number': '860-555-0103'})
+        self.assertEqual([r['phone_number'] for r in db.insert_skiptraces(rows)], ['860-555-0103'])
+        self.assertEqual(db.client.requests, requests + 1)
+        self.assertEqual(len(db.client.tables['skiptrace']), 3)
+
+    def test_towns_insert_ignore_and_upsert(self):
+        db = make_db()
+        self.assertEqual(db.populate_ct_towns([('Middletown', 'Middlesex'), ('Hartford', 'Hartford')]), 2)
+        self.assertIsNone(db.insert_ct_town('Middletown', 'Middlesex'))
+        self.assertEqual(db.populate_ct_towns([('Middletown', 'Middlesex'), ('Durham', 'Middlesex')]), 1)
+
+        updated = db.upsert_rows('ct_towns', [{'town': 'Hartford', 'county': 'Capitol'}], TOWN_KEY)
+        self.assertEqual(updated[0]['county'], 'Capitol')
+        self.assertEqual(len(db.client.tables['ct_towns']), 3)
+
+    def test_costs_increment_in_one_call(self):
+        db = make_db()
+        self.assertEqual(db.record_skip_trace_cost('D1', 2)['lookup_count'], 2)
+        records = db.record_skip_trace_costs({'D1': 3, 'D2': 1, 'D3': 0})
+        self.assertEqual([(r['docket_number'], r['lookup_count']) for r in records], [('D1', 5), ('D2', 1)])
+        self.assertEqual(db.client.requests, 2)
+        self.assertEqual(db.client.rpc_calls[-1][0], 'increment_skip_trace_costs')
+        # Nothing billed, nothing sent
+        self.assertEqual(db.record_skip_trace_costs({'D4': 0}), [])
+        self.assertEqual(db.client.requests, 2)
+
+    def test_spend_ledger_is_written_and_summed_server_side(self):
+        db = make_db()
+        db.record_skip_trace_costs({'D1': 3, 'D2': 1})
+        db.record_skip_trace_costs({'D1': 1}, is_sandbox=True)
+        self.assertAlmostEqual(db.get_skip_trace_spend(datetime(2026, 1, 1, tzinfo=timezone.utc)), 0.28)
+        self.assertEqual(db.client.rpc_calls[-1][0], 'skip_trace_spend_total')
+        # One increment call each, one call for the total
+        self.assertEqual(db.client.requests, 3)
+
+    def test_cost_per_lookup_is_the_recorded_average(self):
+        db = make_db()
+        db.client.rpc_results = {
+            'skip_trace_cost_summary': {'total_cases': 3, 'total_lookups': 10, 'total_cost': 0.56},
+            'skip_trace_cost_details': []
+        }
+        # 8 production lookups at $0.07 and 2 free sandbox lookups
+        self.assertAlmostEqual(db.get_skip_trace_costs()['cost_per_lookup'], 0.056)
+        db.client.rpc_results['skip_trace_cost_summary'] = {}
+        self.assertEqual(db.get_skip_trace_costs()['cost_per_lookup'], 0.0)
+
+    def test_hit_rates_are_grouped_server_side(self):
+        db = make_db()
+        cases, _ = make_rows(3)
+        cases[2]['town'] = 'Hartford'
+        db.client.tables['cases'] = cases
+        db.client.tables['skiptrace'] = [{'docket_number': cases[0]['docket_number'], 'phone_number': '860-555-0100'}]
+        db.record_skip_trace_costs({case['docket_number']: 1 for case in cases})
+        db.client.requests = 0
+        self.assertEqual(db.get_skip_trace_hit_rates(), {'Middletown': {'traced': 2, 'hits': 1},
+                                                         'Hartford': {'traced': 1, 'hits': 0}})
+        self.assertEqual(db.client.requests, 1)
+
+
+def test_delete_case_through_the_fixture(db, supabase):
+    db.bulk_ingest_cases(*make_rows(2))
+    docket = supabase.tables['cases'][0]['docket_number']
+    assert db.delete_case(docket)
+    assert docket not in [case['docket_number'] for case in supabase.tables['cases']]
+    assert len(supabase.tables['cases']) == 1
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Test the process-wide connector registry and credential reloading
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_api_connector import LOCAL_URL, PROD_URL
+from batchdata_credentials import CredentialStore
+from connector_registry import ConnectorRegistry
+
+
+class TestConnectorRegistry(unittest.TestCase):
+    """Test connector reuse, shared governors and credential reloads"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, 'batchapi.csv')
+        self.write_tokens('sandbox-1', 'prod-1', mtime=1000)
+        self.credentials = CredentialStore(paths=[self.path], check_interval=0)
+        self.registry = ConnectorRegistry(self.credentials)
+        self.addCleanup(self.registry.close)
+
+    def write_tokens(self, sandbox, prod, mtime):
+        with open(self.path, 'w') as f:
+            f.write(f"sandbox,{sandbox}\nprod,{prod}\n")
+        os.utime(self.path, (mtime, mtime))
+
+    def test_connectors_are_reused(self):
+        first = self.registry.get_connector('prod', use_cache=False)
+        second = self.registry.get_connector('prod', use_cache=False)
+        self.assertIs(first, second)
+        self.assertEqual(first.api_token, 'prod-1')
+        self.assertIsNot(first, self.registry.get_connector('sandbox', use_cache=False))
+        self.assertEqual(self.credentials.loads, 1)
+
+    def test_tokens_reload_when_file_changes(self):
+        connector = self.registry.get_connector('prod', use_cache=False)
+        self.write_tokens('sandbox-2', 'prod-2', mtime=2000)
+        self.assertIs(self.registry.get_connector('prod', use_cache=False), connector)
+        self.assertEqual(connector.api_token, 'prod-2')
+        self.assertEqual(self.credentials.loads, 2)
+
+    def test_env_override_applies_to_its_environment_only(self):
+        with mock.patch.dict(os.environ, {'BATCHDATA_API_TOKEN_PROD': 'prod-env', 'BATCHDATA_API_TOKEN': 'any'}):
+            self.assertEqual(self.credentials.get_token('prod'), 'prod-env')
+            self.assertEqual(self.credentials.get_token('sandbox'), 'sandbox-1')
+            self.assertIsNone(self.credentials.get_token('local'))
+
+    def test_local_url_override_never_moves_prod(self):
+        stub = 'http://127.0.0.1:9999/api/v1/property/skip-trace'
+        with mock.patch.dict(os.environ, {'BATCHDATA_LOCAL_URL': stub}):
+            self.assertEqual(self.registry.get_connector('local', use_cache=False).base_url, stub)
+            self.assertEqual(self.registry.get_connector('prod', use_cache=False).base_url, PROD_URL)
+        self.assertEqual(self.registry.get_connector('local', use_cache=False).base_url, LOCAL_URL)
+
+    def test_async_connectors_share_governor(self):
+        sync_connector = self.registry.get_connector('prod', use_cache=False)
+
+        async def get_pair():
+            first = self.registry.get_async_connector('prod', use_cache=False)
+            second = self.registry.get_async_connector('prod', use_cache=False)
+            await self.registry.aclose()
+            return first, second
+
+        first, second = asyncio.run(get_pair())
+        self.assertIs(first, second)
+        self.assertIs(first.governor, sync_connector.governor)
+
+        # A new event loop gets its own async connector
+        third, _ = asyncio.run(get_pair())
+        self.assertIsNot(third, first)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+"""
+Test the multi-docket, full case and town stats reads against an in-memory Supabase stand-in
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import db_connector
+import scraper_db_integration
+from batch_api_connector import BatchAPIConnector
+from conftest import FakeClient
+from db_connector import DatabaseConnector
+from skip_trace_integration import SkipTraceIntegration
+
+
+def make_db(case_count, defendants_per_case=2, traced=()):
+    cases = [{'docket_number': f"D{i}", 'case_name': f"Case {i}", 'town': 'Middletown'} for i in range(case_count)]
+    defendants = [{'id': len(cases) * n + i, 'docket_number': case['docket_number'], 'name': f"Defendant {i}-{n}",
+                   'address': f"{i * 10 + n} Main St"}
+                  for i, case in enumerate(cases) for n in range(defendants_per_case)]
+    skiptrace = [{'id': i, 'docket_number': docket, 'phone_number': f"860-555-{i:04d}"}
+                 for i, docket in enumerate(traced)]
+    db = DatabaseConnector(client=FakeClient({'cases': cases, 'defendants': defendants, 'skiptrace': skiptrace}))
+    return db, cases
+
+
+def make_integration(test, db):
+    api = BatchAPIConnector('local', api_token='test-token')
+    test.addCleanup(api.close)
+    return SkipTraceIntegration(use_sandbox=False, screen_addresses=False, db=db, api=api)
+
+
+class TestDocketFetch(unittest.TestCase):
+    """Test get_*_by_dockets chunking, paging and grouping"""
+
+    def test_grouped_in_chunks(self):
+        db, cases = make_db(450)
+        dockets = [case['docket_number'] for case in cases]
+        grouped = db.get_defendants_by_dockets(dockets + ['MISSING'])
+        self.assertEqual(len(grouped['D7']), 2)
+        self.assertEqual(grouped['MISSING'], [])
+        # 451 dockets -> 3 chunks of at most 200, one page each
+        self.assertEqual(db.client.requests, 3)
+
+    def test_pages_past_row_limit(self):
+        db, cases = make_db(10, defendants_per_case=3)
+        with mock.patch.object(db_connector, 'SELECT_PAGE_SIZE', 4):
+            grouped = db.get_defendants_by_dockets([case['docket_number'] for case in cases])
+        self.assertEqual(sum(len(rows) for rows in grouped.values()), 30)
+        self.assertEqual(db.client.requests, 8)
+
+    def test_skip_trace_status(self):
+        db, _ = make_db(3, traced=['D1', 'D1'])
+        self.assertEqual(db.have_been_skip_traced(['D0', 'D1']), {'D0': False, 'D1': True})
+        self.assertEqual(len(db.get_skiptraces_by_dockets(['D1'])['D1']), 2)
+
+    def test_town_run_prepares_with_batched_reads(self):
+        db, _ = make_db(300, traced=['D0'])
+        integration = make_integration(self, db)
+
+        stats, pending = integration._prepare_town('Middletown')
+        self.assertEqual(len(pending), 300)
+        self.assertTrue(pending[0][0]['skipped'])
+        self.assertEqual(sum(len(lookups) for _, lookups in pending), 299 * 2)
+        # cases + 2 chunks of skip trace status + 2 chunks of defendants
+        self.assertEqual(db.client.requests, 5)
+
+    def test_failed_chunk_is_not_a_partial_result(self):
+        db, cases = make_db(450, traced=['D0'])
+        db.client.fail_on = 2
+        self.assertIsNone(db.have_been_skip_traced([case['docket_number'] for case in cases]))
+
+        db.client.requests = 0
+        db.client.fail_on = 3
+        integration = make_integration(self, db)
+
+        # The second skip trace status chunk fails, so nothing is looked up
+        stats, pending = integration._prepare_town('Middletown')
+        self.assertEqual(pending, [])
+        self.assertEqual(len(stats['errors']), 1)
+
+    def test_async_town_run_does_not_block_the_event_loop(self):
+        db, _ = make_db(3, traced=['D0', 'D1', 'D2'])
+        db.client.latency = 0.05
+        integration = make_integration(self, db)
+
+        async def run():
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            ticker = asyncio.create_task(tick())
+            stats = await integration.process_town_skip_traces_async('Middletown')
+            ticker.cancel()
+            return stats, ticks
+
+        stats, ticks = asyncio.run(run())
+        self.assertEqual(stats['cases_skipped'], 3)
+        # The three blocking reads ran in a worker thread while the loop kept ticking
+        self.assertEqual(db.client.requests, 3)
+        self.assertGreaterEqual(ticks, 5)
+
+
+class TestFullCaseData(unittest.TestCase):
+    """Test the embedded case + defendants + skip traces read"""
+
+    def setUp(self):
+        # The stand-in stores cases with their embedded rows already attached
+        cases = [{'docket_number': f"D{i}", 'case_name': f"Case {i}",
+                  'defendants': [{'id': 2, 'name': 'B'}, {'id': 1, 'name': 'A'}],
+                  'skiptraces': [{'id': 9, 'phone_number': '860-555-0109'}],
+                  'skiptraces_sandbox': None} for i in range(250)]
+        self.db = DatabaseConnector(client=FakeClient({'cases': cases}))
+
+    def test_single_request_with_projection(self):
+        case = self.db.get_full_case_data('D3', include_sandbox=True, skiptrace_columns=db_connector.PHONE_COLUMNS)
+        self.assertEqual(self.db.client.requests, 1)
+        self.assertEqual(self.db.client.selects[0],
+                         "*, defendants(*), skiptraces:skiptrace(id, docket_number, phone_number, phone_type), "
+                         "skiptraces_sandbox:skiptrace_sandbox(id, docket_number, phone_number, phone_type)")
+        self.assertEqual([d['name'] for d in case['defendants']], ['A', 'B'])
+        self.assertEqual(case['skiptraces_sandbox'], [])
+        self.assertIsNone(self.db.get_full_case_data('MISSING'))
+
+    def test_multi_docket_variant(self):
+        cases = self.db.get_full_cases_data([f"D{i}" for i in range(250)] + ['MISSING'])
+        self.assertEqual(len(cases), 250)
+        self.assertNotIn('skiptraces_sandbox', self.db.client.selects[0])
+        # 251 dockets -> 2 chunks
+        self.assertEqual(self.db.client.requests, 2)
+
+    def test_failed_chunk_is_not_a_partial_result(self):
+        self.db.client.fail_on = 2
+        self.assertIsNone(self.db.get_full_cases_data([f"D{i}" for i in range(250)]))
+
+
+class TestTownStats(unittest.TestCase):
+    """Test town stats read from the trigger-maintained town_stats table"""
+
+    def setUp(self):
+        self.db = DatabaseConnector(client=FakeClient({'town_stats': [
+            {'town': 'Durham', 'total_cases': 0, 'traced_cases': 0},
+            {'town': 'Hartford', 'total_cases': 40, 'traced_cases': 40},
+            {'town': 'Middletown', 'total_cases': 85, 'traced_cases': 12, 'total_defendants': 170,
+             'total_phones': 30, 'sandbox_traced_cases': 3, 'total_sandbox_phones': 5},
+        ]}))
+
+    def test_single_town_is_one_request(self):
+        stats = self.db.get_town_skip_trace_stats('Middletown')
+        self.assertEqual(stats, {'town': 'Middletown', 'scraped': True, 'total_cases': 85,
+                                 'traced_cases': 12, 'untraced_cases': 73, 'total_defendants': 170,
+                                 'total_phones': 30, 'sandbox_traced_cases': 3, 'total_sandbox_phones': 5})
+        self.assertEqual(self.db.client.requests, 1)
+
+    def test_unscraped_and_all_towns(self):
+        self.assertFalse(self.db.get_town_skip_trace_stats('Durham')['scraped'])
+        self.assertFalse(self.db.get_town_skip_trace_stats('Bristol')['scraped'])
+        # Towns whose cases were all deleted keep a zero row but are not listed
+        all_towns = self.db.get_all_town_skip_trace_stats()
+        self.assertEqual([row['untraced_cases'] for row in all_towns], [0, 73])
+
+    def test_scraper_town_statistics_is_one_request(self):
+        with mock.patch.object(scraper_db_integration, 'get_database', return_value=self.db):
+            integration = scraper_db_integration.ScraperDatabaseIntegration()
+        stats = integration.get_town_statistics('Middletown', include_sandbox=True)
+        self.assertEqual((stats['total_defendants'], stats['cases_with_skiptraces'], stats['total_skiptraces']),
+                         (170, 12, 30))
+        self.assertEqual((stats['cases_with_sandbox_skiptraces'], stats['total_sandbox_skiptraces']), (3, 5))
+        self.assertEqual(self.db.client.requests, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
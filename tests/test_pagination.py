@@ -0,0 +1,58 @@
+"""
+Test push-down pagination and keyset cursors in DatabaseConnector.list_page
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from conftest import FakeClient
+from db_connector import DatabaseConnector, decode_cursor, encode_cursor
+
+
+def make_db(count):
+    # Pairs of rows share a timestamp so the id tiebreak is exercised
+    cases = [{'id': i, 'docket_number': f"D{i}", 'town': 'Middletown' if i % 3 else 'Hartford',
+              'created_at': f"2025-01-01T00:00:{i // 2:02d}.5+00:00"} for i in range(count)]
+    return DatabaseConnector(client=FakeClient({'cases': cases}))
+
+
+class TestListPage(unittest.TestCase):
+    """Test offset pages and cursor walks"""
+
+    def test_offset_page_reads_only_the_page(self):
+        db = make_db(50)
+        page = db.list_page('cases', {'town': 'Middletown', 'docket_number': None}, skip=10, limit=5)
+        self.assertEqual(page['total'], 33)
+        self.assertEqual(len(page['items']), 5)
+        self.assertTrue(page['has_more'])
+        # limit + 1 rows requested so has_more does not depend on the count
+        self.assertEqual(db.client.requests, 1)
+        self.assertEqual(db.client.windows, [(10, 16)])
+
+    def test_cursor_walk_visits_every_row_once(self):
+        db = make_db(23)
+        seen, cursor = [], None
+        while True:
+            page = db.list_page('cases', limit=5, cursor=cursor, count=None)
+            seen.extend(row['id'] for row in page['items'])
+            cursor = page['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(seen, list(range(22, -1, -1)))
+        self.assertFalse(page['has_more'])
+        self.assertIsNone(page['total'])
+        self.assertIn('created_at.lt."2025-01-01T00:00:04.5+00:00",and(created_at.eq."2025-01-01T00:00:04.5+00:00",id.lt.8)',
+                      db.client.or_filters)
+
+    def test_cursor_round_trip_and_rejects_garbage(self):
+        cursor = encode_cursor({'created_at': '2025-01-01T00:00:00+00:00', 'id': 42})
+        self.assertEqual(decode_cursor(cursor), ('2025-01-01T00:00:00+00:00', 42))
+        with self.assertRaises(ValueError):
+            make_db(3).list_page('cases', cursor='not-a-cursor')
+
+
+if __name__ == '__main__':
+    unittest.main()
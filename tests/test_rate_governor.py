@@ -0,0 +1,87 @@
+"""
+Test the BatchData rate governor and circuit breaker
+"""
+
+import os
+import sys
+import time
+import unittest
+from email.utils import formatdate
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from rate_governor import (
+    RateGovernor,
+    parse_retry_after,
+    CIRCUIT_CLOSED,
+    CIRCUIT_OPEN,
+    CIRCUIT_HALF_OPEN
+)
+
+
+class TestRateGovernor(unittest.TestCase):
+    """Test token pacing, Retry-After handling and circuit states"""
+
+    def test_burst_then_paced(self):
+        """The burst is sent at once, later requests are spread at the sustained rate"""
+        governor = RateGovernor(rate_per_second=10, burst=3)
+        waits = [governor.reserve() for _ in range(5)]
+        self.assertEqual(waits[:3], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(waits[3], 0.1, places=2)
+        self.assertAlmostEqual(waits[4], 0.2, places=2)
+
+    def test_parse_retry_after(self):
+        """Retry-After is accepted as seconds or an HTTP-date"""
+        self.assertEqual(parse_retry_after('7'), 7.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('soon'))
+        http_date = formatdate(time.time() + 30, usegmt=True)
+        self.assertAlmostEqual(parse_retry_after(http_date), 30, delta=2)
+
+    def test_throttle_blocks_callers(self):
+        """After a 429 every caller waits at least Retry-After"""
+        governor = RateGovernor(rate_per_second=100, burst=10)
+        governor.record_throttle(5)
+        self.assertGreaterEqual(governor.reserve(), 4.9)
+        self.assertEqual(governor.stats()['throttled'], 1)
+
+    def test_circuit_opens_and_recovers(self):
+        """Repeated failures open the circuit; a successful probe closes it"""
+        governor = RateGovernor(failure_threshold=2, reset_timeout=0.05)
+        governor.record_failure()
+        self.assertEqual(governor.state, CIRCUIT_CLOSED)
+        governor.record_failure()
+        self.assertEqual(governor.state, CIRCUIT_OPEN)
+        self.assertFalse(governor.allow_request())
+
+        time.sleep(0.06)
+        self.assertEqual(governor.state, CIRCUIT_HALF_OPEN)
+        self.assertTrue(governor.allow_request())
+        # Only one probe at a time
+        self.assertFalse(governor.allow_request())
+        governor.record_success()
+        self.assertEqual(governor.state, CIRCUIT_CLOSED)
+
+    def test_auth_error_frees_probe_without_failure(self):
+        """A rejected token in the half-open state lets the next probe through"""
+        governor = RateGovernor(failure_threshold=1, reset_timeout=0.05)
+        governor.record_failure()
+        time.sleep(0.06)
+        self.assertTrue(governor.allow_request())
+        governor.record_auth_error()
+        self.assertEqual(governor.state, CIRCUIT_HALF_OPEN)
+        self.assertTrue(governor.allow_request())
+        self.assertEqual((governor.stats()['failures'], governor.stats()['auth_errors']), (1, 1))
+
+    def test_failed_probe_reopens(self):
+        """A failing probe re-opens the circuit"""
+        governor = RateGovernor(failure_threshold=1, reset_timeout=0.05)
+        governor.record_failure()
+        time.sleep(0.06)
+        self.assertTrue(governor.allow_request())
+        governor.record_failure()
+        self.assertEqual(governor.state, CIRCUIT_OPEN)
+
+
+if __name__ == '__main__':
+    unittest.main()
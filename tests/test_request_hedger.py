@@ -0,0 +1,113 @@
+"""
+Test hedged requests against the local stand-in server
+"""
+
+import asyncio
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batchdata_stub_server import StubConfig, start_in_thread
+from batch_api_connector import BatchAPIConnector
+from async_batch_api_connector import AsyncBatchAPIConnector
+from request_hedger import RequestHedger, percentile
+
+ADDRESS = {'street': '12 Main St', 'city': 'Middletown', 'state': 'CT', 'zip': '06457'}
+
+
+class TestRequestHedger(unittest.TestCase):
+    """Test the hedge policy and first-response-wins in both connectors"""
+
+    def setUp(self):
+        server, url = start_in_thread(StubConfig(latency_ms=1, latency_distribution='fixed'))
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.server = server
+        self.url = url
+
+    def test_delay_follows_percentile(self):
+        hedger = RequestHedger(hedge_percentile=90, default_delay=2.0, min_samples=10)
+        self.assertEqual(hedger.hedge_delay(), 2.0)
+        for ms in range(1, 101):
+            hedger.record_primary(ms / 1000.0)
+        self.assertAlmostEqual(hedger.hedge_delay(), 0.090)
+        self.assertEqual(percentile([3, 1, 2], 99), 3)
+
+    def test_hedges_per_minute_cap(self):
+        hedger = RequestHedger(max_hedges_per_minute=2)
+        self.assertEqual([hedger.try_hedge() for _ in range(3)], [True, True, False])
+        self.assertEqual(hedger.stats()['hedges_denied'], 1)
+
+    def slow_first_send(self, connector):
+        """Delay the first request sent by the connector by half a second"""
+        send = connector._send
+        calls = []
+
+        def slow_send(payload, headers, on_start=None):
+            calls.append(1)
+            if on_start is not None:
+                on_start()
+            if len(calls) == 1:
+                time.sleep(0.5)
+            return send(payload, headers)
+
+        connector._send = slow_send
+
+    def test_slow_request_is_hedged(self):
+        hedger = RequestHedger(default_delay=0.05)
+        connector = BatchAPIConnector('local', base_url=self.url, hedger=hedger)
+        self.addCleanup(connector.close)
+        self.slow_first_send(connector)
+
+        start = time.perf_counter()
+        result = connector.lookup_batch([ADDRESS], hedge=True)[0]
+        self.assertLess(time.perf_counter() - start, 0.4)
+        self.assertTrue(result.ok)
+        stats = hedger.stats()
+        self.assertEqual((stats['hedges_sent'], stats['hedges_won']), (1, 1))
+
+    def test_cap_reached_waits_for_primary(self):
+        hedger = RequestHedger(default_delay=0.05, max_hedges_per_minute=0)
+        connector = BatchAPIConnector('local', base_url=self.url, hedger=hedger)
+        self.addCleanup(connector.close)
+        self.slow_first_send(connector)
+
+        start = time.perf_counter()
+        self.assertTrue(connector.lookup_batch([ADDRESS], hedge=True)[0].ok)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.5)
+        self.assertEqual(self.server.state.counters['requests'], 1)
+
+    def test_async_slow_request_is_hedged(self):
+        hedger = RequestHedger(default_delay=0.05)
+
+        async def run():
+            connector = AsyncBatchAPIConnector('local', base_url=self.url, hedger=hedger)
+            send = connector._send
+            calls = []
+
+            async def slow_send(payload, headers, on_start=None):
+                calls.append(1)
+                if on_start is not None:
+                    on_start()
+                if len(calls) == 1:
+                    await asyncio.sleep(0.5)
+                return await send(payload, headers)
+
+            connector._send = slow_send
+            start = time.perf_counter()
+            result = (await connector.lookup_batch([ADDRESS], hedge=True))[0]
+            elapsed = time.perf_counter() - start
+            await connector.aclose()
+            return result, elapsed
+
+        result, elapsed = asyncio.run(run())
+        self.assertTrue(result.ok)
+        self.assertLess(elapsed, 0.4)
+        self.assertEqual(hedger.stats()['hedges_won'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
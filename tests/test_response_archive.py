@@ -0,0 +1,66 @@
+"""
+Test the compressed raw-response archive helpers
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from response_archive import ArchivedResponse, build_archive_rows, decode_payload, encode_payload
+from batchdata_stub_server import StubConfig, start_in_thread
+from batch_api_connector import BatchAPIConnector
+
+
+PAYLOAD = {
+    'input': {'propertyAddress': {'street': '1 MAIN ST', 'city': 'MIDDLETOWN', 'state': 'CT', 'zip': '06457'}},
+    'results': {'persons': [{'phoneNumbers': [{'number': '860-555-1234', 'type': 'Mobile'}] * 20}]}
+}
+
+
+class TestResponseArchive(unittest.TestCase):
+    """Test hashing, compression, dedupe and lazy decoding"""
+
+    def test_round_trip_and_compression(self):
+        response_hash, compressed, size = encode_payload(PAYLOAD)
+        self.assertEqual(len(response_hash), 64)
+        self.assertLess(len(compressed), size)
+        self.assertEqual(decode_payload(compressed), PAYLOAD)
+
+    def test_key_order_does_not_change_hash(self):
+        reordered = {'results': PAYLOAD['results'], 'input': PAYLOAD['input']}
+        self.assertEqual(encode_payload(reordered)[0], encode_payload(PAYLOAD)[0])
+
+    def test_build_rows_dedupes(self):
+        hashes, rows = build_archive_rows([PAYLOAD, None, dict(PAYLOAD)])
+        self.assertEqual(len(rows), 1)
+        self.assertIsNone(hashes[1])
+        self.assertEqual(hashes[0], hashes[2])
+
+    def test_lazy_payload(self):
+        response_hash, compressed, _ = encode_payload(PAYLOAD)
+        archived = ArchivedResponse(response_hash, compressed)
+        self.assertNotIn('payload', archived.__dict__)
+        self.assertEqual(archived.payload, PAYLOAD)
+        self.assertIn('payload', archived.__dict__)
+
+    def test_lookup_results_carry_raw_entry(self):
+        """Each lookup gets its own entry of the batch response"""
+        server, url = start_in_thread(StubConfig(latency_ms=1, latency_distribution='fixed', hit_rate=1.0))
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        connector = BatchAPIConnector('local', base_url=url)
+        self.addCleanup(connector.close)
+
+        addresses = [{'street': f'{n} Main St', 'city': 'Middletown', 'state': 'CT', 'zip': '06457'} for n in (1, 2)]
+        results = connector.lookup_batch(addresses)
+        for address, result in zip(addresses, results):
+            echoed = result.raw_response['input']['propertyAddress']
+            self.assertEqual(echoed['street'], address['street'].upper())
+            phones = [p['number'] for p in result.raw_response['results']['persons'][0]['phoneNumbers']]
+            self.assertEqual(phones, result.phone_numbers)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Test the process-wide DatabaseConnector returned by get_database
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import db_connector
+from db_connector import close_database, get_database
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.postgrest = mock.Mock()
+
+
+class TestSharedDatabase(unittest.TestCase):
+    """Test that one Supabase client is built and reused"""
+
+    def setUp(self):
+        close_database()
+        env = mock.patch.dict(os.environ, {'SUPABASE_URL': 'http://localhost:54321', 'SUPABASE_ANON_KEY': 'key'})
+        env.start()
+        self.addCleanup(env.stop)
+        self.create_client = mock.patch.object(db_connector, 'create_client', side_effect=lambda url, key: FakeSupabase())
+        self.create_client.start()
+        self.addCleanup(self.create_client.stop)
+        self.addCleanup(close_database)
+
+    def test_one_client_across_threads(self):
+        seen = []
+        threads = [threading.Thread(target=lambda: seen.append(get_database())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len({id(db) for db in seen}), 1)
+        self.assertEqual(db_connector.create_client.call_count, 1)
+
+    def test_close_releases_connections(self):
+        db = get_database()
+        close_database()
+        db.client.postgrest.aclose.assert_called_once()
+        self.assertIsNot(get_database(), db)
+        self.assertEqual(db_connector.create_client.call_count, 2)
+
+
+class TestPackageImport(unittest.TestCase):
+    """Test that the connector imports as src.db_connector, as the Vercel functions do"""
+
+    def test_imports_from_repo_root(self):
+        root = os.path.join(os.path.dirname(__file__), '..')
+        env = dict(os.environ, PYTHONPATH='')
+        result = subprocess.run([sys.executable, '-c', 'from src.db_connector import get_database'],
+                                cwd=root, env=env, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
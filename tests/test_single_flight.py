@@ -0,0 +1,118 @@
+"""
+Test single-flight coalescing of identical in-flight skip trace lookups
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from single_flight import SingleFlight
+from batchdata_stub_server import StubConfig, start_in_thread
+from batch_api_connector import BatchAPIConnector
+from async_batch_api_connector import AsyncBatchAPIConnector
+
+
+ADDRESSES = [{'street': f'{n} Elm St', 'city': 'Middletown', 'state': 'CT', 'zip': '06457'} for n in range(1, 7)]
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test claim/resolve bookkeeping and connector integration"""
+
+    def test_claim_and_resolve(self):
+        """Only the first claim leads; waiters get the leader's value"""
+        flight = SingleFlight()
+        (leader, is_leader), = flight.claim(['a'])
+        (waiter, waiter_leads), = flight.claim(['a'])
+        self.assertTrue(is_leader)
+        self.assertFalse(waiter_leads)
+        self.assertIs(leader, waiter)
+
+        flight.resolve('a', 42)
+        self.assertEqual(waiter.result(timeout=1), 42)
+        # Once resolved the key is free again
+        self.assertTrue(flight.claim(['a'])[0][1])
+        self.assertEqual(flight.stats()['saved_calls'], 1)
+
+    def test_fail_propagates(self):
+        """A leader's exception reaches the waiters"""
+        flight = SingleFlight()
+        flight.claim(['a'])
+        (future, _), = flight.claim(['a'])
+        flight.fail('a', RuntimeError('boom'))
+        with self.assertRaises(RuntimeError):
+            future.result(timeout=1)
+
+    def start_server(self):
+        server, url = start_in_thread(StubConfig(latency_ms=200, latency_distribution='fixed'))
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server, url
+
+    def test_threads_share_lookup(self):
+        """Two threads tracing the same addresses pay for them once"""
+        server, url = self.start_server()
+        flight = SingleFlight()
+        connectors = [BatchAPIConnector('local', base_url=url, single_flight=flight) for _ in range(2)]
+        results = [None, None]
+
+        def run(n):
+            results[n] = connectors[n].send_skip_trace_batch(ADDRESSES)
+
+        threads = [threading.Thread(target=run, args=(n,)) for n in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for connector in connectors:
+            connector.close()
+
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(server.state.counters['addresses'], len(ADDRESSES))
+        self.assertEqual(flight.stats()['saved_calls'], len(ADDRESSES))
+
+    def test_async_callers_share_lookup(self):
+        """Concurrent coroutines with overlapping addresses coalesce"""
+        server, url = self.start_server()
+        flight = SingleFlight()
+
+        async def run():
+            connector = AsyncBatchAPIConnector('local', base_url=url, single_flight=flight)
+            try:
+                return await asyncio.gather(
+                    connector.send_skip_trace_batch(ADDRESSES[:4]),
+                    connector.send_skip_trace_batch(ADDRESSES[2:])
+                )
+            finally:
+                await connector.aclose()
+
+        first, second = asyncio.run(run())
+        self.assertEqual(first[2:], second[:2])
+        self.assertEqual(server.state.counters['addresses'], len(ADDRESSES))
+        self.assertEqual(flight.stats()['saved_calls'], 2)
+
+    def test_followers_are_marked_coalesced(self):
+        """Results shared from another caller's request are flagged so they are not billed twice"""
+        server, url = self.start_server()
+        flight = SingleFlight()
+
+        async def run():
+            connector = AsyncBatchAPIConnector('local', base_url=url, single_flight=flight)
+            try:
+                return await asyncio.gather(
+                    connector.lookup_batch(ADDRESSES[:4]),
+                    connector.lookup_batch(ADDRESSES[2:])
+                )
+            finally:
+                await connector.aclose()
+
+        first, second = asyncio.run(run())
+        self.assertEqual([result.coalesced for result in first], [False] * 4)
+        self.assertEqual([result.coalesced for result in second], [True, True, False, False])
+
+
+if __name__ == '__main__':
+    unittest.main()
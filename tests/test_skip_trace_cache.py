@@ -0,0 +1,70 @@
+"""
+Test the persistent skip trace result cache
+"""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from skip_trace_cache import SkipTraceCache
+
+
+ADDRESS = {'street': '123 Main St', 'city': 'Middletown', 'state': 'CT', 'zip': '06457'}
+
+
+class TestSkipTraceCache(unittest.TestCase):
+    """Test cache hits, TTL expiry and eviction"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'cache.sqlite3')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_hit_after_set_and_persistence(self):
+        """Stored results are returned and survive reopening the file"""
+        cache = SkipTraceCache(self.path)
+        self.assertIsNone(cache.get('prod', ADDRESS))
+        cache.set('prod', ADDRESS, ['860-555-1234'])
+
+        # Same address with different spacing/case hits the same entry
+        variant = {'street': '123  main st.', 'city': 'MIDDLETOWN', 'state': 'ct', 'zip': '06457-1234'}
+        self.assertEqual(cache.get('prod', variant), ['860-555-1234'])
+        self.assertIsNone(cache.get('sandbox', ADDRESS))
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 2)
+        cache.close()
+
+        reopened = SkipTraceCache(self.path)
+        self.assertEqual(reopened.get('prod', ADDRESS), ['860-555-1234'])
+        reopened.close()
+
+    def test_ttl_expiry(self):
+        """Entries older than the TTL are misses"""
+        cache = SkipTraceCache(self.path, ttl_seconds=0.05)
+        cache.set('prod', ADDRESS, [])
+        self.assertEqual(cache.get('prod', ADDRESS), [])
+        time.sleep(0.1)
+        self.assertIsNone(cache.get('prod', ADDRESS))
+        cache.close()
+
+    def test_size_bounded_eviction(self):
+        """Least recently used entries are evicted beyond max_entries"""
+        cache = SkipTraceCache(self.path, max_entries=3, memory_entries=0)
+        addresses = [dict(ADDRESS, street=f'{n} Main St') for n in range(5)]
+        for address in addresses:
+            cache.set('prod', address, ['860-555-0000'])
+
+        self.assertEqual(cache.stats()['entries'], 3)
+        self.assertIsNone(cache.get('prod', addresses[0]))
+        self.assertEqual(cache.get('prod', addresses[4]), ['860-555-0000'])
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,197 @@
+"""
+Test the budget-aware skip trace scheduler against the local stand-in server
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batchdata_stub_server import StubConfig, start_in_thread
+from batch_api_connector import BatchAPIConnector, LOOKUP_EMPTY, LOOKUP_THROTTLED, LookupResult
+from skip_trace_cache import SkipTraceCache
+from skip_trace_integration import SkipTraceIntegration
+from skip_trace_scheduler import QueuedDocket, SkipTraceScheduler, default_priority
+from write_behind import WriteBehindBuffer
+
+
+class FakeDB:
+    """Just enough of DatabaseConnector for the scheduler"""
+
+    def __init__(self, cases, prior_spend=0.0):
+        self.cases = {case['docket_number']: case for case in cases}
+        self.prior_spend = prior_spend
+        self.spend = []
+        self.stored = []
+        self.cost_calls = []
+        self.batched_reads = 0
+        self.write_buffer = WriteBehindBuffer(self)
+
+    def have_been_skip_traced(self, docket_numbers, is_sandbox=False):
+        self.batched_reads += 1
+        return {docket: False for docket in docket_numbers}
+
+    def get_cases_by_dockets(self, docket_numbers):
+        self.batched_reads += 1
+        return {docket: self.cases[docket] for docket in docket_numbers if docket in self.cases}
+
+    def get_cases_by_town(self, town):
+        return [case for case in self.cases.values() if case['town'] == town]
+
+    def get_defendants_by_dockets(self, docket_numbers):
+        self.batched_reads += 1
+        return {docket: self.cases[docket]['defendants'] for docket in docket_numbers if docket in self.cases}
+
+    def archive_raw_responses(self, payloads):
+        return [None] * len(payloads)
+
+    def insert_skiptraces(self, rows, is_sandbox=False):
+        self.stored.extend(rows)
+        return rows
+
+    def record_skip_trace_costs(self, lookup_counts, cost_per_lookup, is_sandbox=False):
+        # increment_skip_trace_costs appends each docket to the spend ledger
+        self.cost_calls.append(dict(lookup_counts))
+        self.spend.extend(count * cost_per_lookup for count in lookup_counts.values())
+        return []
+
+    def get_skip_trace_spend(self, since, is_sandbox=False):
+        return self.prior_spend + sum(self.spend)
+
+    def get_skip_trace_hit_rates(self, is_sandbox=False):
+        return {}
+
+    def queue_addresses_for_review(self, rows):
+        return rows
+
+
+def make_case(sequence, town='Middletown', defendants=2):
+    docket = f"MMX-CV-25-{sequence}-S"
+    return {
+        'docket_number': docket,
+        'case_name': f"Case {sequence}",
+        'town': town,
+        'defendants': [{'name': f"Defendant {sequence}-{n}", 'address': f"{sequence % 1000 * 10 + n} Main St, {town}, CT"}
+                       for n in range(defendants)]
+    }
+
+
+class TestSkipTraceScheduler(unittest.TestCase):
+    """Test priority order and budget enforcement"""
+
+    def setUp(self):
+        server, url = start_in_thread(StubConfig(latency_ms=1, latency_distribution='fixed'))
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.server = server
+        self.url = url
+
+    def make_integration(self, db):
+        api = BatchAPIConnector('local', base_url=self.url, cache=SkipTraceCache(':memory:'))
+        # Results are cached under prod, like the integration's own connector
+        api.env = 'prod'
+        self.addCleanup(api.close)
+        return SkipTraceIntegration(use_sandbox=False, db=db, api=api)
+
+    def test_priority_prefers_towns_then_newest(self):
+        priority = default_priority(['Hartford'])
+        items = [
+            QueuedDocket('MMX-CV-24-6040000-S', 'Middletown'),
+            QueuedDocket('MMX-CV-25-6045000-S', 'Middletown'),
+            QueuedDocket('HHD-CV-23-6010000-S', 'Hartford'),
+        ]
+        ordered = [item.docket_number for item in sorted(items, key=priority)]
+        self.assertEqual(ordered, ['HHD-CV-23-6010000-S', 'MMX-CV-25-6045000-S', 'MMX-CV-24-6040000-S'])
+
+    def test_budget_is_never_exceeded(self):
+        cases = [make_case(6045000 + n) for n in range(5)]
+        db = FakeDB(cases, prior_spend=0.50)
+        scheduler = SkipTraceScheduler(self.make_integration(db), daily_budget=0.80)
+        scheduler.enqueue_town('Middletown')
+
+        report = scheduler.run()
+        # $0.30 left buys four lookups: the two newest dockets
+        self.assertEqual(report.dispatched, [cases[4]['docket_number'], cases[3]['docket_number']])
+        self.assertEqual(len(report.deferred), 3)
+        self.assertEqual(report.billed_lookups, 4)
+        self.assertLessEqual(db.get_skip_trace_spend(None), 0.80)
+        self.assertEqual(self.server.state.counters['addresses'], 4)
+        # Deferred dockets stay queued for the next run
+        self.assertEqual(len(scheduler), 3)
+
+    def test_shared_address_billed_once(self):
+        case = make_case(6045200)
+        twin = make_case(6045201)
+        twin['defendants'] = case['defendants']
+        db = FakeDB([case, twin])
+        scheduler = SkipTraceScheduler(self.make_integration(db), daily_budget=10.0)
+        scheduler.enqueue_town('Middletown')
+        report = scheduler.run()
+        self.assertEqual(len(report.dispatched), 2)
+        self.assertEqual(report.billed_lookups, 2)
+        self.assertEqual(self.server.state.counters['addresses'], 2)
+        # One batched cost increment for the dispatch, shared addresses billed to one docket
+        self.assertEqual(len(db.cost_calls), 1)
+        self.assertEqual(list(db.cost_calls[0].values()), [2])
+
+    def test_dockets_are_planned_with_batched_reads(self):
+        cases = [make_case(6045300 + n) for n in range(4)]
+        db = FakeDB(cases)
+        scheduler = SkipTraceScheduler(self.make_integration(db), daily_budget=10.0)
+        # Queued without case rows, so those are read too
+        for case in cases:
+            scheduler.enqueue(QueuedDocket(case['docket_number'], case['town']))
+        report = scheduler.run()
+        self.assertEqual(len(report.dispatched), 4)
+        # Cases, skip trace status and defendants: one read each for all four dockets
+        self.assertEqual(db.batched_reads, 3)
+
+    def test_only_api_answers_are_billed(self):
+        integration = self.make_integration(FakeDB([]))
+
+        def lookup(docket, street, result):
+            address = {'street': street, 'city': 'Middletown', 'state': 'CT', 'zip': '06457'}
+            return {'docket_number': docket, 'address_dict': address, 'result': result}
+
+        lookups = [
+            lookup('D1', '1 Main St', LookupResult.from_phones(['860-555-0101'])),
+            # Same address for another docket: sent once, billed to D1
+            lookup('D2', '1 MAIN STREET', LookupResult.from_phones(['860-555-0101'])),
+            lookup('D2', '2 Main St', LookupResult.from_phones([])),
+            lookup('D2', '3 Main St', LookupResult.from_phones(['860-555-0103'], cached=True)),
+            lookup('D2', '4 Main St', LookupResult(LOOKUP_THROTTLED)),
+            lookup('D3', '5 Main St', LookupResult(LOOKUP_EMPTY, coalesced=True)),
+        ]
+        self.assertEqual(integration.billed_lookups(lookups), {'D1': 1, 'D2': 1})
+
+    def test_town_run_records_its_cost_once(self):
+        cases = [make_case(6045500 + n) for n in range(3)]
+        db = FakeDB(cases)
+        stats = self.make_integration(db).process_town_skip_traces('Middletown')
+        self.assertEqual(stats['total_lookups_billed'], 6)
+        self.assertEqual(stats['total_cost'], 0.42)
+        # One batched increment, which also writes the spend ledger
+        self.assertEqual(db.cost_calls, [{case['docket_number']: 2 for case in cases}])
+        self.assertAlmostEqual(db.get_skip_trace_spend(None), 0.42)
+
+    def test_cached_addresses_cost_nothing(self):
+        cases = [make_case(6045100 + n) for n in range(3)]
+        db = FakeDB(cases)
+        integration = self.make_integration(db)
+        scheduler = SkipTraceScheduler(integration, daily_budget=1.0)
+        scheduler.enqueue_town('Middletown')
+        first = scheduler.run()
+        self.assertEqual(first.billed_lookups, 6)
+
+        # Same addresses again with no budget left: answered from the cache
+        db.prior_spend = 1.0
+        scheduler.enqueue_town('Middletown')
+        second = scheduler.run(force=True)
+        self.assertEqual(len(second.dispatched), 3)
+        self.assertEqual(second.billed_lookups, 0)
+        self.assertEqual(self.server.state.counters['addresses'], 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+Test WriteBehindBuffer batching, flush triggers and failure reporting
+"""
+
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from write_behind import WriteBehindBuffer
+
+
+class FakeDB:
+    """insert_skiptraces / record_skip_trace_costs with the DatabaseConnector return conventions"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.inserts = []
+        self.cost_calls = []
+        self.stored = set()
+        self.costs = {}
+        self.called = threading.Event()
+
+    def insert_skiptraces(self, rows, is_sandbox=False):
+        self.inserts.append((is_sandbox, len(rows)))
+        self.called.set()
+        if self.fail:
+            return None
+        new = [row for row in rows if (is_sandbox, row['docket_number'], row['phone_number']) not in self.stored]
+        self.stored.update((is_sandbox, row['docket_number'], row['phone_number']) for row in new)
+        return new
+
+    def record_skip_trace_costs(self, lookup_counts, cost_per_lookup, is_sandbox=False):
+        self.cost_calls.append((dict(lookup_counts), is_sandbox))
+        for docket, count in lookup_counts.items():
+            self.costs[docket] = self.costs.get(docket, 0) + count
+        return [{'docket_number': docket, 'lookup_count': self.costs[docket]} for docket in lookup_counts]
+
+
+def phones(docket, count):
+    return [{'docket_number': docket, 'phone_number': f"860-555-{n:04d}"} for n in range(count)]
+
+
+class TestWriteBehindBuffer(unittest.TestCase):
+    """Test that buffered rows are written in few requests and results reach each caller"""
+
+    def make_buffer(self, db, **kwargs):
+        buffer = WriteBehindBuffer(db, **kwargs)
+        self.addCleanup(buffer.close)
+        return buffer
+
+    def test_cases_share_one_insert(self):
+        db = FakeDB()
+        buffer = self.make_buffer(db, flush_interval=60)
+        futures = [buffer.add_skiptraces(phones(f"D{i}", 3)) for i in range(20)]
+        sandbox = buffer.add_skiptraces(phones('D0', 2), is_sandbox=True)
+        self.assertEqual(buffer.pending_rows, 62)
+        buffer.flush()
+
+        self.assertEqual(db.inserts, [(False, 60), (True, 2)])
+        results = [future.result(timeout=1) for future in futures]
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual([len(result.rows) for result in results], [3] * 20)
+        self.assertEqual(len(sandbox.result(timeout=1).rows), 2)
+        self.assertGreater(results[0].latency, 0)
+        self.assertEqual((buffer.flushes, buffer.rows_written, buffer.failures), (1, 62, 0))
+
+    def test_flushes_by_size_and_interval(self):
+        db = FakeDB()
+        buffer = self.make_buffer(db, max_rows=4, flush_interval=60)
+        buffer.add_skiptraces(phones('D1', 2))
+        self.assertFalse(db.called.wait(0.1))
+        full = buffer.add_skiptraces(phones('D2', 2))
+        self.assertTrue(full.result(timeout=2).ok)
+
+        db = FakeDB()
+        buffer = self.make_buffer(db, flush_interval=0.05)
+        self.assertEqual(len(buffer.add_skiptraces(phones('D3', 1)).result(timeout=2).rows), 1)
+
+    def test_costs_are_merged_per_docket(self):
+        db = FakeDB()
+        buffer = self.make_buffer(db, flush_interval=60)
+        first = buffer.add_costs({'D1': 2, 'D2': 1})
+        second = buffer.add_costs({'D1': 3, 'D3': 0})
+        buffer.flush()
+        self.assertEqual(db.cost_calls, [({'D1': 5, 'D2': 1}, False)])
+        self.assertEqual(second.result(timeout=1).rows, [{'docket_number': 'D1', 'lookup_count': 5}])
+        self.assertEqual(len(first.result(timeout=1).rows), 2)
+
+    def test_failures_reach_the_callers(self):
+        db = FakeDB(fail=True)
+        buffer = self.make_buffer(db, flush_interval=60)
+        futures = [buffer.add_skiptraces(phones(f"D{i}", 2)) for i in range(3)]
+        buffer.flush()
+        results = [future.result(timeout=1) for future in futures]
+        self.assertEqual({result.ok for result in results}, {False})
+        self.assertEqual(results[0].error, 'database write failed')
+        self.assertEqual(buffer.failures, 1)
+
+    def test_unexpected_errors_fail_the_callers(self):
+        db = FakeDB()
+        # Rows come back without the key the buffer matches them on
+        db.insert_skiptraces = lambda rows, is_sandbox=False: [{'docket_number': 'D1'}]
+        buffer = self.make_buffer(db, flush_interval=0.05)
+        first = buffer.add_skiptraces(phones('D1', 2))
+        self.assertFalse(first.result(timeout=2).ok)
+        self.assertIn('phone_number', first.result().error)
+        # The flush thread survived and writes later rows
+        db.insert_skiptraces = FakeDB().insert_skiptraces
+        self.assertTrue(buffer.add_skiptraces(phones('D2', 1)).result(timeout=2).ok)
+
+    def test_close_flushes_what_is_left(self):
+        db = FakeDB()
+        buffer = WriteBehindBuffer(db, flush_interval=60)
+        future = buffer.add_skiptraces(phones('D1', 2))
+        buffer.close()
+        self.assertTrue(future.result(timeout=1).ok)
+        # Late writes after close are written straight away
+        self.assertTrue(buffer.add_skiptraces(phones('D2', 1)).result(timeout=1).ok)
+        self.assertEqual(db.inserts, [(False, 2), (False, 1)])
+
+
+if __name__ == '__main__':
+    unittest.main()